@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+# Runs in a fresh interpreter so every sample pays the real import cost.
+_PROBE = r"""
+import json, sys, time
+start = time.perf_counter()
+from PySide6.QtWidgets import QApplication
+app = QApplication([])
+if sys.argv[1] == "eager":
+    from pdf_toolbox.services.pdf_ops import preload_operations
+    preload_operations()
+from pdf_toolbox.ui.main_window import MainWindow
+imported = time.perf_counter()
+win = MainWindow()
+win.show()
+app.processEvents()
+painted = time.perf_counter()
+print(json.dumps({"import_ms": (imported - start) * 1000, "first_paint_ms": (painted - start) * 1000}))
+"""
+
+
+def _sample(mode: str, env: dict) -> dict:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE, mode], env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure time to first paint with lazy vs eager operation imports.")
+    parser.add_argument("-n", "--runs", type=int, default=5)
+    parser.add_argument("--offscreen", action="store_true", help="use the offscreen Qt platform (no display needed)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    if args.offscreen:
+        env["QT_QPA_PLATFORM"] = "offscreen"
+
+    _sample("lazy", env)  # warm the OS file cache
+    for mode in ("eager", "lazy"):
+        samples = [_sample(mode, env) for _ in range(args.runs)]
+        imports = statistics.median(s["import_ms"] for s in samples)
+        paint = statistics.median(s["first_paint_ms"] for s in samples)
+        print(f"{mode:<6} import {imports:8.1f} ms   first paint {paint:8.1f} ms   (median of {args.runs})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,7 +1,14 @@
 ﻿from __future__ import annotations
 
+import time
+
+_LAUNCHED = time.perf_counter()
+
+import logging
+import multiprocessing
 import sys
 from pathlib import Path
+from typing import List, Optional
 
 # Allow running app.py directly in VSCode without installing the package
 _src_root = Path(__file__).resolve().parents[1]
@@ -13,14 +20,44 @@ from PySide6.QtWidgets import QApplication
 from pdf_toolbox.logging_conf import setup_logging
 from pdf_toolbox.ui.main_window import MainWindow
 
+_IMPORTED = time.perf_counter()
+
+logger = logging.getLogger(__name__)
+
 
-def main() -> int:
+def main(argv: Optional[List[str]] = None) -> int:
+    multiprocessing.freeze_support()
+    argv = list(sys.argv if argv is None else argv)
+    profile_startup = "--profile-startup" in argv
+    if profile_startup:
+        argv.remove("--profile-startup")
     setup_logging()
-    app = QApplication(sys.argv)
+    app = QApplication(argv)
+    app_ready = time.perf_counter()
     win = MainWindow()
+    built = time.perf_counter()
+    if profile_startup:
+        win.first_paint.connect(lambda: _report_startup(app_ready, built))
     win.show()
     return app.exec()
 
 
+def _report_startup(app_ready: float, built: float) -> None:
+    painted = time.perf_counter()
+
+    def ms(since: float, until: float) -> str:
+        return f"{(until - since) * 1000:.0f} ms"
+
+    logger.info(
+        "Startup profile: imports %s, QApplication %s, MainWindow %s, show to first paint %s; "
+        "launch to first paint %s",
+        ms(_LAUNCHED, _IMPORTED),
+        ms(_IMPORTED, app_ready),
+        ms(app_ready, built),
+        ms(built, painted),
+        ms(_LAUNCHED, painted),
+    )
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
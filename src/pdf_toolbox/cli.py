@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import multiprocessing
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Sequence
+
+from pdf_toolbox.core.batch import (
+    BatchJob,
+    BatchOutcome,
+    BatchRunner,
+    ManifestError,
+    load_manifest,
+    parse_manifest,
+)
+from pdf_toolbox.core.models import JobProgress, JobSpec
+from pdf_toolbox.core.process_pool import BACKENDS
+from pdf_toolbox.i18n import set_language
+from pdf_toolbox.logging_conf import setup_logging
+from pdf_toolbox.services.io.ocr_cache import OcrCache, cache_usage, default_cache_root
+from pdf_toolbox.services.pdf_ops import OP_REGISTRY
+
+EXIT_OK = 0
+EXIT_FAILED = 1
+EXIT_USAGE = 2
+EXIT_CANCELLED = 130
+
+# Page specs such as "3" or "1,2" stay text even when they would parse as JSON; edits may still be a JSON list.
+_PAGE_SPEC_PARAMS = {"ranges", "order", "edits"}
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    multiprocessing.freeze_support()
+    parser = _build_parser()
+    args = parser.parse_args(argv)
+    setup_logging(logging.INFO if args.verbose else logging.WARNING, stream=sys.stderr)
+    set_language(args.lang)
+
+    if args.command == "list":
+        for descriptor in OP_REGISTRY.descriptors():
+            print(f"{descriptor.tool_id:<18} {descriptor.display_name}")
+        return EXIT_OK
+    if args.command == "cache":
+        if args.clear:
+            OcrCache().clear()
+        print(f"{default_cache_root()}\t{cache_usage() / (1024 * 1024):.1f} MB")
+        return EXIT_OK
+
+    try:
+        jobs = _jobs_from_args(args)
+        # The GUI only offers existing folders; scripted runs create them on demand.
+        for job in jobs:
+            job.spec.output_dir.mkdir(parents=True, exist_ok=True)
+    except (ManifestError, OSError, ValueError) as exc:
+        print(f"pdf-toolbox: error: {exc}", file=sys.stderr)
+        return EXIT_USAGE
+    if not jobs:
+        return EXIT_OK
+
+    runner = BatchRunner(
+        max_workers=args.jobs,
+        backend=args.backend,
+        on_progress=_print_progress if args.verbose else None,
+        on_finished=lambda outcome: _print_outcome(outcome, args.json),
+    )
+    start = time.perf_counter()
+    try:
+        outcomes = runner.run(jobs)
+    except KeyboardInterrupt:
+        runner.cancel()
+        return EXIT_CANCELLED
+    return _summarize(outcomes, time.perf_counter() - start, args.json)
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="pdf-toolbox", description="Run PDF Toolbox operations without the GUI.")
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-j", "--jobs", type=int, default=1, help="number of jobs to run in parallel")
+    common.add_argument("--backend", choices=BACKENDS, help="force thread or process execution for every job")
+    common.add_argument("--json", action="store_true", help="print one JSON object per finished job")
+    common.add_argument("-v", "--verbose", action="store_true", help="log progress to stderr")
+    common.add_argument("--lang", default="en", help="message language (en or zh)")
+    # Subcommands without the job options (list) still need the values main() reads before dispatching.
+    parser.set_defaults(verbose=False, lang="en")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    run = sub.add_parser("run", parents=[common], help="run one tool on the given inputs")
+    run.add_argument("tool_id", choices=sorted(OP_REGISTRY))
+    run.add_argument("inputs", nargs="+", type=Path)
+    run.add_argument("-o", "--output-dir", type=Path, required=True)
+    run.add_argument("-n", "--output-name")
+    run.add_argument("--overwrite", action="store_true")
+    run.add_argument(
+        "-p",
+        "--param",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="operation parameter; VALUE is parsed as JSON when possible, except page ranges, orders and edits",
+    )
+
+    batch = sub.add_parser("batch", parents=[common], help="run a JSONL manifest of job specs")
+    batch.add_argument("manifest", type=Path, help="JSONL file, or - for stdin")
+
+    sub.add_parser("list", help="list available tools")
+    cache = sub.add_parser("cache", help="show the OCR result cache folder and size")
+    cache.add_argument("--clear", action="store_true", help="delete every cached OCR result")
+    return parser
+
+
+def _jobs_from_args(args: argparse.Namespace) -> List[BatchJob]:
+    if args.command == "batch":
+        if str(args.manifest) == "-":
+            return parse_manifest(sys.stdin, Path.cwd(), source="<stdin>")
+        return load_manifest(args.manifest)
+    spec = JobSpec(
+        tool_id=args.tool_id,
+        inputs=list(args.inputs),
+        output_dir=args.output_dir,
+        output_name=args.output_name,
+        params=dict(_parse_param(item) for item in args.param),
+        overwrite=args.overwrite,
+    )
+    return [BatchJob(args.tool_id, spec)]
+
+
+def _parse_param(item: str):
+    key, sep, raw = item.partition("=")
+    if not sep or not key:
+        raise ValueError(f"invalid parameter {item!r}, expected KEY=VALUE")
+    if key in _PAGE_SPEC_PARAMS and not raw.lstrip().startswith(("[", "{")):
+        return key, raw
+    try:
+        return key, json.loads(raw)
+    except ValueError:
+        return key, raw
+
+
+def _print_progress(progress: JobProgress) -> None:
+    print(f"[{progress.job_id}] {progress.current}/{progress.total} {progress.message}", file=sys.stderr)
+
+
+def _print_outcome(outcome: BatchOutcome, as_json: bool) -> None:
+    result = outcome.result
+    if as_json:
+        record = {
+            "id": outcome.job_id,
+            "tool_id": outcome.tool_id,
+            "success": result.success,
+            "cancelled": result.cancelled,
+            "seconds": round(outcome.seconds, 3),
+            "outputs": [str(p) for p in result.outputs],
+            "warning": result.warning,
+            "error": result.error,
+        }
+        print(json.dumps(record, ensure_ascii=False), flush=True)
+        return
+    status = "ok" if result.success else "cancelled" if result.cancelled else "failed"
+    line = f"{status:<9} {outcome.job_id} ({outcome.tool_id}) {outcome.seconds:.2f}s"
+    if result.success:
+        line += f" -> {len(result.outputs)} output(s)"
+    elif result.error:
+        line += f": {result.error}"
+    if result.warning:
+        line += f" [{result.warning}]"
+    print(line, flush=True)
+
+
+def _summarize(outcomes: List[BatchOutcome], seconds: float, as_json: bool) -> int:
+    failed = sum(1 for o in outcomes if not o.result.success and not o.result.cancelled)
+    cancelled = sum(1 for o in outcomes if o.result.cancelled)
+    if not as_json:
+        print(
+            f"{len(outcomes)} job(s): {len(outcomes) - failed - cancelled} ok, {failed} failed, "
+            f"{cancelled} cancelled in {seconds:.2f}s",
+            file=sys.stderr,
+        )
+    if failed:
+        return EXIT_FAILED
+    if cancelled:
+        return EXIT_CANCELLED
+    return EXIT_OK
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -14,10 +14,14 @@ else:
 BASE_DIR = base_dir
 ASSETS_DIR = BASE_DIR / "assets"
 
+# Created on first use via ensure_dir(), not at import time.
 DEFAULT_OUTPUT_DIR = Path.home() / "Documents" / "PDFToolbox"
-DEFAULT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-
 DEFAULT_TEMP_DIR = Path.home() / ".pdf_toolbox_tmp"
-DEFAULT_TEMP_DIR.mkdir(parents=True, exist_ok=True)
+DEFAULT_CACHE_DIR = Path.home() / ".pdf_toolbox_cache"
+
+
+def ensure_dir(path: Path) -> Path:
+    path.mkdir(parents=True, exist_ok=True)
+    return path
 
 
@@ -0,0 +1,189 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobProgress, JobResult, JobSpec
+from pdf_toolbox.core.process_pool import BACKEND_PROCESS, BACKEND_THREAD, BACKENDS, ProcessJobExecutor
+from pdf_toolbox.core.runner import run_job
+from pdf_toolbox.i18n import t
+from pdf_toolbox.services.pdf_ops import default_backend
+
+
+class ManifestError(ValueError):
+    pass
+
+
+@dataclass
+class BatchJob:
+    job_id: str
+    spec: JobSpec
+
+
+@dataclass
+class BatchOutcome:
+    job_id: str
+    tool_id: str
+    result: JobResult
+    seconds: float
+
+
+def spec_from_dict(data: Dict[str, Any], base_dir: Optional[Path] = None) -> JobSpec:
+    def resolve(value: str) -> Path:
+        path = Path(value).expanduser()
+        return path if path.is_absolute() or base_dir is None else base_dir / path
+
+    try:
+        inputs = data["inputs"]
+        if isinstance(inputs, str):
+            inputs = [inputs]
+        return JobSpec(
+            tool_id=str(data["tool_id"]),
+            inputs=[resolve(p) for p in inputs],
+            output_dir=resolve(data["output_dir"]),
+            output_name=data.get("output_name"),
+            params=dict(data.get("params") or {}),
+            overwrite=bool(data.get("overwrite", False)),
+        )
+    except KeyError as exc:
+        raise ManifestError(f"missing field {exc.args[0]!r}") from None
+    except (TypeError, AttributeError) as exc:
+        raise ManifestError(str(exc)) from None
+
+
+def load_manifest(path: Path) -> List[BatchJob]:
+    with path.open(encoding="utf-8-sig") as fh:
+        return parse_manifest(fh, path.resolve().parent, source=str(path))
+
+
+def parse_manifest(lines: Iterable[str], base_dir: Path, source: str = "<manifest>") -> List[BatchJob]:
+    # One JobSpec object per line; relative paths resolve against ``base_dir``.
+    jobs: List[BatchJob] = []
+    # Job ids key the runner's tokens and results, so two jobs may not share one.
+    seen: Dict[str, int] = {}
+    for line_no, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        try:
+            data = json.loads(line)
+            if not isinstance(data, dict):
+                raise ManifestError("expected a JSON object")
+            spec = spec_from_dict(data, base_dir)
+        except (ValueError, ManifestError) as exc:
+            raise ManifestError(f"{source}:{line_no}: {exc}") from None
+        job_id = str(data.get("id") or f"job-{line_no}")
+        if job_id in seen:
+            raise ManifestError(f"{source}:{line_no}: duplicate job id {job_id!r} (first used on line {seen[job_id]})")
+        seen[job_id] = line_no
+        jobs.append(BatchJob(job_id, spec))
+    return jobs
+
+
+class BatchRunner:
+    # Qt-free counterpart of JobQueue: runs jobs with at most ``max_workers`` in flight and times each one.
+    def __init__(
+        self,
+        max_workers: int = 1,
+        backend: Optional[str] = None,
+        on_progress: Optional[Callable[[JobProgress], None]] = None,
+        on_finished: Optional[Callable[[BatchOutcome], None]] = None,
+    ) -> None:
+        if backend is not None and backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self.max_workers = max(1, max_workers)
+        self.backend = backend
+        self._on_progress = on_progress or (lambda progress: None)
+        self._on_finished = on_finished or (lambda outcome: None)
+        self._tokens: Dict[str, CancellationToken] = {}
+        self._waiters: Dict[str, threading.Event] = {}
+        self._results: Dict[str, JobResult] = {}
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._process_executor: ProcessJobExecutor | None = None
+
+    def run(self, jobs: List[BatchJob]) -> List[BatchOutcome]:
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="batch-job") as pool:
+                futures = [pool.submit(self._run_one, job) for job in jobs]
+                try:
+                    return [future.result() for future in futures]
+                except BaseException:
+                    # Ctrl+C lands here; stop the running jobs before the pool waits for them.
+                    self.cancel()
+                    raise
+        finally:
+            if self._process_executor is not None:
+                self._process_executor.shutdown()
+                self._process_executor = None
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._cancelled = True
+            tokens = list(self._tokens.values())
+        for token in tokens:
+            token.cancel()
+
+    def _run_one(self, job: BatchJob) -> BatchOutcome:
+        start = time.perf_counter()
+        with self._lock:
+            cancelled = self._cancelled
+        if cancelled:
+            result = JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+        elif self._backend_for(job.spec) == BACKEND_PROCESS:
+            result = self._run_in_process(job)
+        else:
+            token = CancellationToken()
+            with self._lock:
+                self._tokens[job.job_id] = token
+
+            def progress_cb(stage: str, current: int, total: int, message: str = "") -> None:
+                self._on_progress(JobProgress(job.job_id, stage, current, total, message))
+
+            result = run_job(job.job_id, job.spec, progress_cb, token)
+        with self._lock:
+            self._tokens.pop(job.job_id, None)
+        outcome = BatchOutcome(job.job_id, job.spec.tool_id, result, time.perf_counter() - start)
+        self._on_finished(outcome)
+        return outcome
+
+    def _run_in_process(self, job: BatchJob) -> JobResult:
+        done = threading.Event()
+        with self._lock:
+            if self._process_executor is None:
+                self._process_executor = ProcessJobExecutor(
+                    self._on_progress, self._process_finished, max_workers=self.max_workers
+                )
+            executor = self._process_executor
+            self._waiters[job.job_id] = done
+        token = executor.submit(job.job_id, job.spec)
+        with self._lock:
+            self._tokens[job.job_id] = token
+            if self._cancelled:
+                token.cancel()
+        done.wait()
+        with self._lock:
+            return self._results.pop(job.job_id)
+
+    def _process_finished(self, job_id: str, result: JobResult) -> None:
+        with self._lock:
+            self._results[job_id] = result
+            done = self._waiters.pop(job_id, None)
+        if done is not None:
+            done.set()
+
+    def _backend_for(self, spec: JobSpec) -> str:
+        backend = spec.params.get("backend") or self.backend
+        if backend in BACKENDS:
+            return backend
+        try:
+            return default_backend(spec)
+        except ValueError:
+            # Unknown tools fail inside run_job with the usual message.
+            return BACKEND_THREAD
@@ -2,29 +2,18 @@
 
 import logging
 import uuid
-from typing import Dict
+from typing import Dict, Optional
 
 from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
 
 from pdf_toolbox.core.models import JobProgress, JobResult, JobSpec
 from pdf_toolbox.core.cancel import CancellationToken
-from pdf_toolbox.core.range_parser import RangeParseError
-from pdf_toolbox.i18n import t
-from pdf_toolbox.services.io.validators import ValidationError
-from pdf_toolbox.services.pdf_ops import get_operation
+from pdf_toolbox.core.process_pool import BACKEND_PROCESS, BACKEND_THREAD, BACKENDS, ProcessJobExecutor
+from pdf_toolbox.core.runner import run_job
+from pdf_toolbox.services.pdf_ops import default_backend
 
 logger = logging.getLogger(__name__)
 
-try:
-    import pikepdf
-except Exception:  # noqa: BLE001
-    pikepdf = None
-
-try:
-    import fitz
-except Exception:  # noqa: BLE001
-    fitz = None
-
 
 class JobSignals(QObject):
     progress = Signal(JobProgress)
@@ -40,22 +29,8 @@ class JobWorker(QRunnable):
         self.signals = signals
 
     def run(self) -> None:
-        try:
-            if self.token.is_cancelled():
-                self.signals.finished.emit(
-                    self.job_id, JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                )
-                return
-            op = get_operation(self.spec.tool_id)
-            op.validate(self.spec)
-            result = op.run(self.spec, self._progress, self.token)
-            self.signals.finished.emit(self.job_id, result)
-        except Exception as exc:  # noqa: BLE001
-            logger.exception("Job failed: %s", self.job_id)
-            message = _friendly_error(exc)
-            self.signals.finished.emit(
-                self.job_id, JobResult(success=False, error=message, cancelled=self.token.is_cancelled())
-            )
+        result = run_job(self.job_id, self.spec, self._progress, self.token)
+        self.signals.finished.emit(self.job_id, result)
 
     def _progress(self, stage: str, current: int, total: int, message: str = "") -> None:
         self.signals.progress.emit(JobProgress(self.job_id, stage, current, total, message))
@@ -65,16 +40,28 @@ class JobQueue(QObject):
     progress = Signal(JobProgress)
     finished = Signal(str, JobResult)
 
-    def __init__(self) -> None:
+    def __init__(self, process_workers: Optional[int] = None, max_jobs_per_worker: int = 20) -> None:
         super().__init__()
         self._pool = QThreadPool.globalInstance()
         self._tokens: Dict[str, CancellationToken] = {}
         self._signals = JobSignals()
         self._signals.progress.connect(self.progress)
         self._signals.finished.connect(self._on_finished)
+        self._backends: Dict[str, str] = {}
+        self._process_workers = process_workers
+        self._max_jobs_per_worker = max_jobs_per_worker
+        self._process_executor: ProcessJobExecutor | None = None
+
+    def set_backend(self, tool_id: str, backend: str) -> None:
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown backend: {backend}")
+        self._backends[tool_id] = backend
 
     def submit(self, spec: JobSpec) -> str:
         job_id = uuid.uuid4().hex
+        if self._backend_for(spec) == BACKEND_PROCESS:
+            self._tokens[job_id] = self._process_pool().submit(job_id, spec)
+            return job_id
         token = CancellationToken()
         self._tokens[job_id] = token
         worker = JobWorker(job_id, spec, token, self._signals)
@@ -85,29 +72,35 @@ class JobQueue(QObject):
         token = self._tokens.get(job_id)
         if token:
             token.cancel()
+        if self._process_executor is not None:
+            self._process_executor.cancel(job_id)
+
+    def shutdown(self) -> None:
+        for token in list(self._tokens.values()):
+            token.cancel()
+        if self._process_executor is not None:
+            self._process_executor.shutdown()
+            self._process_executor = None
+
+    def _backend_for(self, spec: JobSpec) -> str:
+        backend = spec.params.get("backend") or self._backends.get(spec.tool_id)
+        if backend in BACKENDS:
+            return backend
+        try:
+            return default_backend(spec)
+        except Exception:  # noqa: BLE001
+            return BACKEND_THREAD
+
+    def _process_pool(self) -> ProcessJobExecutor:
+        if self._process_executor is None:
+            self._process_executor = ProcessJobExecutor(
+                on_progress=self._signals.progress.emit,
+                on_finished=self._signals.finished.emit,
+                max_workers=self._process_workers,
+                max_jobs_per_worker=self._max_jobs_per_worker,
+            )
+        return self._process_executor
 
     def _on_finished(self, job_id: str, result: JobResult) -> None:
         self._tokens.pop(job_id, None)
         self.finished.emit(job_id, result)
-
-
-def _friendly_error(exc: Exception) -> str:
-    if isinstance(exc, ValidationError):
-        return str(exc)
-    if isinstance(exc, RangeParseError):
-        return t("err_page_range", error=str(exc))
-    if pikepdf and isinstance(exc, pikepdf.PasswordError):
-        return t("err_pdf_encrypted")
-    if pikepdf and isinstance(exc, pikepdf.PdfError):
-        return t("err_pdf_corrupt_format")
-    if fitz and isinstance(exc, fitz.FileDataError):
-        return t("err_pdf_corrupt_read")
-    if isinstance(exc, PermissionError):
-        return t("err_permission")
-    if isinstance(exc, FileNotFoundError):
-        return t("err_file_not_found")
-    if isinstance(exc, IsADirectoryError):
-        return t("err_is_directory")
-    return str(exc)
-
-
@@ -15,6 +15,33 @@ class JobSpec:
     overwrite: bool = False
 
 
+@dataclass
+class PipelineStage:
+    tool_id: str
+    params: Dict[str, Any] = field(default_factory=dict)
+
+
+PIPELINE_TOOL_ID = "pipeline"
+
+
+def pipeline_spec(
+    stages: List[PipelineStage],
+    inputs: List[Path],
+    output_dir: Path,
+    output_name: Optional[str] = None,
+    overwrite: bool = False,
+) -> JobSpec:
+    # Stages are stored as plain dicts so pipeline specs survive JSON manifests and process pickling unchanged.
+    return JobSpec(
+        tool_id=PIPELINE_TOOL_ID,
+        inputs=list(inputs),
+        output_dir=output_dir,
+        output_name=output_name,
+        params={"stages": [{"tool_id": s.tool_id, "params": dict(s.params)} for s in stages]},
+        overwrite=overwrite,
+    )
+
+
 @dataclass
 class JobProgress:
     job_id: str
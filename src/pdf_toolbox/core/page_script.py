@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence, Tuple
+
+from pdf_toolbox.core.range_parser import RangeParseError, parse_page_range
+from pdf_toolbox.i18n import t
+
+# (source page index, clockwise rotation to add) for each page of the output, in output order.
+PagePlan = List[Tuple[int, int]]
+
+PAGE_EDIT_OPS = ("delete", "keep", "order", "rotate", "move")
+_ALIASES = {"extract": "keep", "reorder": "order", "remove": "delete"}
+_MOVE_TARGET_RE = re.compile(r"^(start|end|before\s+(\d+)|after\s+(\d+))$")
+
+
+class PageScriptError(ValueError):
+    pass
+
+
+@dataclass(frozen=True)
+class PageEdit:
+    op: str
+    pages: str = ""
+    angle: int = 0
+    to: str = "end"
+
+    def describe(self) -> str:
+        if self.op == "rotate":
+            return f"rotate {self.pages} {self.angle}"
+        if self.op == "move":
+            return f"move {self.pages} {self.to}"
+        return f"{self.op} {self.pages}"
+
+
+def parse_page_script(text: str) -> List[PageEdit]:
+    # One edit per line or ";"-separated, "#" starts a comment:
+    #   delete 1 / keep 2-9 / order 3,1,2 / rotate 3-7 90 / move 40-52 end|start|before N|after N
+    edits: List[PageEdit] = []
+    for raw in re.split(r"[;\n]", text or ""):
+        line = raw.split("#", 1)[0].strip()
+        if not line:
+            continue
+        word, _, rest = line.partition(" ")
+        op = _ALIASES.get(word.lower(), word.lower())
+        rest = rest.strip()
+        if op not in PAGE_EDIT_OPS:
+            raise PageScriptError(t("err_page_script_unknown", op=word))
+        if op == "rotate":
+            pages, _, angle = rest.rpartition(" ")
+            edits.append(_edit(line, op=op, pages=pages, angle=angle))
+        elif op == "move":
+            match = re.search(r"\s(start|end|before\s+\d+|after\s+\d+)$", rest)
+            if not match:
+                raise PageScriptError(t("err_page_script_syntax", line=line))
+            edits.append(_edit(line, op=op, pages=rest[: match.start()], to=match.group(1)))
+        else:
+            edits.append(_edit(line, op=op, pages=rest))
+    return edits
+
+
+def page_edits_from_param(value: Any) -> List[PageEdit]:
+    # Accepts the script text or a list of {"op": ..., "pages": ..., "angle": ..., "to": ...} dicts (CLI manifests).
+    if isinstance(value, str):
+        edits = parse_page_script(value)
+    else:
+        edits = [_edit_from_dict(item) for item in value or []]
+    if not edits:
+        raise PageScriptError(t("err_page_script_empty"))
+    return edits
+
+
+def compile_page_plan(edits: Sequence[PageEdit], total_pages: int) -> PagePlan:
+    plan: PagePlan = [(i, 0) for i in range(total_pages)]
+    for edit in edits:
+        try:
+            plan = _apply(edit, plan)
+        except RangeParseError as exc:
+            raise PageScriptError(t("err_page_script_step", step=edit.describe(), error=exc)) from exc
+        if not plan:
+            raise PageScriptError(t("err_page_script_no_pages", step=edit.describe()))
+    return plan
+
+
+def _apply(edit: PageEdit, plan: PagePlan) -> PagePlan:
+    # Page numbers always refer to the document as left by the previous edits.
+    selected = parse_page_range(edit.pages, len(plan))
+    if edit.op == "delete":
+        dropped = set(selected)
+        return [entry for i, entry in enumerate(plan) if i not in dropped]
+    if edit.op == "keep":
+        return [plan[i] for i in selected]
+    if edit.op == "order":
+        if len(selected) != len(plan):
+            error = t("err_reorder_must_cover_all")
+            raise PageScriptError(t("err_page_script_step", step=edit.describe(), error=error))
+        return [plan[i] for i in selected]
+    if edit.op == "rotate":
+        turned = set(selected)
+        return [(src, (rot + edit.angle) % 360) if i in turned else (src, rot) for i, (src, rot) in enumerate(plan)]
+    return _move(edit, plan, selected)
+
+
+def _move(edit: PageEdit, plan: PagePlan, selected: List[int]) -> PagePlan:
+    moved = set(selected)
+    rest = [entry for i, entry in enumerate(plan) if i not in moved]
+    if edit.to == "start":
+        position = 0
+    elif edit.to == "end":
+        position = len(rest)
+    else:
+        match = _MOVE_TARGET_RE.match(edit.to)
+        anchor = int(match.group(2) or match.group(3)) - 1
+        if not 0 <= anchor < len(plan):
+            error = t("range_page_out_of_range", page=anchor + 1, max_pages=len(plan))
+            raise PageScriptError(t("err_page_script_step", step=edit.describe(), error=error))
+        if anchor in moved:
+            raise PageScriptError(t("err_page_script_move_target", step=edit.describe(), page=anchor + 1))
+        position = sum(1 for i in range(anchor) if i not in moved) + (1 if edit.to.startswith("after") else 0)
+    return rest[:position] + [plan[i] for i in selected] + rest[position:]
+
+
+def _edit(line: str, **fields: Any) -> PageEdit:
+    op = fields["op"]
+    pages = "".join(str(fields.get("pages", "")).split())
+    if not pages:
+        raise PageScriptError(t("err_page_script_syntax", line=line))
+    angle = 0
+    if op == "rotate":
+        try:
+            angle = int(fields.get("angle", 90))
+        except (TypeError, ValueError):
+            raise PageScriptError(t("err_page_script_syntax", line=line)) from None
+        if angle % 90:
+            raise PageScriptError(t("err_page_script_angle", angle=angle))
+    to = " ".join(str(fields.get("to", "end")).lower().split())
+    if op == "move" and not _MOVE_TARGET_RE.match(to):
+        raise PageScriptError(t("err_page_script_syntax", line=line))
+    return PageEdit(op=op, pages=pages, angle=angle, to=to)
+
+
+def _edit_from_dict(item: Dict[str, Any]) -> PageEdit:
+    if not isinstance(item, dict):
+        raise PageScriptError(t("err_page_script_syntax", line=item))
+    op = _ALIASES.get(str(item.get("op", "")).lower(), str(item.get("op", "")).lower())
+    if op not in PAGE_EDIT_OPS:
+        raise PageScriptError(t("err_page_script_unknown", op=item.get("op")))
+    return _edit(str(item), **{**item, "op": op})
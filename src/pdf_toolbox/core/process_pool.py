@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import sys
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Callable, Dict, Optional
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobProgress, JobResult, JobSpec
+from pdf_toolbox.core.runner import run_job
+from pdf_toolbox.i18n import get_language, set_language, t
+
+logger = logging.getLogger(__name__)
+
+BACKEND_THREAD = "thread"
+BACKEND_PROCESS = "process"
+BACKENDS = (BACKEND_THREAD, BACKEND_PROCESS)
+
+DEFAULT_MAX_JOBS_PER_WORKER = 20
+
+_FINISHED = "finished"
+_PROGRESS = "progress"
+_STOP = "stop"
+
+# How many jobs share the machine when this process is a pool worker; 1 in any other process.
+_worker_concurrency = 1
+
+
+class ProcessCancellationToken(CancellationToken):
+    def __init__(self, event) -> None:
+        self._event = event
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    def is_cancelled(self) -> bool:
+        return self._event.is_set()
+
+
+class ProcessJobExecutor:
+    def __init__(
+        self,
+        on_progress: Callable[[JobProgress], None],
+        on_finished: Callable[[str, JobResult], None],
+        max_workers: Optional[int] = None,
+        max_jobs_per_worker: int = DEFAULT_MAX_JOBS_PER_WORKER,
+    ) -> None:
+        self._on_progress = on_progress
+        self._on_finished = on_finished
+        self._ctx = multiprocessing.get_context("spawn")
+        workers = max_workers or default_process_workers()
+        self._pool_kwargs = {
+            "max_workers": workers,
+            "mp_context": self._ctx,
+            "initializer": _init_worker,
+            "initargs": (workers,),
+        }
+        if max_jobs_per_worker > 0:
+            if sys.version_info >= (3, 11):
+                self._pool_kwargs["max_tasks_per_child"] = max_jobs_per_worker
+            else:
+                logger.info("Python %d.%d cannot recycle pool workers; they live until shutdown", *sys.version_info[:2])
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._start_events()
+        self._executor = ProcessPoolExecutor(**self._pool_kwargs)
+
+    def submit(self, job_id: str, spec: JobSpec) -> ProcessCancellationToken:
+        with self._lock:
+            try:
+                token = ProcessCancellationToken(self._manager.Event())
+                future = self._submit(job_id, spec, token)
+            except (BrokenProcessPool, EOFError, OSError):
+                # A worker died (a crash or OOM kill in MuPDF or Tesseract) and took the pool with it; without a
+                # fresh pool every later job on the process backend would fail until the app restarts.
+                logger.warning("Process pool is broken; starting a new one for job %s", job_id, exc_info=True)
+                self._restart()
+                token = ProcessCancellationToken(self._manager.Event())
+                future = self._submit(job_id, spec, token)
+            self._futures[job_id] = future
+        future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+        return token
+
+    def _submit(self, job_id: str, spec: JobSpec, token: ProcessCancellationToken) -> Future:
+        return self._executor.submit(_run_in_process, job_id, spec, get_language(), token._event, self._queue)
+
+    def _start_events(self) -> None:
+        self._manager = self._ctx.Manager()
+        self._queue = self._manager.Queue()
+        self._pump = threading.Thread(
+            target=self._pump_events, args=(self._queue,), name="process-job-events", daemon=True
+        )
+        self._pump.start()
+
+    def _restart(self) -> None:
+        # Called with the lock held. Jobs of the broken pool have already failed; their results still arrive
+        # through the old event queue, so it is only replaced when its Manager process is gone too.
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._executor = ProcessPoolExecutor(**self._pool_kwargs)
+        try:
+            self._queue.qsize()
+        except (EOFError, OSError):
+            self._start_events()
+
+    def cancel(self, job_id: str) -> None:
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None:
+            future.cancel()
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        try:
+            self._queue.put((_STOP, None, None))
+        except Exception:  # noqa: BLE001
+            pass
+        self._pump.join(timeout=2)
+        self._manager.shutdown()
+
+    def _on_done(self, job_id: str, future: Future) -> None:
+        with self._lock:
+            self._futures.pop(job_id, None)
+        if future.cancelled():
+            result = JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+        elif future.exception() is not None:
+            logger.error("Process job failed: %s", job_id, exc_info=future.exception())
+            result = JobResult(success=False, error=str(future.exception()))
+        else:
+            result = future.result()
+        # Routed through the event queue so it lands after the job's last progress update.
+        try:
+            self._queue.put((_FINISHED, job_id, result))
+        except Exception:  # noqa: BLE001
+            self._on_finished(job_id, result)
+
+    def _pump_events(self, queue) -> None:
+        while True:
+            try:
+                kind, job_id, payload = queue.get()
+            except (EOFError, OSError):
+                return
+            if kind == _STOP:
+                return
+            if kind == _PROGRESS:
+                self._on_progress(payload)
+            elif kind == _FINISHED:
+                self._on_finished(job_id, payload)
+
+
+def default_process_workers() -> int:
+    return max(1, (os.cpu_count() or 2) - 1)
+
+
+def cpu_share() -> int:
+    # CPUs a job may spread its own work over; a pool worker leaves the rest to the jobs running beside it.
+    return max(1, (os.cpu_count() or 1) // _worker_concurrency)
+
+
+def _init_worker(concurrency: int) -> None:
+    global _worker_concurrency
+    _worker_concurrency = max(1, concurrency)
+
+
+def _run_in_process(job_id: str, spec: JobSpec, language: str, cancel_event, queue) -> JobResult:
+    set_language(language)
+    token = ProcessCancellationToken(cancel_event)
+
+    def progress_cb(stage: str, current: int, total: int, message: str = "") -> None:
+        queue.put((_PROGRESS, job_id, JobProgress(job_id, stage, current, total, message)))
+
+    return run_job(job_id, spec, progress_cb, token)
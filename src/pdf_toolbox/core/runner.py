@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+import logging
+import sys
+from typing import Callable
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobResult, JobSpec
+from pdf_toolbox.core.range_parser import RangeParseError
+from pdf_toolbox.i18n import t
+from pdf_toolbox.services.io.validators import ValidationError
+from pdf_toolbox.services.pdf_ops import get_operation
+
+logger = logging.getLogger(__name__)
+
+ProgressCb = Callable[[str, int, int, str], None]
+
+
+def run_job(job_id: str, spec: JobSpec, progress_cb: ProgressCb, token: CancellationToken) -> JobResult:
+    try:
+        if token.is_cancelled():
+            return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+        op = get_operation(spec.tool_id)
+        op.validate(spec)
+        return op.run(spec, progress_cb, token)
+    except Exception as exc:  # noqa: BLE001
+        logger.exception("Job failed: %s", job_id)
+        return JobResult(success=False, error=friendly_error(exc), cancelled=token.is_cancelled())
+
+
+def friendly_error(exc: Exception) -> str:
+    if isinstance(exc, ValidationError):
+        return str(exc)
+    if isinstance(exc, RangeParseError):
+        return t("err_page_range", error=str(exc))
+    # Only look at libraries an operation has already imported; importing them here would defeat lazy loading.
+    pikepdf = sys.modules.get("pikepdf")
+    fitz = sys.modules.get("fitz")
+    if pikepdf and isinstance(exc, pikepdf.PasswordError):
+        return t("err_pdf_encrypted")
+    if pikepdf and isinstance(exc, pikepdf.PdfError):
+        return t("err_pdf_corrupt_format")
+    if fitz and isinstance(exc, fitz.FileDataError):
+        return t("err_pdf_corrupt_read")
+    if isinstance(exc, PermissionError):
+        return t("err_permission")
+    if isinstance(exc, FileNotFoundError):
+        return t("err_file_not_found")
+    if isinstance(exc, IsADirectoryError):
+        return t("err_is_directory")
+    return str(exc)
@@ -64,6 +64,19 @@ _translations: Dict[str, Dict[str, str]] = {
         "err_missing_office_components": "Office/WPS support components not installed: {error}",
         "err_no_ppt_engine": "No PPT engine detected. Please install PowerPoint or WPS Presentation. ({error})",
         "err_reorder_must_cover_all": "Reorder must cover all pages without duplicates.",
+        "warn_split_no_bookmarks": "No bookmarks found; the pages were written to a single file.",
+        "warn_incremental_fallback": "{name} cannot take appended changes and was saved in full.",
+        "err_page_script_empty": "No page edits given.",
+        "err_pipeline_empty": "A pipeline needs at least one stage.",
+        "err_pipeline_nested": "A pipeline stage cannot be another pipeline.",
+        "err_pipeline_stage": "Stage {index} ({tool}): {error}",
+        "err_page_script_unknown": "Unknown page edit: {op}",
+        "err_page_script_syntax": "Invalid page edit: {line}",
+        "err_page_script_angle": "Rotation must be a multiple of 90: {angle}",
+        "err_page_script_step": "{step}: {error}",
+        "err_page_script_no_pages": "{step}: no pages left.",
+        "err_page_script_move_target": "{step}: target page {page} is one of the moved pages.",
+        "warn_split_oversize": "{count} page(s) exceed the size limit on their own and were written as single files.",
         "browse": "Browse",
         "select_folder": "Select Folder",
         "select_files": "Select Files",
@@ -80,14 +93,23 @@ _translations: Dict[str, Dict[str, str]] = {
         "stage_processing": "Processing",
         "stage_writing": "Writing",
         "progress_reencode_page": "Re-encode page {page}",
+        "progress_reencode_page_dpi": "Re-encode page {page} at {dpi} dpi",
+        "progress_recompress_image": "Re-encode image {index}/{total}",
+        "progress_recompress_done": "Write complete, {count} images re-encoded ({size} saved)",
         "progress_process_page": "Processing page {page}",
         "progress_export_page": "Export page {page}",
+        "progress_export_page_dpi": "Export page {page} at {dpi} dpi",
+        "progress_extract_image_page": "Extract page {page} ({fmt}, as stored)",
         "progress_merge_file": "Merge: {name}",
+        "progress_pipeline_stage": "[{index}/{count} {tool}]",
+        "progress_merge_dedup": "Write complete, {count} duplicate resources removed ({size} saved)",
         "progress_write_complete": "Write complete",
-        "progress_split_page": "Split page {page}",
+        "progress_split_file": "Wrote {name}",
         "progress_extract_page": "Extract page {page}",
         "progress_reorder_page": "Reorder page {page}",
         "progress_ocr_page": "OCR: {name} page {page}",
+        "progress_ocr_page_dpi": "OCR: {name} page {page} at {dpi} dpi",
+        "progress_ocr_skip_page": "Text layer kept: {name} page {page}",
         "progress_convert_file": "Converting {name}",
         "progress_complete_file": "Completed {name}",
         "label_input_pdf": "Input PDF",
@@ -104,23 +126,40 @@ _translations: Dict[str, Dict[str, str]] = {
         "label_new_order": "New Order",
         "placeholder_new_order": "3,1,2,4-6",
         "label_keep_bookmarks": "Keep bookmarks",
+        "label_incremental_save": "Fast save: append changes to a copy (deleted pages remain recoverable in the file)",
         "label_tip_reorder": "Tip: order must cover all pages without duplicates.",
+        "label_page_script": "Page edits (one per line)",
+        "placeholder_page_script": "delete 1\nrotate 2-6 90\nmove 40-52 end",
+        "label_tip_page_script": (
+            "delete / keep / order <pages>, rotate <pages> <angle>, move <pages> start | end | before N | after N. "
+            "Page numbers refer to the document as left by the previous lines; everything is saved once at the end."
+        ),
         "label_basic_compress": "Basic compression",
         "label_image_reencode": "Image re-encode compression",
         "label_linearize": "Linearize (web optimized)",
         "label_recompress": "Recompress streams",
         "label_grayscale": "Grayscale",
+        "label_keep_vectors": "Keep text and vectors (re-encode embedded images only)",
         "label_image_compress_options": "Image compression options",
         "label_pdf_to_images_options": "PDF → Images Options",
         "label_page_size": "Page Size",
         "label_language": "Language",
         "label_output_searchable_pdf": "Output searchable PDF",
         "label_output_word": "Output Word",
+        "label_ocr_smart": "Skip pages that already have text",
+        "label_merge_dedup": "Remove duplicate fonts/images (smaller output)",
+        "label_ocr_sandwich": "Keep original pages (add invisible text layer only)",
+        "label_ocr_use_cache": "Reuse cached OCR results",
+        "label_ocr_cache_info": "Cache: {path} ({size} MB)",
+        "btn_clear_ocr_cache": "Clear Cache",
         "label_dpi": "DPI",
+        "label_dpi_auto": "Auto DPI (match embedded scans)",
+        "label_extract_images": "Save scanned pages as their original images (no re-encoding)",
         "panel_merge": "Merge",
         "panel_split_extract": "Split/Extract",
         "panel_delete_rotate": "Delete/Rotate",
         "panel_reorder": "Reorder",
+        "panel_page_edit": "Edit Pages",
         "panel_compress": "Compress",
         "panel_pdf_to_images": "PDF → Images",
         "panel_images_to_pdf": "Images → PDF",
@@ -128,12 +167,18 @@ _translations: Dict[str, Dict[str, str]] = {
         "panel_ocr": "OCR",
         "option_extract_one_pdf": "Extract to single PDF",
         "option_split_many_pdf": "Split into multiple PDFs by page",
+        "option_split_every_n": "Split every N pages",
+        "option_split_bookmarks": "Split by top-level bookmarks",
+        "option_split_max_size": "Split by maximum file size",
+        "label_pages_per_file": "Pages per file",
+        "label_max_size_mb": "Max size per file",
         "option_delete_pages": "Delete pages",
         "option_rotate_pages": "Rotate pages",
         "btn_start_merge": "Start Merge",
         "btn_start_split_extract": "Start Split/Extract",
         "btn_start_execute": "Start",
         "btn_start_reorder": "Start Reorder",
+        "btn_start_page_edit": "Start Editing",
         "btn_start_compress": "Start Compression",
         "btn_start_convert": "Start Conversion",
         "btn_start_ocr": "Start OCR",
@@ -194,6 +239,19 @@ _translations: Dict[str, Dict[str, str]] = {
         "err_missing_office_components": "未安装 Office/WPS 支持组件: {error}",
         "err_no_ppt_engine": "未检测到可用的 PPT 引擎，请安装 PowerPoint 或 WPS 演示。({error})",
         "err_reorder_must_cover_all": "重排必须覆盖所有页且不重复。",
+        "warn_split_no_bookmarks": "未找到书签，所有页面已写入同一个文件。",
+        "warn_incremental_fallback": "{name} 无法追加修改，已完整保存。",
+        "err_page_script_empty": "未填写页面编辑步骤。",
+        "err_pipeline_empty": "流水线至少需要一个步骤。",
+        "err_pipeline_nested": "流水线步骤不能是另一个流水线。",
+        "err_pipeline_stage": "第 {index} 步（{tool}）: {error}",
+        "err_page_script_unknown": "未知的页面编辑命令: {op}",
+        "err_page_script_syntax": "页面编辑步骤格式错误: {line}",
+        "err_page_script_angle": "旋转角度必须是 90 的倍数: {angle}",
+        "err_page_script_step": "{step}: {error}",
+        "err_page_script_no_pages": "{step}: 执行后没有剩余页面。",
+        "err_page_script_move_target": "{step}: 目标页 {page} 也在移动的页面中。",
+        "warn_split_oversize": "{count} 页单页即超过大小限制，已各自单独输出。",
         "browse": "浏览",
         "select_folder": "选择目录",
         "select_files": "选择文件",
@@ -210,14 +268,23 @@ _translations: Dict[str, Dict[str, str]] = {
         "stage_processing": "处理中",
         "stage_writing": "写入中",
         "progress_reencode_page": "重编码页 {page}",
+        "progress_reencode_page_dpi": "重编码页 {page}（{dpi} dpi）",
+        "progress_recompress_image": "重编码图片 {index}/{total}",
+        "progress_recompress_done": "写入完成，重编码 {count} 张图片（节省 {size}）",
         "progress_process_page": "处理页 {page}",
         "progress_export_page": "导出页 {page}",
+        "progress_export_page_dpi": "导出页 {page}（{dpi} dpi）",
+        "progress_extract_image_page": "提取页 {page}（{fmt} 原图）",
         "progress_merge_file": "合并: {name}",
+        "progress_pipeline_stage": "[{index}/{count} {tool}]",
+        "progress_merge_dedup": "写入完成，去除 {count} 个重复资源（节省 {size}）",
         "progress_write_complete": "写入完成",
-        "progress_split_page": "拆分页 {page}",
+        "progress_split_file": "已写入 {name}",
         "progress_extract_page": "提取页 {page}",
         "progress_reorder_page": "重排页 {page}",
         "progress_ocr_page": "OCR: {name} 第 {page} 页",
+        "progress_ocr_page_dpi": "OCR: {name} 第 {page} 页（{dpi} dpi）",
+        "progress_ocr_skip_page": "保留原文字层: {name} 第 {page} 页",
         "progress_convert_file": "转换 {name}",
         "progress_complete_file": "完成 {name}",
         "label_input_pdf": "输入PDF",
@@ -234,23 +301,40 @@ _translations: Dict[str, Dict[str, str]] = {
         "label_new_order": "新顺序",
         "placeholder_new_order": "3,1,2,4-6",
         "label_keep_bookmarks": "保留书签",
+        "label_incremental_save": "快速保存：在副本末尾追加修改（删除的页面仍可从文件中恢复）",
         "label_tip_reorder": "提示: 顺序必须覆盖所有页且不重复",
+        "label_page_script": "页面编辑步骤（每行一步）",
+        "placeholder_page_script": "delete 1\nrotate 2-6 90\nmove 40-52 end",
+        "label_tip_page_script": (
+            "delete / keep / order <页码>，rotate <页码> <角度>，move <页码> start | end | before N | after N。"
+            "页码以上一步执行后的文档为准；全部步骤完成后只保存一次。"
+        ),
         "label_basic_compress": "基础压缩",
         "label_image_reencode": "图片重编码压缩",
         "label_linearize": "线性化 (网络优化)",
         "label_recompress": "重压缩流",
         "label_grayscale": "灰度",
+        "label_keep_vectors": "保留文字和矢量（仅重编码内嵌图片）",
         "label_image_compress_options": "图片压缩参数",
         "label_pdf_to_images_options": "PDF → 图片 参数",
         "label_page_size": "页面尺寸",
         "label_language": "语言",
         "label_output_searchable_pdf": "输出可搜索 PDF",
         "label_output_word": "输出 Word",
+        "label_ocr_smart": "跳过已有文字层的页面",
+        "label_merge_dedup": "去除重复的字体/图片（减小文件）",
+        "label_ocr_sandwich": "保留原始页面（仅叠加隐藏文字层）",
+        "label_ocr_use_cache": "复用已缓存的 OCR 结果",
+        "label_ocr_cache_info": "缓存：{path}（{size} MB）",
+        "btn_clear_ocr_cache": "清除缓存",
         "label_dpi": "DPI",
+        "label_dpi_auto": "自动 DPI（匹配内嵌扫描图）",
+        "label_extract_images": "扫描页直接保存原始图片（不重新编码）",
         "panel_merge": "合并",
         "panel_split_extract": "拆分/提取",
         "panel_delete_rotate": "删除/旋转",
         "panel_reorder": "重排",
+        "panel_page_edit": "页面编辑",
         "panel_compress": "压缩",
         "panel_pdf_to_images": "PDF → 图片",
         "panel_images_to_pdf": "图片 → PDF",
@@ -258,12 +342,18 @@ _translations: Dict[str, Dict[str, str]] = {
         "panel_ocr": "OCR 识别",
         "option_extract_one_pdf": "提取为单个PDF",
         "option_split_many_pdf": "按页拆分多个PDF",
+        "option_split_every_n": "每 N 页拆分",
+        "option_split_bookmarks": "按一级书签拆分",
+        "option_split_max_size": "按最大文件大小拆分",
+        "label_pages_per_file": "每个文件页数",
+        "label_max_size_mb": "单个文件最大大小",
         "option_delete_pages": "删除页",
         "option_rotate_pages": "旋转页",
         "btn_start_merge": "开始合并",
         "btn_start_split_extract": "开始拆分/提取",
         "btn_start_execute": "开始执行",
         "btn_start_reorder": "开始重排",
+        "btn_start_page_edit": "开始编辑",
         "btn_start_compress": "开始压缩",
         "btn_start_convert": "开始转换",
         "btn_start_ocr": "开始识别",
@@ -1,12 +1,13 @@
 ﻿import logging
 import sys
+from typing import Optional, TextIO
 
 
-def setup_logging(level: int = logging.INFO) -> None:
+def setup_logging(level: int = logging.INFO, stream: Optional[TextIO] = None) -> None:
     logging.basicConfig(
         level=level,
         format="[%(asctime)s] %(levelname)s %(name)s - %(message)s",
-        handlers=[logging.StreamHandler(sys.stdout)],
+        handlers=[logging.StreamHandler(stream or sys.stdout)],
     )
 
 
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Tuple
+
+from pdf_toolbox.config import DEFAULT_CACHE_DIR
+
+CACHE_VERSION = "1"
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+# Eviction trims the cache to this share of its limit.
+EVICT_LOW_WATER = 0.9
+
+
+def page_key(pixels, width: int, height: int, **params: object) -> str:
+    digest = hashlib.sha256()
+    digest.update(pixels)
+    extras = ";".join(f"{k}={params[k]}" for k in sorted(params))
+    digest.update(f"|v{CACHE_VERSION}|{width}x{height}|{extras}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def default_cache_root() -> Path:
+    return DEFAULT_CACHE_DIR / "ocr"
+
+
+def _cache_files(root: Path) -> Iterator[Path]:
+    # Files still being written are left alone; they become cache entries only once renamed.
+    for path in root.glob("*/*"):
+        if path.is_file() and not path.name.endswith(".tmp"):
+            yield path
+
+
+def cache_usage(root: Path | None = None) -> int:
+    # Bytes on disk, including entries written by other processes since this one indexed the folder.
+    total = 0
+    for path in _cache_files(root or default_cache_root()):
+        try:
+            total += path.stat().st_size
+        except OSError:
+            pass
+    return total
+
+
+class _Index:
+    # LRU order and sizes of the files in one cache folder, oldest first. Built from a single scan the first time
+    # the folder is used in this process and kept up to date by every OcrCache on it.
+    def __init__(self, root: Path) -> None:
+        self.lock = threading.Lock()
+        entries = []
+        for path in _cache_files(root):
+            stat = path.stat()
+            entries.append((stat.st_mtime, path, stat.st_size))
+        entries.sort()
+        self.sizes: OrderedDict[Path, int] = OrderedDict((path, size) for _, path, size in entries)
+        self.total = sum(self.sizes.values())
+
+
+_INDEXES: Dict[Path, _Index] = {}
+_INDEXES_LOCK = threading.Lock()
+
+
+def _index_for(root: Path) -> _Index:
+    with _INDEXES_LOCK:
+        index = _INDEXES.get(root)
+        if index is None:
+            index = _INDEXES[root] = _Index(root)
+        return index
+
+
+class OcrCache:
+    def __init__(self, root: Path | None = None, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.root = root or default_cache_root()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._index = _index_for(self.root.resolve())
+        self._lock = self._index.lock
+
+    def get(self, key: str, want_pdf: bool, want_text: bool) -> Optional[Tuple[Optional[bytes], Optional[str]]]:
+        pdf_path, txt_path = self._paths(key)
+        try:
+            pdf_bytes = pdf_path.read_bytes() if want_pdf else None
+            text = txt_path.read_text(encoding="utf-8") if want_text else None
+        except OSError:
+            with self._lock:
+                self.misses += 1
+            return None
+        # The mtime carries the LRU order over to the next process's scan.
+        for path in (pdf_path, txt_path):
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+        with self._lock:
+            self.hits += 1
+            for path in (pdf_path, txt_path):
+                if path in self._index.sizes:
+                    self._index.sizes.move_to_end(path)
+        return pdf_bytes, text
+
+    def put(self, key: str, pdf_bytes: Optional[bytes], text: Optional[str]) -> None:
+        pdf_path, txt_path = self._paths(key)
+        pdf_path.parent.mkdir(parents=True, exist_ok=True)
+        if pdf_bytes is not None:
+            self._write(pdf_path, pdf_bytes)
+        if text is not None:
+            self._write(txt_path, text.encode("utf-8"))
+        self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._index.sizes.clear()
+            self._index.total = 0
+        # Other processes (the process backend's OCR workers) add files this index does not know about.
+        for path in list(_cache_files(self.root)):
+            path.unlink(missing_ok=True)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._index.total
+
+    def _paths(self, key: str) -> Tuple[Path, Path]:
+        folder = self.root / key[:2]
+        return folder / f"{key}.pdf", folder / f"{key}.txt"
+
+    def _write(self, path: Path, data: bytes) -> None:
+        tmp = path.with_name(f"{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        with self._lock:
+            sizes = self._index.sizes
+            self._index.total += len(data) - sizes.pop(path, 0)
+            sizes[path] = len(data)
+
+    def _evict(self) -> None:
+        # Once over the limit, drop the least recently used files down to the low-water mark, so a full cache
+        # does not evict on every put.
+        with self._lock:
+            if self._index.total <= self.max_bytes:
+                return
+            target = int(self.max_bytes * EVICT_LOW_WATER)
+            sizes = self._index.sizes
+            victims = []
+            while sizes and self._index.total > target:
+                path, size = sizes.popitem(last=False)
+                self._index.total -= size
+                victims.append(path)
+        for path in victims:
+            path.unlink(missing_ok=True)
@@ -1,20 +1,87 @@
 ﻿from __future__ import annotations
 
+import hashlib
+import json
+import os
 import shutil
 import tempfile
+import threading
 from pathlib import Path
-from typing import Iterator
+from typing import Dict, Iterator, Optional
 from contextlib import contextmanager
 
-from pdf_toolbox.config import DEFAULT_TEMP_DIR
+from pdf_toolbox.config import DEFAULT_TEMP_DIR, ensure_dir
+
+
+MEMORY_TEMP_ROOT = Path("/dev/shm")
 
 
 @contextmanager
-def temp_dir(prefix: str = "pdf_toolbox_") -> Iterator[Path]:
-    path = Path(tempfile.mkdtemp(prefix=prefix, dir=DEFAULT_TEMP_DIR))
+def temp_dir(prefix: str = "pdf_toolbox_", root: Optional[Path] = None) -> Iterator[Path]:
+    path = Path(tempfile.mkdtemp(prefix=prefix, dir=ensure_dir(root or DEFAULT_TEMP_DIR)))
     try:
         yield path
     finally:
         shutil.rmtree(path, ignore_errors=True)
 
 
+def memory_temp_root() -> Optional[Path]:
+    # A RAM-backed folder (tmpfs) when the platform has one; files there never touch the disk. Only Linux provides
+    # one by default: Windows and macOS have no /dev/shm, so callers must handle None.
+    if MEMORY_TEMP_ROOT.is_dir() and os.access(MEMORY_TEMP_ROOT, os.W_OK | os.X_OK):
+        return MEMORY_TEMP_ROOT
+    return None
+
+
+def journal_key(src: Path, **params: object) -> str:
+    stat = src.stat()
+    extras = ";".join(f"{k}={params[k]}" for k in sorted(params))
+    ident = f"{src.resolve()}|{stat.st_size}|{stat.st_mtime_ns}|{extras}"
+    return hashlib.sha256(ident.encode("utf-8")).hexdigest()[:32]
+
+
+class JobJournal:
+    # Per-page checkpoints for long jobs. Page files are written first and the journal line last,
+    # so a page only counts as completed once everything it needs is on disk.
+    def __init__(self, key: str, root: Optional[Path] = None) -> None:
+        self.path = (root or DEFAULT_TEMP_DIR / "jobs") / key
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._log = self.path / "journal.jsonl"
+        self._lock = threading.Lock()
+        self.entries: Dict[int, dict] = {}
+        if self._log.exists():
+            for line in self._log.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A crash can leave the last line half-written; that page is simply redone.
+                    continue
+                self.entries[int(entry["page"])] = entry
+
+    def is_done(self, page_index: int) -> bool:
+        return page_index in self.entries
+
+    def record(self, page_index: int, files: Dict[str, bytes], **meta: object) -> None:
+        for suffix, data in files.items():
+            target = self._page_file(page_index, suffix)
+            tmp = target.with_name(target.name + ".tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, target)
+        entry = {"page": page_index, "files": sorted(files), **meta}
+        with self._lock:
+            with self._log.open("a", encoding="utf-8") as fh:
+                fh.write(json.dumps(entry) + "\n")
+                fh.flush()
+                os.fsync(fh.fileno())
+            self.entries[page_index] = entry
+
+    def read(self, page_index: int, suffix: str) -> Optional[bytes]:
+        if suffix not in self.entries.get(page_index, {}).get("files", ()):
+            return None
+        return self._page_file(page_index, suffix).read_bytes()
+
+    def discard(self) -> None:
+        shutil.rmtree(self.path, ignore_errors=True)
+
+    def _page_file(self, page_index: int, suffix: str) -> Path:
+        return self.path / f"page_{page_index:05d}.{suffix}"
@@ -1,35 +1,139 @@
-﻿from pdf_toolbox.services.pdf_ops.base import PdfOperation
-from pdf_toolbox.services.pdf_ops.compress_basic import CompressBasicOperation
-from pdf_toolbox.services.pdf_ops.compress_images import CompressImagesOperation
-from pdf_toolbox.services.pdf_ops.delete_pages import DeletePagesOperation
-from pdf_toolbox.services.pdf_ops.images_to_pdf import ImagesToPdfOperation
-from pdf_toolbox.services.pdf_ops.merge import MergeOperation
-from pdf_toolbox.services.pdf_ops.ocr import OcrOperation
-from pdf_toolbox.services.pdf_ops.pdf_to_images import PdfToImagesOperation
-from pdf_toolbox.services.pdf_ops.ppt_to_pdf import PptToPdfOperation
-from pdf_toolbox.services.pdf_ops.reorder_pages import ReorderPagesOperation
-from pdf_toolbox.services.pdf_ops.rotate_pages import RotatePagesOperation
-from pdf_toolbox.services.pdf_ops.split_extract import SplitExtractOperation
+﻿from __future__ import annotations
+
+import importlib
+import logging
+import threading
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from pdf_toolbox.core.models import PIPELINE_TOOL_ID, JobSpec
+from pdf_toolbox.services.pdf_ops.base import PdfOperation
 from pdf_toolbox.i18n import t
 
-_OPS = [
-    MergeOperation(),
-    SplitExtractOperation(),
-    DeletePagesOperation(),
-    RotatePagesOperation(),
-    ReorderPagesOperation(),
-    CompressBasicOperation(),
-    CompressImagesOperation(),
-    PdfToImagesOperation(),
-    ImagesToPdfOperation(),
-    PptToPdfOperation(),
-    OcrOperation(),
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class OperationDescriptor:
+    tool_id: str
+    display_name: str
+    import_path: str
+    backend: str = "thread"
+
+    def load(self) -> PdfOperation:
+        module_name, _, class_name = self.import_path.partition(":")
+        return getattr(importlib.import_module(module_name), class_name)()
+
+
+_PKG = "pdf_toolbox.services.pdf_ops"
+
+# Kept in sync with each operation's tool_id/display_name/backend; tests check that they match.
+OP_DESCRIPTORS: List[OperationDescriptor] = [
+    OperationDescriptor("merge", "Merge PDF", f"{_PKG}.merge:MergeOperation"),
+    OperationDescriptor("split_extract", "Split/Extract", f"{_PKG}.split_extract:SplitExtractOperation"),
+    OperationDescriptor("delete_pages", "Delete Pages", f"{_PKG}.delete_pages:DeletePagesOperation"),
+    OperationDescriptor("rotate_pages", "Rotate Pages", f"{_PKG}.rotate_pages:RotatePagesOperation"),
+    OperationDescriptor("reorder_pages", "Reorder Pages", f"{_PKG}.reorder_pages:ReorderPagesOperation"),
+    OperationDescriptor("page_edit", "Edit Pages", f"{_PKG}.page_edit:PageEditOperation"),
+    OperationDescriptor("compress_basic", "Basic Compression", f"{_PKG}.compress_basic:CompressBasicOperation"),
+    OperationDescriptor(
+        "compress_images",
+        "Image Re-encode Compression",
+        f"{_PKG}.compress_images:CompressImagesOperation",
+        backend="process",
+    ),
+    OperationDescriptor(
+        "pdf_to_images", "PDF to Images", f"{_PKG}.pdf_to_images:PdfToImagesOperation", backend="process"
+    ),
+    OperationDescriptor("images_to_pdf", "Images to PDF", f"{_PKG}.images_to_pdf:ImagesToPdfOperation"),
+    OperationDescriptor("ppt_to_pdf", "PPT to PDF", f"{_PKG}.ppt_to_pdf:PptToPdfOperation"),
+    OperationDescriptor("ocr", "OCR", f"{_PKG}.ocr:OcrOperation", backend="process"),
+    OperationDescriptor(PIPELINE_TOOL_ID, "Pipeline", f"{_PKG}.pipeline:PipelineOperation"),
 ]
 
-OP_REGISTRY = {op.tool_id: op for op in _OPS}
+
+class OperationRegistry(MutableMapping):
+    # Maps tool_id -> PdfOperation, importing each operation module on first lookup.
+    def __init__(self, descriptors: Iterable[OperationDescriptor]) -> None:
+        self._descriptors: Dict[str, OperationDescriptor] = {d.tool_id: d for d in descriptors}
+        self._loaded: Dict[str, PdfOperation] = {}
+        self._lock = threading.RLock()
+
+    def __getitem__(self, tool_id: str) -> PdfOperation:
+        op = self._loaded.get(tool_id)
+        if op is not None:
+            return op
+        descriptor = self._descriptors[tool_id]
+        with self._lock:
+            op = self._loaded.get(tool_id)
+            if op is None:
+                op = descriptor.load()
+                self._loaded[tool_id] = op
+        return op
+
+    def __setitem__(self, tool_id: str, op: PdfOperation) -> None:
+        cls = type(op)
+        with self._lock:
+            self._descriptors[tool_id] = OperationDescriptor(
+                tool_id, op.display_name, f"{cls.__module__}:{cls.__qualname__}", op.backend
+            )
+            self._loaded[tool_id] = op
+
+    def __delitem__(self, tool_id: str) -> None:
+        with self._lock:
+            del self._descriptors[tool_id]
+            self._loaded.pop(tool_id, None)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._descriptors))
+
+    def __len__(self) -> int:
+        return len(self._descriptors)
+
+    def __contains__(self, tool_id: object) -> bool:
+        return tool_id in self._descriptors
+
+    def descriptor(self, tool_id: str) -> Optional[OperationDescriptor]:
+        return self._descriptors.get(tool_id)
+
+    def descriptors(self) -> List[OperationDescriptor]:
+        return list(self._descriptors.values())
+
+    def is_loaded(self, tool_id: str) -> bool:
+        return tool_id in self._loaded
+
+
+OP_REGISTRY = OperationRegistry(OP_DESCRIPTORS)
 
 
 def get_operation(tool_id: str) -> PdfOperation:
     if tool_id not in OP_REGISTRY:
         raise ValueError(t("err_tool_not_found", tool_id=tool_id))
     return OP_REGISTRY[tool_id]
+
+
+def get_descriptor(tool_id: str) -> OperationDescriptor:
+    descriptor = OP_REGISTRY.descriptor(tool_id)
+    if descriptor is None:
+        raise ValueError(t("err_tool_not_found", tool_id=tool_id))
+    return descriptor
+
+
+def default_backend(spec: JobSpec) -> str:
+    # A pipeline runs where its heaviest stage would; unknown stages are left for validation to report.
+    if spec.tool_id == PIPELINE_TOOL_ID:
+        stages = spec.params.get("stages") or []
+        tool_ids = [s.get("tool_id") for s in stages if isinstance(s, dict)]
+        backends = {OP_REGISTRY.descriptor(tool_id).backend for tool_id in tool_ids if tool_id in OP_REGISTRY}
+        return "process" if "process" in backends else get_descriptor(spec.tool_id).backend
+    return get_descriptor(spec.tool_id).backend
+
+
+def preload_operations(tool_ids: Optional[Iterable[str]] = None) -> None:
+    # Warms the import cache off the UI thread so the first job does not pay for fitz/pikepdf/PIL.
+    for tool_id in list(tool_ids) if tool_ids is not None else list(OP_REGISTRY):
+        try:
+            OP_REGISTRY[tool_id]
+        except Exception:  # noqa: BLE001
+            logger.warning("Preloading %s failed", tool_id, exc_info=True)
@@ -2,7 +2,7 @@
 
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Callable
+from typing import Any, Callable, Dict
 
 from pdf_toolbox.core.cancel import CancellationToken
 from pdf_toolbox.core.models import JobResult, JobSpec
@@ -16,6 +16,11 @@ ProgressCb = Callable[[str, int, int, str], None]
 class PdfOperation(ABC):
     tool_id: str = ""
     display_name: str = ""
+    backend: str = "thread"
+    # Operations that only rearrange an open document implement apply(), so a pipeline can chain them on one
+    # parsed document and save once instead of writing and re-reading a file per stage.
+    in_memory: bool = False
+    output_suffix: str = ""
 
     def validate(self, spec: JobSpec) -> None:
         ensure_inputs(spec.inputs)
@@ -45,6 +50,13 @@ class PdfOperation(ABC):
         if token.is_cancelled():
             raise RuntimeError(t("err_cancelled"))
 
+    def can_apply(self, params: Dict[str, Any]) -> bool:
+        return self.in_memory
+
+    def apply(self, pdf, params: Dict[str, Any], progress_cb: ProgressCb, token: CancellationToken):
+        # Returns the edited pikepdf.Pdf (pdf itself or a new one that copies from it), or None when cancelled.
+        raise NotImplementedError
+
     @abstractmethod
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token: CancellationToken) -> JobResult:
         raise NotImplementedError
@@ -1,24 +1,41 @@
 ﻿from __future__ import annotations
 
+import logging
+
 import fitz
+import pikepdf
 from PIL import Image
 
 from pdf_toolbox.core.models import JobResult, JobSpec
 from pdf_toolbox.i18n import t
 from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.image_recompress import recompress_images
+from pdf_toolbox.services.pdf_ops.page_shards import PageShardExecutor
+from pdf_toolbox.services.pdf_ops.raster import render_budget, render_image_within
+from pdf_toolbox.services.pdf_ops.render_dpi import DpiPolicy, dpi_policy
+
+logger = logging.getLogger(__name__)
+
+# "rasterize" renders every page to one JPEG; "images" re-encodes the embedded images and keeps everything else.
+COMPRESS_IMAGE_MODES = ("rasterize", "images")
 
 
 class CompressImagesOperation(PdfOperation):
     tool_id = "compress_images"
     display_name = "Image Re-encode Compression"
+    backend = "process"
 
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
-        dpi = int(spec.params.get("dpi", 150))
+        if spec.params.get("mode") == "images":
+            return self._recompress(spec, progress_cb, token)
+        policy = dpi_policy(spec.params, 150)
         jpeg_quality = int(spec.params.get("jpeg_quality", 75))
         grayscale = bool(spec.params.get("grayscale", False))
         max_side = int(spec.params.get("max_side", 1600))
         outputs = []
         total_inputs = len(spec.inputs)
+        executor = PageShardExecutor(max_workers=spec.params.get("workers"))
+        budget = render_budget(spec.params, executor.max_workers)
 
         for idx, src in enumerate(spec.inputs, start=1):
             name_index = idx if spec.output_name and total_inputs > 1 else None
@@ -36,36 +53,111 @@ class CompressImagesOperation(PdfOperation):
             total_pages = doc.page_count
             out_doc = fitz.open()
 
-            for i in range(total_pages):
+            def on_progress(done: int, total: int) -> None:
+                # In auto mode each page is reported with its DPI as its result arrives.
+                if not policy.auto:
+                    progress_cb("processing", done, total, t("progress_reencode_page", page=done))
+
+            try:
+                encoded = executor.map_pages(
+                    src,
+                    range(total_pages),
+                    _reencode_page,
+                    (policy, jpeg_quality, grayscale, max_side, budget),
+                    on_progress,
+                    token,
+                    doc=doc,
+                )
+                for done, (page_index, (img_bytes, width, height, page_dpi)) in enumerate(encoded, start=1):
+                    rect = fitz.Rect(0, 0, width, height)
+                    out_page = out_doc.new_page(width=rect.width, height=rect.height)
+                    out_page.insert_image(rect, stream=img_bytes)
+                    if policy.auto:
+                        message = t("progress_reencode_page_dpi", page=page_index + 1, dpi=page_dpi)
+                        progress_cb("processing", done, total_pages, message)
                 if token.is_cancelled():
-                    doc.close()
-                    out_doc.close()
                     return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                page = doc.load_page(i)
-                zoom = dpi / 72.0
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                if max_side > 0:
-                    scale = max(img.width, img.height) / max_side
-                    if scale > 1:
-                        img = img.resize((int(img.width / scale), int(img.height / scale)), Image.LANCZOS)
-                if grayscale:
-                    img = img.convert("L").convert("RGB")
-
-                img_bytes = _image_to_bytes(img, jpeg_quality)
-                rect = fitz.Rect(0, 0, img.width * 72 / dpi, img.height * 72 / dpi)
-                out_page = out_doc.new_page(width=rect.width, height=rect.height)
-                out_page.insert_image(rect, stream=img_bytes)
-                progress_cb("processing", i + 1, total_pages, t("progress_reencode_page", page=i + 1))
-
-            out_doc.save(out_path)
-            out_doc.close()
-            doc.close()
+                out_doc.save(out_path)
+            finally:
+                out_doc.close()
+                doc.close()
             outputs.append(out_path)
 
         return JobResult(success=True, outputs=outputs)
 
+    def _recompress(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
+        # dpi is the target effective resolution here: only images displayed above it are downsampled. In auto mode
+        # images keep their native resolution up to max_dpi.
+        policy = dpi_policy(spec.params, 150)
+        dpi = policy.max_dpi if policy.auto else policy.dpi
+        jpeg_quality = int(spec.params.get("jpeg_quality", 75))
+        grayscale = bool(spec.params.get("grayscale", False))
+        outputs = []
+        total_inputs = len(spec.inputs)
+
+        def on_progress(done: int, total: int) -> None:
+            progress_cb("processing", done, total, t("progress_recompress_image", index=done, total=total))
+
+        for idx, src in enumerate(spec.inputs, start=1):
+            name_index = idx if spec.output_name and total_inputs > 1 else None
+            out_path = self._output_path(
+                src,
+                spec.output_dir,
+                "_imgcompressed",
+                spec.output_name,
+                ext=".pdf",
+                index=name_index,
+                overwrite=spec.overwrite,
+            )
+            with pikepdf.open(src) as pdf:
+                stats = recompress_images(
+                    pdf, dpi, jpeg_quality, grayscale, token, on_progress, workers=spec.params.get("workers")
+                )
+                if stats is None:
+                    return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+                pdf.save(out_path)
+            saved = stats.bytes_before - stats.bytes_after
+            logger.info(
+                "Image recompression of %s: %d of %d images replaced (%d downsampled), %d bytes saved",
+                src.name,
+                stats.replaced,
+                stats.images,
+                stats.downsampled,
+                saved,
+            )
+            message = t("progress_recompress_done", count=stats.replaced, size=f"{saved / 1048576:.1f} MB")
+            progress_cb("writing", 1, 1, message)
+            outputs.append(out_path)
+
+        return JobResult(success=True, outputs=outputs)
+
+
+def _reencode_page(
+    doc: fitz.Document,
+    page_index: int,
+    _page_arg,
+    policy: DpiPolicy,
+    jpeg_quality: int,
+    grayscale: bool,
+    max_side: int,
+    budget: int,
+) -> tuple[bytes, float, float, int]:
+    page = doc.load_page(page_index)
+    # Fold max_side into the zoom so MuPDF rasterizes once at the final size instead of rendering and resampling.
+    zoom = render_zoom(page.rect, policy.page_dpi(page), max_side)
+    img = render_image_within(page, zoom, budget, gray=grayscale)
+
+    img_bytes = _image_to_bytes(img, jpeg_quality)
+    return img_bytes, img.width / zoom, img.height / zoom, round(zoom * 72)
+
+
+def render_zoom(rect: fitz.Rect, dpi: int, max_side: int) -> float:
+    zoom = dpi / 72.0
+    longest = max(rect.width, rect.height) * zoom
+    if max_side > 0 and longest > max_side:
+        zoom *= max_side / longest
+    return zoom
+
 
 def _image_to_bytes(img: Image.Image, quality: int) -> bytes:
     from io import BytesIO
@@ -73,5 +165,3 @@ def _image_to_bytes(img: Image.Image, quality: int) -> bytes:
     buf = BytesIO()
     img.save(buf, format="JPEG", quality=quality, optimize=True)
     return buf.getvalue()
-
-
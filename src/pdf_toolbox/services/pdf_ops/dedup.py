@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Dict, Set, Tuple
+
+import pikepdf
+
+ObjGen = Tuple[int, int]
+
+
+@dataclass
+class DedupStats:
+    objects: int = 0
+    bytes_saved: int = 0
+
+    def add(self, other: "DedupStats") -> None:
+        self.objects += other.objects
+        self.bytes_saved += other.bytes_saved
+
+
+def dedupe_streams(pdf: pikepdf.Pdf) -> DedupStats:
+    # Streams with identical raw bytes and dictionaries are folded into one canonical copy, together with the
+    # non-stream objects reachable from page resources (colour spaces, fonts, ExtGStates) that make otherwise equal
+    # streams look different. Keys are built with references already folded, so each pass can fold the next layer.
+    stats = DedupStats()
+    resources = _resource_objects(pdf)
+    digests: Dict[ObjGen, str] = {}
+    duplicates: Dict[ObjGen, pikepdf.Object] = {}
+    while True:
+        seen: Dict[Tuple[str, str], pikepdf.Object] = {}
+        folded = 0
+        for obj in pdf.objects:
+            is_stream = isinstance(obj, pikepdf.Stream)
+            if obj.objgen in duplicates or not (is_stream or obj.objgen in resources):
+                continue
+            digest = digests.get(obj.objgen)
+            if digest is None:
+                raw = obj.read_raw_bytes() if is_stream else b""
+                digest = f"{len(raw)}:{hashlib.sha256(raw).hexdigest()}" if is_stream else "0:"
+                digests[obj.objgen] = digest
+            key = (digest, _object_key(obj, duplicates))
+            canonical = seen.setdefault(key, obj)
+            if canonical is not obj:
+                duplicates[obj.objgen] = canonical
+                stats.objects += 1
+                stats.bytes_saved += int(digest.split(":", 1)[0])
+                folded += 1
+        if not folded:
+            break
+    if duplicates:
+        targets = {objgen: _resolve(objgen, duplicates) for objgen in duplicates}
+        for obj in pdf.objects:
+            if isinstance(obj, (pikepdf.Dictionary, pikepdf.Array, pikepdf.Stream)):
+                _rewrite(obj, targets)
+        _rewrite(pdf.trailer, targets)
+    return stats
+
+
+def _resolve(objgen: ObjGen, duplicates: Dict[ObjGen, pikepdf.Object]) -> pikepdf.Object:
+    target = duplicates[objgen]
+    while target.objgen in duplicates:
+        target = duplicates[target.objgen]
+    return target
+
+
+def _resource_objects(pdf: pikepdf.Pdf) -> Set[ObjGen]:
+    found: Set[ObjGen] = set()
+    stack = [page.obj.get("/Resources") for page in pdf.pages]
+    while stack:
+        value = stack.pop()
+        if not isinstance(value, pikepdf.Object):
+            continue
+        if value.is_indirect:
+            if value.objgen in found:
+                continue
+            found.add(value.objgen)
+        if isinstance(value, pikepdf.Array):
+            stack.extend(value)
+        elif isinstance(value, (pikepdf.Dictionary, pikepdf.Stream)):
+            stack.extend(value.get(key) for key in value.keys() if key not in ("/Parent", "/P"))
+    return found
+
+
+def _object_key(obj: pikepdf.Object, duplicates: Dict[ObjGen, pikepdf.Object]) -> str:
+    if isinstance(obj, pikepdf.Array):
+        return "[" + ",".join(_value_key(v, duplicates) for v in obj) + "]"
+    if not isinstance(obj, (pikepdf.Dictionary, pikepdf.Stream)):
+        return repr(obj)
+    parts = []
+    for key in sorted(obj.keys()):
+        if key != "/Length":
+            parts.append(f"{key}={_value_key(obj.get(key), duplicates)}")
+    return "<<" + ";".join(parts) + ">>"
+
+
+def _value_key(value, duplicates: Dict[ObjGen, pikepdf.Object]) -> str:
+    if isinstance(value, pikepdf.Object) and value.is_indirect:
+        objgen = value.objgen
+        if objgen in duplicates:
+            objgen = _resolve(objgen, duplicates).objgen
+        return f"R{objgen[0]}.{objgen[1]}"
+    if isinstance(value, pikepdf.Dictionary):
+        return "<<" + ";".join(f"{k}={_value_key(value.get(k), duplicates)}" for k in sorted(value.keys())) + ">>"
+    if isinstance(value, pikepdf.Array):
+        return "[" + ",".join(_value_key(v, duplicates) for v in value) + "]"
+    return repr(value)
+
+
+def _rewrite(container, targets: Dict[ObjGen, pikepdf.Object]) -> None:
+    if isinstance(container, pikepdf.Array):
+        for i, value in enumerate(container):
+            replacement = _replacement(value, targets)
+            if replacement is not None:
+                container[i] = replacement
+            elif _is_direct_container(value):
+                _rewrite(value, targets)
+        return
+    for key in list(container.keys()):
+        value = container.get(key)
+        replacement = _replacement(value, targets)
+        if replacement is not None:
+            container[key] = replacement
+        elif _is_direct_container(value):
+            _rewrite(value, targets)
+
+
+def _replacement(value, targets: Dict[ObjGen, pikepdf.Object]):
+    if isinstance(value, pikepdf.Object) and value.is_indirect:
+        return targets.get(value.objgen)
+    return None
+
+
+def _is_direct_container(value) -> bool:
+    return isinstance(value, (pikepdf.Dictionary, pikepdf.Array)) and not value.is_indirect
@@ -1,48 +1,75 @@
 ﻿from __future__ import annotations
 
+from typing import Any, Dict
+
 import pikepdf
 
 from pdf_toolbox.core.models import JobResult, JobSpec
 from pdf_toolbox.i18n import t
 from pdf_toolbox.core.range_parser import parse_page_range
 from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.incremental import remove_pages, save_incremental
+from pdf_toolbox.services.pdf_ops.page_list import append_pages
 
 
 class DeletePagesOperation(PdfOperation):
     tool_id = "delete_pages"
     display_name = "Delete Pages"
+    in_memory = True
+    output_suffix = "_deleted"
+
+    def can_apply(self, params: Dict[str, Any]) -> bool:
+        return not params.get("incremental", False)
+
+    def apply(self, pdf, params: Dict[str, Any], progress_cb: ProgressCb, token):
+        pages = list(pdf.pages)
+        total_pages = len(pages)
+        delete_indices = set(parse_page_range(params.get("ranges", ""), total_pages))
+
+        out_pdf = pikepdf.Pdf.new()
+        for i, page in enumerate(pages):
+            if token.is_cancelled():
+                out_pdf.close()
+                return None
+            if i not in delete_indices:
+                append_pages(out_pdf, [page])
+            progress_cb("processing", i + 1, total_pages, t("progress_process_page", page=i + 1))
+        return out_pdf
 
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
         ranges = spec.params.get("ranges", "")
+        incremental = bool(spec.params.get("incremental", False))
         outputs = []
+        warnings = []
         total_inputs = len(spec.inputs)
 
         for idx, src in enumerate(spec.inputs, start=1):
             with pikepdf.open(src) as pdf:
-                total_pages = len(pdf.pages)
-                delete_indices = set(parse_page_range(ranges, total_pages))
-
-                out_pdf = pikepdf.Pdf.new()
-                for i, page in enumerate(pdf.pages):
-                    if token.is_cancelled():
+                if incremental:
+                    # The pages are unlinked in place; only the touched page tree nodes are appended to a copy.
+                    total_pages = len(pdf.pages)
+                    changed = remove_pages(pdf, parse_page_range(ranges, total_pages))
+                    progress_cb("processing", total_pages, total_pages, t("progress_write_complete"))
+                else:
+                    out_pdf = self.apply(pdf, spec.params, progress_cb, token)
+                    if out_pdf is None:
                         return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                    if i not in delete_indices:
-                        out_pdf.pages.append(page)
-                    progress_cb("processing", i + 1, total_pages, t("progress_process_page", page=i + 1))
 
                 name_index = idx if spec.output_name and total_inputs > 1 else None
                 out_path = self._output_path(
                     src,
                     spec.output_dir,
-                    "_deleted",
+                    self.output_suffix,
                     spec.output_name,
                     ext=".pdf",
                     index=name_index,
                     overwrite=spec.overwrite,
                 )
-                out_pdf.save(out_path)
+                if not incremental:
+                    with out_pdf:
+                        out_pdf.save(out_path)
+                elif not save_incremental(pdf, src, out_path, changed):
+                    warnings.append(t("warn_incremental_fallback", name=src.name))
                 outputs.append(out_path)
 
-        return JobResult(success=True, outputs=outputs)
-
-
+        return JobResult(success=True, outputs=outputs, warning="; ".join(warnings) or None)
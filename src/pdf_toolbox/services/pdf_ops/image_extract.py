@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import struct
+from typing import Optional, Tuple
+
+import fitz
+
+# The embedded image of a single-image page is written as is when it covers at least this share of the page and
+# at least this share of it lies on the page.
+FULL_PAGE_COVERAGE = 0.98
+
+# Page content that does not show up in a render; OCR text layers are drawn invisibly.
+_INVISIBLE = {"ignore-text"}
+
+_JP2_SIGNATURE = b"\x00\x00\x00\x0cjP  \r\n\x87\n"
+_JBIG2_SIGNATURE = b"\x97JB2\r\n\x1a\n"
+
+_TIFF_SHORT, _TIFF_LONG = 3, 4
+_TIFF_TAG_TYPES = {
+    256: _TIFF_LONG,
+    257: _TIFF_LONG,
+    258: _TIFF_SHORT,
+    259: _TIFF_SHORT,
+    262: _TIFF_SHORT,
+    273: _TIFF_LONG,
+    278: _TIFF_LONG,
+    279: _TIFF_LONG,
+    292: _TIFF_LONG,
+}
+
+
+def extract_page_image(page: fitz.Page) -> Optional[Tuple[str, bytes]]:
+    # Returns (extension, file bytes) when the page shows exactly one embedded image, upright and filling the page,
+    # in a format that can be written out without decoding. Anything else has to be rendered.
+    if page.rotation or page.first_annot is not None or page.first_widget is not None:
+        return None
+    drawn = [kind for kind, _ in page.get_bboxlog() if kind not in _INVISIBLE]
+    if drawn != ["fill-image"]:
+        return None
+    infos = page.get_image_info(xrefs=True)
+    if len(infos) != 1 or infos[0]["xref"] <= 0:
+        return None
+    info = infos[0]
+    a, b, c, d, _, _ = info["transform"]
+    if b or c or a <= 0 or d <= 0:
+        # Rotated or mirrored placement: the stored pixels are not what the page shows.
+        return None
+    rect, bbox = page.rect, fitz.Rect(info["bbox"])
+    # The image must fill the page and not reach past it: a CropBox hiding part of a scan would otherwise be undone.
+    if abs(bbox & rect) < FULL_PAGE_COVERAGE * abs(rect) or abs(bbox) * FULL_PAGE_COVERAGE > abs(rect):
+        return None
+    return _image_file(page.parent, info["xref"])
+
+
+def _image_file(doc: fitz.Document, xref: int) -> Optional[Tuple[str, bytes]]:
+    keys = {key: doc.xref_get_key(xref, key) for key in ("Filter", "SMask", "Mask", "Decode", "ImageMask")}
+    if any(keys[key][0] != "null" for key in ("SMask", "Mask", "Decode")) or keys["ImageMask"][1] == "true":
+        # Transparency and decode arrays change what the stored pixels look like on the page.
+        return None
+    kind, value = keys["Filter"]
+    if kind != "name":
+        return None
+    raw = doc.xref_stream_raw(xref)
+    if value == "/DCTDecode":
+        return ".jpg", raw
+    if value == "/JPXDecode":
+        return (".jp2" if raw.startswith(_JP2_SIGNATURE) else ".j2k"), raw
+    if value == "/JBIG2Decode":
+        return ".jb2", _jbig2_file(doc, xref, raw)
+    if value == "/CCITTFaxDecode":
+        header = _ccitt_tiff_header(doc, xref, len(raw))
+        return (".tif", header + raw) if header is not None else None
+    return None
+
+
+def _parm(doc: fitz.Document, xref: int, name: str, default: str) -> str:
+    kind, value = doc.xref_get_key(xref, f"DecodeParms/{name}")
+    return default if kind == "null" else value
+
+
+def _jbig2_file(doc: fitz.Document, xref: int, raw: bytes) -> bytes:
+    # An embedded JBIG2 stream is a run of page segments without the file header; the shared symbol dictionaries
+    # live in a separate /JBIG2Globals stream. Sequential organization, page count unknown.
+    kind, value = doc.xref_get_key(xref, "DecodeParms/JBIG2Globals")
+    globals_data = doc.xref_stream(int(value.split()[0])) if kind == "xref" else b""
+    return _JBIG2_SIGNATURE + b"\x03" + globals_data + raw
+
+
+def _ccitt_tiff_header(doc: fitz.Document, xref: int, length: int) -> Optional[bytes]:
+    # A single-strip TIFF around the untouched CCITT data.
+    if _parm(doc, xref, "EncodedByteAlign", "false") != "false":
+        return None
+    k = int(_parm(doc, xref, "K", "0"))
+    width = int(_parm(doc, xref, "Columns", "1728"))
+    height = int(doc.xref_get_key(xref, "Height")[1])
+    black_is_1 = _parm(doc, xref, "BlackIs1", "false") == "true"
+    tags = {
+        256: width,
+        257: height,
+        258: 1,
+        # Compression 4 is Group 4, 3 is Group 3; T4Options bit 0 marks 2-D Group 3 coding.
+        259: 4 if k < 0 else 3,
+        262: 1 if black_is_1 else 0,
+        273: 0,
+        278: height,
+        279: length,
+    }
+    if k > 0:
+        tags[292] = 1
+    # The strip starts right after the header and the single IFD.
+    tags[273] = 8 + 2 + 12 * len(tags) + 4
+    entries = b"".join(_tiff_entry(tag, value) for tag, value in sorted(tags.items()))
+    return b"II*\x00" + struct.pack("<IH", 8, len(tags)) + entries + struct.pack("<I", 0)
+
+
+def _tiff_entry(tag: int, value: int) -> bytes:
+    kind = _TIFF_TAG_TYPES[tag]
+    field = struct.pack("<HH", value, 0) if kind == _TIFF_SHORT else struct.pack("<I", value)
+    return struct.pack("<HHI", tag, kind, 1) + field
@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import io
+import math
+import os
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple
+
+import pikepdf
+from PIL import Image
+
+ObjGen = Tuple[int, int]
+ImageProgressCb = Callable[[int, int], None]
+
+# Images are only downsampled when they exceed the target by more than this factor, so near-target images are
+# not resampled for a negligible gain.
+DOWNSAMPLE_TOLERANCE = 1.1
+MAX_FORM_DEPTH = 12
+
+
+@dataclass
+class RecompressStats:
+    images: int = 0
+    replaced: int = 0
+    downsampled: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+@dataclass
+class _Job:
+    obj: pikepdf.Stream
+    raw: bytes
+    jpeg_source: bool
+    image: Optional[Image.Image]
+    size: Tuple[int, int]
+    keep_icc: bool
+
+
+def recompress_images(
+    pdf: pikepdf.Pdf,
+    target_dpi: float,
+    jpeg_quality: int,
+    grayscale: bool,
+    token,
+    progress_cb: ImageProgressCb,
+    workers: Optional[int] = None,
+) -> Optional[RecompressStats]:
+    # Replaces image XObject streams in place; page content, text and vector graphics are not touched.
+    # Returns None when cancelled.
+    extents = image_extents(pdf)
+    stats = RecompressStats()
+    total = len(extents)
+    workers = max(1, int(workers or os.cpu_count() or 1))
+    pending: Deque[Tuple[_Job, Future]] = deque()
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for done, (objgen, extent) in enumerate(extents.items(), start=1):
+            if token.is_cancelled():
+                return None
+            # pikepdf objects are only touched on this thread; the workers decode, resample and encode.
+            job = _prepare(pdf.get_object(objgen), extent, target_dpi, grayscale)
+            if job is not None:
+                stats.images += 1
+                pending.append((job, pool.submit(_encode, job, jpeg_quality, grayscale)))
+            while pending and (len(pending) > 2 * workers or pending[0][1].done()):
+                _store(*pending.popleft(), stats)
+            progress_cb(done, total)
+        while pending:
+            if token.is_cancelled():
+                return None
+            _store(*pending.popleft(), stats)
+    return stats
+
+
+def image_extents(pdf: pikepdf.Pdf) -> Dict[ObjGen, Tuple[float, float]]:
+    # Largest displayed width and height in points of every image XObject drawn by a page or one of its forms.
+    extents: Dict[ObjGen, Tuple[float, float]] = {}
+    for page in pdf.pages:
+        _walk(page, page.obj.get("/Resources"), pikepdf.Matrix(), extents, set(), 0)
+    return extents
+
+
+def _walk(content, resources, ctm: pikepdf.Matrix, extents, forms: Set[ObjGen], depth: int) -> None:
+    if depth > MAX_FORM_DEPTH or not isinstance(resources, pikepdf.Dictionary):
+        return
+    xobjects = resources.get("/XObject")
+    if not isinstance(xobjects, pikepdf.Dictionary):
+        return
+    try:
+        instructions = pikepdf.parse_content_stream(content, "q Q cm Do")
+    except pikepdf.PdfError:
+        return
+    stack: List[pikepdf.Matrix] = []
+    for operands, operator in instructions:
+        op = str(operator)
+        if op == "q":
+            stack.append(ctm)
+        elif op == "Q":
+            ctm = stack.pop() if stack else ctm
+        elif op == "cm" and len(operands) == 6:
+            ctm = pikepdf.Matrix(*[float(v) for v in operands]) @ ctm
+        elif op == "Do" and operands:
+            xobject = xobjects.get(operands[0])
+            if not isinstance(xobject, pikepdf.Stream) or not xobject.is_indirect:
+                continue
+            subtype = xobject.get("/Subtype")
+            if subtype == pikepdf.Name.Image:
+                # The image fills the unit square, so the CTM's column lengths are its displayed size.
+                width, height = math.hypot(ctm.a, ctm.b), math.hypot(ctm.c, ctm.d)
+                seen = extents.get(xobject.objgen, (0.0, 0.0))
+                extents[xobject.objgen] = (max(seen[0], width), max(seen[1], height))
+            elif subtype == pikepdf.Name.Form and xobject.objgen not in forms:
+                matrix = xobject.get("/Matrix")
+                form_ctm = pikepdf.Matrix(*[float(v) for v in matrix]) @ ctm if matrix is not None else ctm
+                form_resources = xobject.get("/Resources", resources)
+                _walk(xobject, form_resources, form_ctm, extents, forms | {xobject.objgen}, depth + 1)
+
+
+def _prepare(obj: pikepdf.Stream, extent: Tuple[float, float], target_dpi: float, grayscale: bool) -> Optional[_Job]:
+    if obj.get("/ImageMask", False) or int(obj.get("/BitsPerComponent", 8)) != 8:
+        return None
+    if isinstance(obj.get("/Mask"), pikepdf.Array) or "/Decode" in obj:
+        # Colour-key masks and decode arrays do not survive lossy re-encoding.
+        return None
+    color_space = obj.get("/ColorSpace")
+    if not _supported_color_space(color_space):
+        return None
+    filters = obj.get("/Filter")
+    filters = list(filters) if isinstance(filters, pikepdf.Array) else [filters] if filters is not None else []
+    if any(f in (pikepdf.Name.JBIG2Decode, pikepdf.Name.CCITTFaxDecode, pikepdf.Name.JPXDecode) for f in filters):
+        return None
+
+    width, height = int(obj.Width), int(obj.Height)
+    needed_w = math.ceil(extent[0] / 72 * target_dpi)
+    needed_h = math.ceil(extent[1] / 72 * target_dpi)
+    scale = max(needed_w / width, needed_h / height) if width and height else 1.0
+    jpeg_source = filters == [pikepdf.Name.DCTDecode]
+    if scale * DOWNSAMPLE_TOLERANCE >= 1:
+        if jpeg_source and not grayscale:
+            # Already a JPEG at or below the target resolution: re-encoding would only add generation loss.
+            return None
+        size = (width, height)
+    else:
+        size = (max(1, round(width * scale)), max(1, round(height * scale)))
+
+    raw = obj.read_raw_bytes()
+    image = None
+    if not jpeg_source:
+        try:
+            image = pikepdf.PdfImage(obj).as_pil_image()
+        except (pikepdf.PdfError, NotImplementedError, ValueError, OSError):
+            return None
+        if image.mode in ("RGBA", "LA") and "/SMask" in obj:
+            # The /SMask comes back as an alpha band, but it is a stream of its own and stays as it is.
+            image = image.convert(image.mode[:-1])
+        if image.mode not in ("RGB", "L", "P"):
+            return None
+    keep_icc = isinstance(color_space, pikepdf.Array) and color_space[0] == pikepdf.Name.ICCBased
+    return _Job(obj=obj, raw=raw, jpeg_source=jpeg_source, image=image, size=size, keep_icc=keep_icc)
+
+
+def _supported_color_space(color_space) -> bool:
+    # Only colour spaces that map onto a plain RGB or grayscale JPEG; CMYK, Lab and separations are left alone.
+    if color_space in (pikepdf.Name.DeviceRGB, pikepdf.Name.DeviceGray):
+        return True
+    if not isinstance(color_space, pikepdf.Array) or len(color_space) < 2:
+        return False
+    if color_space[0] == pikepdf.Name.ICCBased:
+        return int(color_space[1].get("/N", 0)) in (1, 3)
+    if color_space[0] == pikepdf.Name.Indexed:
+        return _supported_color_space(color_space[1])
+    return False
+
+
+def _encode(job: _Job, jpeg_quality: int, grayscale: bool) -> Optional[Tuple[bytes, str, Tuple[int, int]]]:
+    image = job.image
+    if image is None:
+        image = Image.open(io.BytesIO(job.raw))
+        if image.mode not in ("RGB", "L"):
+            return None
+        if job.size != image.size:
+            # Let the JPEG decoder skip DCT coefficients when shrinking by 2x or more.
+            image.draft(image.mode, job.size)
+    if image.mode == "P":
+        image = image.convert("RGB")
+    if grayscale and image.mode != "L":
+        image = image.convert("L")
+    if image.size != job.size:
+        image = image.resize(job.size, Image.LANCZOS)
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=jpeg_quality, optimize=True)
+    return buf.getvalue(), image.mode, image.size
+
+
+def _store(job: _Job, future: Future, stats: RecompressStats) -> None:
+    encoded = future.result()
+    stats.bytes_before += len(job.raw)
+    if encoded is None or len(encoded[0]) >= len(job.raw):
+        # Not supported, or the original stream is already smaller.
+        stats.bytes_after += len(job.raw)
+        return
+    data, mode, (width, height) = encoded
+    obj = job.obj
+    channels = 1 if mode == "L" else 3
+    keep_icc = job.keep_icc and int(obj.ColorSpace[1].get("/N", 0)) == channels
+    obj.write(data, filter=pikepdf.Name.DCTDecode)
+    for key in ("/DecodeParms", "/Decode"):
+        if key in obj:
+            del obj[key]
+    if (width, height) != (int(obj.Width), int(obj.Height)):
+        stats.downsampled += 1
+    obj.Width, obj.Height = width, height
+    obj.BitsPerComponent = 8
+    if not keep_icc:
+        obj.ColorSpace = pikepdf.Name.DeviceGray if channels == 1 else pikepdf.Name.DeviceRGB
+    stats.replaced += 1
+    stats.bytes_after += len(data)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import logging
+import os
+import re
+import shutil
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pikepdf
+
+logger = logging.getLogger(__name__)
+
+ObjGen = Tuple[int, int]
+
+_STARTXREF_RE = re.compile(rb"startxref\s+(\d+)")
+_TAIL_BYTES = 4096
+
+
+class IncrementalUpdateError(RuntimeError):
+    pass
+
+
+def save_incremental(pdf: pikepdf.Pdf, src: Path, out_path: Path, changed: Iterable[pikepdf.Object]) -> bool:
+    # Returns False when the file had to be rewritten in full instead.
+    try:
+        write_incremental(pdf, src, out_path, changed)
+        return True
+    except IncrementalUpdateError as exc:
+        logger.info("Incremental update of %s not possible (%s); saving in full", src, exc)
+        pdf.save(out_path)
+        return False
+
+
+def write_incremental(pdf: pikepdf.Pdf, src: Path, out_path: Path, changed: Iterable[pikepdf.Object]) -> None:
+    # Copies src byte for byte and appends only the changed objects plus a new cross-reference section that chains
+    # to the original one through /Prev, so the cost depends on the edit rather than on the size of the file.
+    if pdf.is_encrypted:
+        raise IncrementalUpdateError("encrypted files cannot be updated incrementally")
+    if pdf.get_warnings():
+        # qpdf warns when it had to repair the file; the original offsets can then not be trusted.
+        raise IncrementalUpdateError("the source file needed repairs")
+    prev, xref_stream = _last_xref(src)
+    objects: Dict[ObjGen, pikepdf.Object] = {}
+    for obj in changed:
+        if not obj.is_indirect or isinstance(obj, pikepdf.Stream):
+            raise IncrementalUpdateError("only indirect non-stream objects can be appended")
+        objects[obj.objgen] = obj
+
+    if Path(out_path).resolve() != Path(src).resolve():
+        _clone_file(src, out_path)
+    with open(out_path, "r+b") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() > 0:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) not in (b"\n", b"\r"):
+                f.write(b"\n")
+        offsets: Dict[ObjGen, int] = {}
+        for objgen in sorted(objects):
+            offsets[objgen] = f.tell()
+            f.write(b"%d %d obj\n" % objgen + objects[objgen].unparse(resolved=True) + b"\nendobj\n")
+        size = max([int(pdf.trailer.get("/Size", 0))] + [num + 1 for num, _ in objects])
+        if xref_stream:
+            _write_xref_stream(f, pdf, offsets, size, prev)
+        else:
+            _write_xref_table(f, pdf, offsets, size, prev)
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def _clone_file(src: Path, dst: Path) -> None:
+    # copy_file_range lets copy-on-write filesystems (btrfs, XFS) and NFS 4.2 servers share extents instead of
+    # copying them; shutil.copyfile on Python < 3.14 always copies the bytes.
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None:
+        try:
+            with open(src, "rb") as fin, open(dst, "wb") as fout:
+                remaining = os.fstat(fin.fileno()).st_size
+                while remaining > 0:
+                    copied = copy_range(fin.fileno(), fout.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass
+    shutil.copyfile(src, dst)
+
+
+def _last_xref(src: Path) -> Tuple[int, bool]:
+    with open(src, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        length = f.tell()
+        f.seek(max(0, length - _TAIL_BYTES))
+        tail = f.read()
+        matches = list(_STARTXREF_RE.finditer(tail))
+        if not matches:
+            raise IncrementalUpdateError("startxref not found")
+        prev = int(matches[-1].group(1))
+        if prev >= length:
+            raise IncrementalUpdateError("startxref points past the end of the file")
+        f.seek(prev)
+        head = f.read(32).lstrip()
+    if head.startswith(b"xref"):
+        return prev, False
+    if re.match(rb"\d+\s+\d+\s+obj", head):
+        return prev, True
+    raise IncrementalUpdateError("startxref does not point at a cross-reference section")
+
+
+def _trailer_entries(pdf: pikepdf.Pdf, size: int, prev: int) -> List[bytes]:
+    trailer = pdf.trailer
+    entries = [b"/Size %d" % size, b"/Prev %d" % prev, b"/Root %d %d R" % pdf.Root.objgen]
+    info = trailer.get("/Info")
+    if info is not None and info.is_indirect:
+        entries.append(b"/Info %d %d R" % info.objgen)
+    ids = trailer.get("/ID")
+    # The first identifier names the document and stays; the second changes with every revision.
+    first = bytes(ids[0]) if ids is not None and len(ids) > 0 else os.urandom(16)
+    entries.append(b"/ID [ <%s> <%s> ]" % (first.hex().encode(), os.urandom(16).hex().encode()))
+    return entries
+
+
+def _subsections(numbers: List[int]) -> List[Tuple[int, int]]:
+    runs: List[Tuple[int, int]] = []
+    for num in numbers:
+        if runs and runs[-1][0] + runs[-1][1] == num:
+            runs[-1] = (runs[-1][0], runs[-1][1] + 1)
+        else:
+            runs.append((num, 1))
+    return runs
+
+
+def _write_xref_table(f, pdf: pikepdf.Pdf, offsets: Dict[ObjGen, int], size: int, prev: int) -> None:
+    xref_offset = f.tell()
+    gens = {num: gen for num, gen in offsets}
+    by_num = {num: offsets[(num, gen)] for num, gen in offsets}
+    lines = [b"xref\n"]
+    for start, count in _subsections(sorted(by_num)):
+        lines.append(b"%d %d\n" % (start, count))
+        for num in range(start, start + count):
+            lines.append(b"%010d %05d n\r\n" % (by_num[num], gens[num]))
+    trailer = b" ".join(_trailer_entries(pdf, size, prev))
+    lines.append(b"trailer\n<< " + trailer + b" >>\nstartxref\n%d\n%%%%EOF\n" % xref_offset)
+    f.write(b"".join(lines))
+
+
+def _write_xref_stream(f, pdf: pikepdf.Pdf, offsets: Dict[ObjGen, int], size: int, prev: int) -> None:
+    # Files whose last section is an xref stream get one as well; readers need not accept a table chained to it.
+    xref_num = size
+    xref_offset = f.tell()
+    entries = {num: (offsets[(num, gen)], gen) for num, gen in offsets}
+    entries[xref_num] = (xref_offset, 0)
+    width = 4 if xref_offset < 2**32 else 8
+    rows = b"".join(
+        b"\x01" + offset.to_bytes(width, "big") + gen.to_bytes(2, "big")
+        for _, (offset, gen) in sorted(entries.items())
+    )
+    data = zlib.compress(rows)
+    index = b" ".join(b"%d %d" % run for run in _subsections(sorted(entries)))
+    entries_dict = _trailer_entries(pdf, xref_num + 1, prev) + [
+        b"/Type /XRef",
+        b"/W [ 1 %d 2 ]" % width,
+        b"/Index [ " + index + b" ]",
+        b"/Filter /FlateDecode",
+        b"/Length %d" % len(data),
+    ]
+    f.write(b"%d 0 obj\n<< " % xref_num + b" ".join(entries_dict) + b" >>\nstream\n")
+    f.write(data)
+    f.write(b"\nendstream\nendobj\nstartxref\n%d\n%%%%EOF\n" % xref_offset)
+
+
+def remove_pages(pdf: pikepdf.Pdf, indices: Iterable[int]) -> List[pikepdf.Object]:
+    # Unlinks pages from their parents in place and returns the page tree objects that changed. Unlike
+    # pdf.pages removal this keeps the tree shape, so the other pages' /Parent entries stay untouched.
+    pages = list(pdf.pages)
+    changed: Dict[ObjGen, pikepdf.Object] = {}
+    for index in sorted(set(indices), reverse=True):
+        page = pages[index].obj
+        parent = page.get("/Parent")
+        kids = parent.Kids
+        position = next(i for i, kid in enumerate(kids) if kid.objgen == page.objgen)
+        del kids[position]
+        holder = kids if kids.is_indirect else parent
+        changed[holder.objgen] = holder
+        node: Optional[pikepdf.Object] = parent
+        while node is not None:
+            node.Count = int(node.Count) - 1
+            changed[node.objgen] = node
+            node = node.get("/Parent")
+    return list(changed.values())
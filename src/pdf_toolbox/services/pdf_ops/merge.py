@@ -1,10 +1,28 @@
 ﻿from __future__ import annotations
 
+import logging
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
 import pikepdf
 
 from pdf_toolbox.core.models import JobResult, JobSpec
+from pdf_toolbox.core.process_pool import ProcessCancellationToken, cpu_share
 from pdf_toolbox.i18n import t
+from pdf_toolbox.services.io.temp_files import temp_dir
 from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.dedup import DedupStats, dedupe_streams
+from pdf_toolbox.services.pdf_ops.outline import explicit_destination, item_target
+from pdf_toolbox.services.pdf_ops.page_list import append_pages
+
+logger = logging.getLogger(__name__)
+
+MAX_OPEN_FILES = 256
+DEFAULT_FAN_IN = 64
+TREE_AUTO_INPUTS = 1000
 
 
 class MergeOperation(PdfOperation):
@@ -12,26 +30,227 @@ class MergeOperation(PdfOperation):
     display_name = "Merge PDF"
 
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
-        total_pages = 0
-        for path in spec.inputs:
-            with pikepdf.open(path) as pdf:
-                total_pages += len(pdf.pages)
-
+        max_open = max(2, int(spec.params.get("max_open_files") or default_max_open_files()))
+        keep_bookmarks = bool(spec.params.get("keep_bookmarks", False))
+        dedup = DedupStats() if spec.params.get("dedup") else None
+        tree = spec.params.get("tree", "auto")
+        if tree == "auto":
+            tree = len(spec.inputs) >= TREE_AUTO_INPUTS and cpu_share() > 1
+        workers = int(spec.params.get("merge_workers") or cpu_share()) if tree else 1
+        # Each chunk is one merge_files() call, so the fan-in is also capped by the open-file budget.
+        fan_in = min(max_open, max(2, int(spec.params.get("fan_in") or DEFAULT_FAN_IN))) if tree else max_open
         out_path = self._output_path(
             spec.inputs[0], spec.output_dir, "_merged", spec.output_name, ext=".pdf", overwrite=spec.overwrite
         )
 
-        out_pdf = pikepdf.Pdf.new()
-        current = 0
-        for path in spec.inputs:
-            with pikepdf.open(path) as pdf:
-                for page in pdf.pages:
-                    if token.is_cancelled():
+        # Progress is weighted by file size, so inputs are opened once instead of once to count and once to copy.
+        sizes = {path: _file_size(path) for path in spec.inputs}
+        total = sum(sizes.values())
+        done = 0
+
+        def on_input(path: Path) -> None:
+            nonlocal done
+            done += sizes.get(path, 0)
+            progress_cb("processing", done, total, t("progress_merge_file", name=path.name))
+
+        with temp_dir(prefix="pdf_toolbox_merge_") as tmp:
+            sources: List[Path] = list(spec.inputs)
+            level = 0
+            with _ChunkRunner(workers, keep_bookmarks, dedup) as runner:
+                while len(sources) > fan_in:
+                    chunks = [sources[i : i + fan_in] for i in range(0, len(sources), fan_in)]
+                    parts = [tmp / f"part_{level}_{n:05d}.pdf" for n in range(len(chunks))]
+                    if not runner.run(chunks, parts, token, on_input if level == 0 else _ignore):
                         return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                    out_pdf.pages.append(page)
-                    current += 1
-                    progress_cb("processing", current, total_pages, t("progress_merge_file", name=path.name))
+                    sources = parts
+                    level += 1
+            final_input_cb = on_input if level == 0 else _ignore
+            if not merge_files(sources, out_path, token, final_input_cb, keep_bookmarks=keep_bookmarks, dedup=dedup):
+                return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
 
-        out_pdf.save(out_path)
-        progress_cb("writing", total_pages, total_pages, t("progress_write_complete"))
+        if dedup is not None:
+            logger.info("Merge dedup: %d duplicate objects, %d bytes saved", dedup.objects, dedup.bytes_saved)
+            message = t("progress_merge_dedup", count=dedup.objects, size=f"{dedup.bytes_saved / 1048576:.1f} MB")
+            progress_cb("writing", total, total, message)
+        else:
+            progress_cb("writing", total, total, t("progress_write_complete"))
         return JobResult(success=True, outputs=[out_path])
+
+
+class _ChunkRunner:
+    # Merges one level of chunks into part files, in worker processes when workers > 1.
+    def __init__(self, workers: int, keep_bookmarks: bool = False, dedup: Optional[DedupStats] = None) -> None:
+        self.workers = max(1, workers)
+        self.keep_bookmarks = keep_bookmarks
+        self.dedup = dedup
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cancel = None
+
+    def __enter__(self) -> "_ChunkRunner":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def run(
+        self,
+        chunks: Sequence[Sequence[Path]],
+        parts: Sequence[Path],
+        token,
+        on_input: Callable[[Path], None],
+    ) -> bool:
+        if self.workers == 1 or len(chunks) == 1:
+            return all(
+                merge_files(
+                    chunk, part, token, on_input, spill=True, keep_bookmarks=self.keep_bookmarks, dedup=self.dedup
+                )
+                for chunk, part in zip(chunks, parts)
+            )
+        if self._executor is None:
+            ctx = multiprocessing.get_context("spawn")
+            # Handed to each worker at start-up so a chunk that is already merging stops between its inputs.
+            self._cancel = ctx.Event()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers, mp_context=ctx, initializer=_init_chunk_worker, initargs=(self._cancel,)
+            )
+        pending: Dict[Future, Sequence[Path]] = {
+            self._executor.submit(
+                _merge_chunk, [str(p) for p in chunk], str(part), self.keep_bookmarks, self.dedup is not None
+            ): chunk
+            for chunk, part in zip(chunks, parts)
+        }
+        try:
+            while pending:
+                if token.is_cancelled():
+                    self._cancel.set()
+                    return False
+                finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    chunk = pending.pop(future)
+                    chunk_dedup = future.result()
+                    if self.dedup is not None and chunk_dedup is not None:
+                        self.dedup.add(chunk_dedup)
+                    for path in chunk:
+                        on_input(path)
+            return True
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+_chunk_cancel = None
+
+
+def _init_chunk_worker(cancel_event) -> None:
+    global _chunk_cancel
+    _chunk_cancel = cancel_event
+
+
+def _merge_chunk(paths: List[str], out_path: str, keep_bookmarks: bool, dedup: bool) -> Optional[DedupStats]:
+    stats = DedupStats() if dedup else None
+    merge_files(
+        [Path(p) for p in paths],
+        Path(out_path),
+        ProcessCancellationToken(_chunk_cancel),
+        _ignore,
+        spill=True,
+        keep_bookmarks=keep_bookmarks,
+        dedup=stats,
+    )
+    return stats
+
+
+def merge_files(
+    paths: Sequence[Path],
+    out_path: Path,
+    token,
+    on_input: Callable[[Path], None],
+    spill: bool = False,
+    keep_bookmarks: bool = False,
+    dedup: Optional[DedupStats] = None,
+) -> bool:
+    # Sources stay open until the save so copied pages can still read their streams; the caller bounds len(paths).
+    out_pdf = pikepdf.Pdf.new()
+    opened: List[pikepdf.Pdf] = []
+    outline: List[pikepdf.OutlineItem] = []
+    try:
+        for path in paths:
+            if token.is_cancelled():
+                return False
+            src = pikepdf.open(path)
+            opened.append(src)
+            added = append_pages(out_pdf, src.pages)
+            if keep_bookmarks:
+                outline.extend(_copy_outline(src, out_pdf, added))
+            on_input(path)
+        if outline:
+            with out_pdf.open_outline() as out_outline:
+                out_outline.root.extend(outline)
+        if dedup is not None:
+            dedup.add(dedupe_streams(out_pdf))
+        if spill:
+            # Intermediate parts keep stream bytes untouched; only the final save applies compression.
+            out_pdf.save(out_path, compress_streams=False, stream_decode_level=pikepdf.StreamDecodeLevel.none)
+        else:
+            out_pdf.save(out_path)
+    finally:
+        out_pdf.close()
+        for src in opened:
+            src.close()
+    return True
+
+
+def _copy_outline(src: pikepdf.Pdf, out_pdf: pikepdf.Pdf, added: List[pikepdf.Page]) -> List[pikepdf.OutlineItem]:
+    if pikepdf.Name.Outlines not in src.Root:
+        return []
+    page_index = {page.obj.objgen: i for i, page in enumerate(src.pages)}
+    with src.open_outline() as src_outline:
+        return [_copy_outline_item(item, src, out_pdf, added, page_index) for item in src_outline.root]
+
+
+def _copy_outline_item(
+    item: pikepdf.OutlineItem,
+    src: pikepdf.Pdf,
+    out_pdf: pikepdf.Pdf,
+    added: List[pikepdf.Page],
+    page_index: Dict[Tuple[int, int], int],
+) -> pikepdf.OutlineItem:
+    destination = None
+    action = None
+    target = item_target(item)
+    if target is not None:
+        explicit = explicit_destination(src, target)
+        if explicit is not None and explicit[0].objgen in page_index:
+            page = added[page_index[explicit[0].objgen]]
+            destination = pikepdf.Array([page.obj, *list(explicit)[1:]])
+    elif item.action is not None:
+        action = item.action if item.action.is_indirect else src.make_indirect(item.action)
+        action = out_pdf.copy_foreign(action)
+    copied = pikepdf.OutlineItem(item.title, destination=destination, action=action)
+    copied.is_closed = item.is_closed
+    copied.children.extend(_copy_outline_item(child, src, out_pdf, added, page_index) for child in item.children)
+    return copied
+
+
+def default_max_open_files() -> int:
+    try:
+        import resource
+    except ImportError:
+        return MAX_OPEN_FILES
+    soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft == resource.RLIM_INFINITY:
+        return MAX_OPEN_FILES
+    # Leave most descriptors to the rest of the process (Qt, logging, other jobs).
+    return max(2, min(MAX_OPEN_FILES, soft // 4))
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return max(1, os.path.getsize(path))
+    except OSError:
+        return 1
+
+
+def _ignore(_path: Path) -> None:
+    return None
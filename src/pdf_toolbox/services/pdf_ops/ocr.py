@@ -1,42 +1,78 @@
 from __future__ import annotations
 
 import io
+import logging
 import os
-import shutil
+from dataclasses import dataclass
 from pathlib import Path
 
 import fitz
 import pikepdf
-import pytesseract
 from docx import Document
 from PIL import Image
 
 from pdf_toolbox.core.models import JobResult, JobSpec
-from pdf_toolbox.config import BASE_DIR
 from pdf_toolbox.i18n import t
+from pdf_toolbox.services.io.ocr_cache import DEFAULT_MAX_BYTES, OcrCache, page_key
+from pdf_toolbox.services.io.temp_files import JobJournal, journal_key
 from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.ocr_engine import (
+    ENGINE_AUTO,
+    ENGINE_POOL,
+    OcrPageResult,
+    engine_available,
+    find_tesseract_cmd,
+)
+from pdf_toolbox.services.pdf_ops.ocr_bands import recognize_in_bands
+from pdf_toolbox.services.pdf_ops.page_pipeline import PagePipeline
+from pdf_toolbox.services.pdf_ops.raster import pixmap_to_image, render_budget, render_pixmap, render_size
+from pdf_toolbox.services.pdf_ops.render_dpi import dpi_policy
+
+logger = logging.getLogger(__name__)
+
+PAGE_TEXT = "text"
+PAGE_IMAGE = "image"
+PAGE_MIXED = "mixed"
+
+MIN_TEXT_CHARS = 20
+IMAGE_COVERAGE = 0.5
+
+
+@dataclass
+class _RenderedPage:
+    img: Image.Image | None = None
+    key: str | None = None
+    native_text: str | None = None
+    done: OcrPageResult | None = None
 
 
 class OcrOperation(PdfOperation):
     tool_id = "ocr"
     display_name = "OCR"
+    backend = "process"
 
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
         if not spec.params.get("output_pdf") and not spec.params.get("output_docx"):
             return JobResult(success=False, error=t("err_ocr_need_output"))
-        bundled = BASE_DIR / "tesseract" / "tesseract.exe"
-        tesseract_cmd = (
-            os.environ.get("TESSERACT_CMD")
-            or (str(bundled) if bundled.exists() else None)
-            or shutil.which("tesseract")
-            or shutil.which("tesseract.exe")
-        )
-        if not tesseract_cmd:
+        engine_pref = str(spec.params.get("ocr_engine", ENGINE_AUTO))
+        if not engine_available(engine_pref):
             return JobResult(success=False, error=t("err_no_tesseract"))
-        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+        tesseract_cmd = find_tesseract_cmd()
 
-        dpi = int(spec.params.get("dpi", 300))
+        policy = dpi_policy(spec.params, 300)
         lang = str(spec.params.get("lang", "chi_sim+eng"))
+        workers = int(spec.params.get("ocr_workers") or min(4, os.cpu_count() or 1))
+        prefetch = int(spec.params.get("prefetch") or workers)
+        # Budgeted per recognition worker: banded pages are recognized on the single render thread, so only
+        # pages too large for a worker's share should take that path.
+        budget = render_budget(spec.params, workers)
+        smart = bool(spec.params.get("smart", False))
+        sandwich = bool(spec.params.get("sandwich", False))
+        resume = bool(spec.params.get("resume", True))
+        cache = None
+        if spec.params.get("use_cache", True):
+            max_mb = spec.params.get("cache_max_mb")
+            cache = OcrCache(max_bytes=int(max_mb) * 1024 * 1024 if max_mb else DEFAULT_MAX_BYTES)
         outputs: list[Path] = []
 
         total_inputs = len(spec.inputs)
@@ -60,7 +96,8 @@ class OcrOperation(PdfOperation):
                     index=name_index,
                     overwrite=spec.overwrite,
                 )
-                pdf_out = pikepdf.Pdf.new()
+                # Sandwich output keeps the source page objects and only overlays the recognized text.
+                pdf_out = pikepdf.open(src) if sandwich else pikepdf.Pdf.new()
 
             docx = Document() if spec.params.get("output_docx") else None
             docx_path = None
@@ -76,43 +113,172 @@ class OcrOperation(PdfOperation):
                     overwrite=spec.overwrite,
                 )
 
-            for i in range(total_pages):
-                if token.is_cancelled():
-                    doc.close()
-                    return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+            want_pdf = pdf_out is not None
+            want_text = docx is not None
+            src_pdf = pikepdf.open(src) if smart and want_pdf and not sandwich else None
+            journal = None
+            if resume:
+                key = journal_key(
+                    src, dpi=policy.describe(), lang=lang, smart=smart, sandwich=sandwich, pdf=want_pdf, text=want_text
+                )
+                journal = JobJournal(key)
+                if journal.entries:
+                    logger.info("OCR %s: resuming with %d checkpointed pages", src.name, len(journal.entries))
+
+            # Render DPI per page, for the progress messages in auto mode.
+            page_dpis: dict[int, int] = {}
 
-                page = doc.load_page(i)
+            def render(page_index: int) -> _RenderedPage:
+                if journal is not None and journal.is_done(page_index):
+                    return _load_checkpoint(journal, page_index)
+                page = doc.load_page(page_index)
+                if smart:
+                    kind, native_text = classify_page(page)
+                    if kind == PAGE_TEXT:
+                        if journal is not None:
+                            journal.record(page_index, {"txt": native_text.encode("utf-8")}, native=True)
+                        return _RenderedPage(native_text=native_text)
+                if sandwich and page.rotation:
+                    # The text layer is placed in unrotated page space; /Rotate then applies to both.
+                    page.set_rotation(0)
+                dpi = page_dpis[page_index] = policy.page_dpi(page)
                 zoom = dpi / 72.0
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-
-                if pdf_out is not None:
-                    pdf_bytes = pytesseract.image_to_pdf_or_hocr(img, extension="pdf", lang=lang)
-                    with pikepdf.open(io.BytesIO(pdf_bytes)) as page_pdf:
-                        pdf_out.pages.extend(page_pdf.pages)
-
-                if docx is not None:
-                    text = pytesseract.image_to_string(img, lang=lang)
-                    if text.strip():
-                        docx.add_paragraph(text)
-                    if i < total_pages - 1:
-                        docx.add_page_break()
-
-                progress_cb(
-                    "processing",
-                    i + 1,
-                    total_pages,
-                    t("progress_ocr_page", name=src.name, page=i + 1),
-                )
+                width, height = render_size(page, zoom)
+                if width * height > budget:
+                    # Oversized pages are recognized here, one band at a time, instead of queueing a page image
+                    # that would not fit the budget.
+                    with ENGINE_POOL.acquire(lang, engine_pref, tesseract_cmd) as engine:
+                        result = recognize_in_bands(page, zoom, budget, engine, want_pdf, want_text, sandwich)
+                    if journal is not None:
+                        _record_checkpoint(journal, page_index, result)
+                    return _RenderedPage(done=result)
+                pix = render_pixmap(page, zoom)
+                key = None
+                if cache is not None:
+                    layer = "text" if sandwich else "image"
+                    key = page_key(pix.samples_mv, pix.width, pix.height, dpi=dpi, lang=lang, layer=layer)
+                return _RenderedPage(pixmap_to_image(pix), key)
+
+            def recognize(page_index: int, rendered: _RenderedPage) -> OcrPageResult | _RenderedPage:
+                if rendered.done is not None:
+                    return rendered.done
+                if rendered.native_text is not None:
+                    return rendered
+                img, key = rendered.img, rendered.key
+                if key is not None:
+                    hit = cache.get(key, want_pdf, want_text)
+                    if hit is not None:
+                        result = OcrPageResult(*hit)
+                        # Checkpointed as well: by the time the job resumes, the cache may have evicted the page.
+                        if journal is not None:
+                            _record_checkpoint(journal, page_index, result)
+                        return result
+                with ENGINE_POOL.acquire(lang, engine_pref, tesseract_cmd) as engine:
+                    result = engine.recognize(img, want_pdf=want_pdf, want_text=want_text, text_only=sandwich)
+                if key is not None:
+                    cache.put(key, result.pdf_bytes, result.text)
+                if journal is not None:
+                    _record_checkpoint(journal, page_index, result)
+                return result
+
+            pipeline = PagePipeline(render, recognize, workers=workers, prefetch=prefetch)
+            try:
+                for i, ocr in pipeline.run(range(total_pages), token):
+                    native = isinstance(ocr, _RenderedPage)
+                    text = ocr.native_text if native else ocr.text
+                    if pdf_out is not None:
+                        if native:
+                            if not sandwich:
+                                pdf_out.pages.append(src_pdf.pages[i])
+                        elif sandwich:
+                            with pikepdf.open(io.BytesIO(ocr.pdf_bytes)) as layer_pdf:
+                                _overlay_text_layer(pdf_out, pdf_out.pages[i], layer_pdf.pages[0])
+                        else:
+                            with pikepdf.open(io.BytesIO(ocr.pdf_bytes)) as page_pdf:
+                                pdf_out.pages.extend(page_pdf.pages)
 
-            doc.close()
+                    if docx is not None:
+                        if text.strip():
+                            docx.add_paragraph(text)
+                        if i < total_pages - 1:
+                            docx.add_page_break()
 
-            if pdf_out is not None and pdf_path is not None:
-                pdf_out.save(pdf_path)
-                outputs.append(pdf_path)
+                    if native:
+                        message = t("progress_ocr_skip_page", name=src.name, page=i + 1)
+                    elif policy.auto and i in page_dpis:
+                        message = t("progress_ocr_page_dpi", name=src.name, page=i + 1, dpi=page_dpis[i])
+                    else:
+                        message = t("progress_ocr_page", name=src.name, page=i + 1)
+                    progress_cb("processing", i + 1, total_pages, message)
+                if token.is_cancelled():
+                    return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+
+                if pdf_out is not None and pdf_path is not None:
+                    pdf_out.save(pdf_path)
+                    outputs.append(pdf_path)
+            finally:
+                doc.close()
+                if src_pdf is not None:
+                    src_pdf.close()
+                if sandwich and pdf_out is not None:
+                    pdf_out.close()
             if docx is not None and docx_path is not None:
                 docx.save(docx_path)
                 outputs.append(docx_path)
+            if journal is not None:
+                journal.discard()
 
+        if cache is not None:
+            logger.info("OCR cache: %d hits, %d misses", cache.hits, cache.misses)
         return JobResult(success=True, outputs=outputs)
+
+
+def _record_checkpoint(journal: JobJournal, page_index: int, result: OcrPageResult) -> None:
+    files = {}
+    if result.pdf_bytes is not None:
+        files["pdf"] = result.pdf_bytes
+    if result.text is not None:
+        files["txt"] = result.text.encode("utf-8")
+    journal.record(page_index, files)
+
+
+def _load_checkpoint(journal: JobJournal, page_index: int) -> _RenderedPage:
+    raw_text = journal.read(page_index, "txt")
+    text = raw_text.decode("utf-8") if raw_text is not None else None
+    if journal.entries[page_index].get("native"):
+        return _RenderedPage(native_text=text or "")
+    return _RenderedPage(done=OcrPageResult(journal.read(page_index, "pdf"), text))
+
+
+def _overlay_text_layer(pdf: pikepdf.Pdf, page: pikepdf.Page, layer: pikepdf.Page) -> None:
+    # The layer was recognized from the page rendered with /Rotate cleared, so it belongs in unrotated page space.
+    # add_overlay would compensate for /Rotate and turn it away from the words; only scale it onto the crop box.
+    form = pdf.copy_foreign(layer.as_form_xobject())
+    name = page.add_resource(form, pikepdf.Name.XObject, prefix="OcrText")
+    box = pikepdf.Rectangle(page.cropbox)
+    layer_box = pikepdf.Rectangle(layer.mediabox)
+    sx, sy = box.width / layer_box.width, box.height / layer_box.height
+    matrix = pikepdf.Matrix(sx, 0, 0, sy, box.llx - layer_box.llx * sx, box.lly - layer_box.lly * sy)
+    # Wrap the existing content so a graphics state it leaves behind does not apply to the layer.
+    page.contents_add(pdf.make_stream(b"q\n"), prepend=True)
+    place = pikepdf.unparse_content_stream(
+        [([], "Q"), ([], "q"), ([*matrix.shorthand], "cm"), ([name], "Do"), ([], "Q")]
+    )
+    page.contents_add(pdf.make_stream(place))
+
+
+def classify_page(page: fitz.Page) -> tuple[str, str]:
+    text = page.get_text("text")
+    has_text = len(text.strip()) >= MIN_TEXT_CHARS
+    page_rect = page.rect
+    page_area = page_rect.width * page_rect.height or 1.0
+    covered = 0.0
+    for info in page.get_image_info():
+        clipped = fitz.Rect(info["bbox"]) & page_rect
+        covered += clipped.width * clipped.height
+    image_heavy = covered >= IMAGE_COVERAGE * page_area
+    if has_text and not image_heavy:
+        return PAGE_TEXT, text
+    if has_text:
+        return PAGE_MIXED, text
+    return PAGE_IMAGE, text
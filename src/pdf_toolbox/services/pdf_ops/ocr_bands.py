@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import math
+from typing import Dict, List, Tuple
+
+import fitz
+
+from pdf_toolbox.services.pdf_ops.ocr_engine import OcrEngine, OcrPageResult
+from pdf_toolbox.services.pdf_ops.raster import iter_bands, pixmap_to_image, render_size
+
+# Bands overlap by this much page height so a text line cut by one band edge is whole in the next band.
+BAND_OVERLAP_PT = 36
+
+# Built-in, non-embedded CJK font that also covers Latin text.
+OCR_FONT = "china-s"
+
+# x0, y0, x1, y1 in page points, then the word.
+Word = Tuple[float, float, float, float, str]
+
+
+def recognize_in_bands(
+    page: fitz.Page,
+    zoom: float,
+    budget: int,
+    engine: OcrEngine,
+    want_pdf: bool,
+    want_text: bool,
+    text_only: bool = False,
+) -> OcrPageResult:
+    # Pages too large to rasterize at once are recognized band by band. The engine is asked for a text-only PDF
+    # so word positions are known; each band keeps the words centred in its share of the overlaps, and the page
+    # result is rebuilt from those words.
+    _, height = render_size(page, zoom)
+    overlap = math.ceil(BAND_OVERLAP_PT * zoom)
+    lines: List[List[Word]] = []
+    for top, pix in iter_bands(page, zoom, budget, overlap=overlap):
+        bottom = top + pix.height
+        core = (top + overlap / 2 if top > 0 else 0, bottom - overlap / 2 if bottom < height else height)
+        result = engine.recognize(pixmap_to_image(pix), want_pdf=True, want_text=False, text_only=True)
+        if result.pdf_bytes:
+            lines.extend(_band_lines(result.pdf_bytes, pix.width, top, zoom, core))
+    text = "".join(" ".join(word[4] for word in line) + "\n" for line in lines) if want_text else None
+    pdf_bytes = _text_layer_pdf(page, lines, draw_page=not text_only) if want_pdf else None
+    return OcrPageResult(pdf_bytes, text)
+
+
+def _band_lines(
+    pdf_bytes: bytes, band_width: int, top: int, zoom: float, core: Tuple[float, float]
+) -> List[List[Word]]:
+    grouped: Dict[Tuple[int, int], List[Word]] = {}
+    with fitz.open(stream=pdf_bytes, filetype="pdf") as band_doc:
+        band_page = band_doc[0]
+        # The engine's page size depends on the resolution it assumed; map its points back to band pixels.
+        scale = band_width / band_page.rect.width
+        for x0, y0, x1, y1, word, block, line, _ in band_page.get_text("words"):
+            if not core[0] <= top + (y0 + y1) / 2 * scale < core[1]:
+                continue
+            box = (x0 * scale / zoom, (top + y0 * scale) / zoom, x1 * scale / zoom, (top + y1 * scale) / zoom)
+            grouped.setdefault((block, line), []).append((*box, word))
+    return list(grouped.values())
+
+
+def _text_layer_pdf(page: fitz.Page, lines: List[List[Word]], draw_page: bool) -> bytes:
+    # Words are in the displayed (rotated) page space. The output page is built unrotated and given the same
+    # /Rotate, so each word is placed through the derotation matrix and turned with the page.
+    rotation = page.rotation
+    derotate = page.derotation_matrix
+    unrotated = page.rect * derotate
+    with fitz.open() as out:
+        out_page = out.new_page(width=unrotated.width, height=unrotated.height)
+        if draw_page:
+            # show_pdf_page clips a rotated source to its rotated rectangle, so draw it with /Rotate cleared.
+            page.set_rotation(0)
+            try:
+                out_page.show_pdf_page(out_page.rect, page.parent, page.number)
+            finally:
+                page.set_rotation(rotation)
+        for line in lines:
+            for x0, y0, x1, y1, word in line:
+                size = y1 - y0
+                length = fitz.get_text_length(word, fontname=OCR_FONT, fontsize=size)
+                # Shrink words that would run past their box so selections stay where the word is.
+                if length > x1 - x0 > 0:
+                    size *= (x1 - x0) / length
+                origin = fitz.Point(x0, y1 - 0.2 * (y1 - y0)) * derotate
+                out_page.insert_text(origin, word, fontname=OCR_FONT, fontsize=size, rotate=rotation, render_mode=3)
+        out_page.set_rotation(rotation)
+        return out.tobytes(garbage=3, deflate=True)
@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+from pdf_toolbox.config import BASE_DIR
+from pdf_toolbox.i18n import t
+from pdf_toolbox.services.io.temp_files import temp_dir
+
+logger = logging.getLogger(__name__)
+
+ENGINE_AUTO = "auto"
+ENGINE_TESSEROCR = "tesserocr"
+ENGINE_CLI = "cli"
+
+
+@dataclass
+class OcrPageResult:
+    pdf_bytes: Optional[bytes] = None
+    text: Optional[str] = None
+
+
+class OcrEngine(ABC):
+    kind: str = ""
+
+    def __init__(self, lang: str) -> None:
+        self.lang = lang
+
+    # text_only asks for a PDF page carrying only the invisible text layer, without the page image.
+    @abstractmethod
+    def recognize(
+        self, img: Image.Image, want_pdf: bool, want_text: bool, text_only: bool = False
+    ) -> OcrPageResult:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        return None
+
+
+class TesseractCliEngine(OcrEngine):
+    kind = ENGINE_CLI
+
+    def __init__(self, lang: str, tesseract_cmd: str) -> None:
+        super().__init__(lang)
+        import pytesseract
+
+        self._pytesseract = pytesseract
+        pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+
+    def recognize(
+        self, img: Image.Image, want_pdf: bool, want_text: bool, text_only: bool = False
+    ) -> OcrPageResult:
+        runner = self._pytesseract.pytesseract
+        # One Tesseract run renders every requested output; asking twice would recognize the page twice.
+        extensions = (["pdf"] if want_pdf else []) + (["txt"] if want_text else [])
+        config = "-c textonly_pdf=1" if want_pdf and text_only else ""
+        with runner.save(img) as (temp_name, input_filename):
+            runner.run_tesseract(input_filename, temp_name, " ".join(extensions), self.lang, config=config)
+            pdf_bytes = Path(f"{temp_name}.pdf").read_bytes() if want_pdf else None
+            text = Path(f"{temp_name}.txt").read_text(encoding="utf-8", errors="replace") if want_text else None
+        return OcrPageResult(pdf_bytes, text)
+
+
+class TesserocrEngine(OcrEngine):
+    kind = ENGINE_TESSEROCR
+
+    def __init__(self, lang: str, tessdata: Optional[str] = None) -> None:
+        super().__init__(lang)
+        import tesserocr
+
+        kwargs = {"lang": lang}
+        if tessdata:
+            kwargs["path"] = tessdata
+        # Loading traineddata is the expensive part; the API object keeps it resident between pages.
+        self._api = tesserocr.PyTessBaseAPI(**kwargs)
+
+    def recognize(
+        self, img: Image.Image, want_pdf: bool, want_text: bool, text_only: bool = False
+    ) -> OcrPageResult:
+        if not want_pdf:
+            self._api.SetImage(img)
+            return OcrPageResult(text=self._api.GetUTF8Text())
+        with temp_dir(prefix="pdf_toolbox_ocr_") as tmp:
+            base = tmp / "page"
+            self._api.SetVariable("tessedit_create_pdf", "1")
+            self._api.SetVariable("tessedit_create_txt", "1" if want_text else "0")
+            self._api.SetVariable("textonly_pdf", "1" if text_only else "0")
+            # The PDF renderer embeds the image file named here, as the CLI engine's does. A text-only page
+            # embeds nothing, so the PNG is only written when the image is drawn.
+            source = ""
+            if not text_only:
+                source = str(base.with_suffix(".png"))
+                img.save(source, format="PNG")
+            if not self._api.ProcessPage(str(base), img, 0, source):
+                raise RuntimeError("Tesseract failed to process page")
+            pdf_bytes = base.with_suffix(".pdf").read_bytes()
+            text = base.with_suffix(".txt").read_text(encoding="utf-8", errors="replace") if want_text else None
+        return OcrPageResult(pdf_bytes, text)
+
+    def close(self) -> None:
+        self._api.End()
+
+
+class OcrEnginePool:
+    def __init__(self, max_idle_per_key: int = 4) -> None:
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: Dict[Tuple[str, str], List[OcrEngine]] = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(
+        self, lang: str, preference: str = ENGINE_AUTO, tesseract_cmd: Optional[str] = None
+    ) -> Iterator[OcrEngine]:
+        engine = self._take(lang, preference) or create_engine(lang, preference, tesseract_cmd)
+        try:
+            yield engine
+        except Exception:
+            engine.close()
+            raise
+        self._give_back(engine)
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for engines in idle.values():
+            for engine in engines:
+                engine.close()
+
+    def _take(self, lang: str, preference: str) -> Optional[OcrEngine]:
+        kinds = [ENGINE_TESSEROCR, ENGINE_CLI] if preference == ENGINE_AUTO else [preference]
+        with self._lock:
+            for kind in kinds:
+                engines = self._idle.get((kind, lang))
+                if engines:
+                    return engines.pop()
+        return None
+
+    def _give_back(self, engine: OcrEngine) -> None:
+        with self._lock:
+            engines = self._idle.setdefault((engine.kind, engine.lang), [])
+            if len(engines) < self.max_idle_per_key:
+                engines.append(engine)
+                return
+        engine.close()
+
+
+def create_engine(lang: str, preference: str = ENGINE_AUTO, tesseract_cmd: Optional[str] = None) -> OcrEngine:
+    if preference in (ENGINE_AUTO, ENGINE_TESSEROCR):
+        try:
+            return TesserocrEngine(lang, find_tessdata())
+        except Exception as exc:  # noqa: BLE001
+            if preference == ENGINE_TESSEROCR:
+                raise
+            logger.debug("tesserocr unavailable, falling back to tesseract CLI: %s", exc)
+    cmd = tesseract_cmd or find_tesseract_cmd()
+    if not cmd:
+        raise RuntimeError(t("err_no_tesseract"))
+    return TesseractCliEngine(lang, cmd)
+
+
+def engine_available(preference: str = ENGINE_AUTO) -> bool:
+    if preference in (ENGINE_AUTO, ENGINE_CLI) and find_tesseract_cmd():
+        return True
+    if preference in (ENGINE_AUTO, ENGINE_TESSEROCR):
+        try:
+            import tesserocr  # noqa: F401
+        except Exception:  # noqa: BLE001
+            return False
+        return True
+    return False
+
+
+def find_tesseract_cmd() -> Optional[str]:
+    bundled = BASE_DIR / "tesseract" / "tesseract.exe"
+    return (
+        os.environ.get("TESSERACT_CMD")
+        or (str(bundled) if bundled.exists() else None)
+        or shutil.which("tesseract")
+        or shutil.which("tesseract.exe")
+    )
+
+
+def find_tessdata() -> Optional[str]:
+    if os.environ.get("TESSDATA_PREFIX"):
+        return os.environ["TESSDATA_PREFIX"]
+    bundled = BASE_DIR / "tesseract" / "tessdata"
+    return str(bundled) if bundled.exists() else None
+
+
+ENGINE_POOL = OcrEnginePool()
@@ -0,0 +1,44 @@
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import pikepdf
+
+
+def explicit_destination(src: pikepdf.Pdf, target) -> Optional[pikepdf.Array]:
+    # Named destinations are resolved against the source so callers never need its name tree.
+    if isinstance(target, pikepdf.Name):
+        target = src.Root.get(pikepdf.Name.Dests, pikepdf.Dictionary()).get(target)
+    elif isinstance(target, pikepdf.String):
+        names = src.Root.get(pikepdf.Name.Names, pikepdf.Dictionary())
+        if pikepdf.Name.Dests not in names:
+            return None
+        target = pikepdf.NameTree(names.Dests).get(str(target))
+    if isinstance(target, pikepdf.Dictionary):
+        target = target.get(pikepdf.Name.D)
+    if isinstance(target, pikepdf.Array) and len(target) > 0 and isinstance(target[0], pikepdf.Dictionary):
+        return target
+    return None
+
+
+def item_target(item: pikepdf.OutlineItem):
+    if item.destination is not None:
+        return item.destination
+    if item.action is not None and item.action.get(pikepdf.Name.S) == pikepdf.Name.GoTo:
+        return item.action.get(pikepdf.Name.D)
+    return None
+
+
+def top_level_starts(src: pikepdf.Pdf) -> List[Tuple[int, str]]:
+    # (page index, title) of each top-level bookmark that points into this document, in outline order.
+    if pikepdf.Name.Outlines not in src.Root:
+        return []
+    page_index: Dict[Tuple[int, int], int] = {page.obj.objgen: i for i, page in enumerate(src.pages)}
+    starts = []
+    with src.open_outline() as outline:
+        for item in outline.root:
+            target = item_target(item)
+            explicit = explicit_destination(src, target) if target is not None else None
+            if explicit is not None and explicit[0].objgen in page_index:
+                starts.append((page_index[explicit[0].objgen], item.title))
+    return starts
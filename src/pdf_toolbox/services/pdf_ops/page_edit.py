@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+from typing import Any, Dict
+
+import pikepdf
+
+from pdf_toolbox.core.models import JobResult, JobSpec
+from pdf_toolbox.core.page_script import compile_page_plan, page_edits_from_param
+from pdf_toolbox.i18n import t
+from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.page_list import append_pages
+
+
+class PageEditOperation(PdfOperation):
+    tool_id = "page_edit"
+    display_name = "Edit Pages"
+    in_memory = True
+    output_suffix = "_edited"
+
+    def validate(self, spec: JobSpec) -> None:
+        super().validate(spec)
+        page_edits_from_param(spec.params.get("edits"))
+
+    def apply(self, pdf, params: Dict[str, Any], progress_cb: ProgressCb, token):
+        pages = list(pdf.pages)
+        # All edits are folded into one page plan first, so the document is copied only once.
+        plan = compile_page_plan(page_edits_from_param(params.get("edits")), len(pages))
+
+        out_pdf = pikepdf.Pdf.new()
+        for i, (page_index, rotation) in enumerate(plan, start=1):
+            if token.is_cancelled():
+                out_pdf.close()
+                return None
+            page = pages[page_index]
+            if rotation:
+                # Each source page appears at most once and the source is never saved.
+                page.rotate(rotation, relative=True)
+            append_pages(out_pdf, [page])
+            progress_cb("processing", i, len(plan), t("progress_process_page", page=i))
+        return out_pdf
+
+    def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
+        outputs = []
+        total_inputs = len(spec.inputs)
+
+        for idx, src in enumerate(spec.inputs, start=1):
+            with pikepdf.open(src) as pdf:
+                out_pdf = self.apply(pdf, spec.params, progress_cb, token)
+                if out_pdf is None:
+                    return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+
+                name_index = idx if spec.output_name and total_inputs > 1 else None
+                out_path = self._output_path(
+                    src,
+                    spec.output_dir,
+                    self.output_suffix,
+                    spec.output_name,
+                    ext=".pdf",
+                    index=name_index,
+                    overwrite=spec.overwrite,
+                )
+                with out_pdf:
+                    out_pdf.save(out_path)
+                outputs.append(out_path)
+
+        return JobResult(success=True, outputs=outputs)
@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from typing import Iterable, List
+
+import pikepdf
+
+
+def append_pages(out_pdf: pikepdf.Pdf, pages: Iterable[pikepdf.Page]) -> List[pikepdf.Page]:
+    # PageList.append/extend and indexing re-read the whole page list on every call, which makes copying page by page
+    # quadratic in the length of the output. Pdf._add_page appends directly; fall back to the public API if it ever
+    # goes away. Returns the pages as added to out_pdf (copies, for pages of another Pdf).
+    pages = list(pages)
+    add_page = getattr(out_pdf, "_add_page", None)
+    if add_page is None:
+        out_pdf.pages.extend(pages)
+        return list(out_pdf.pages)[len(out_pdf.pages) - len(pages) :]
+    added = []
+    for page in pages:
+        add_page(page.obj, first=False)
+        # Adding a page flattens the page tree, so the new page is the last kid of the root.
+        added.append(pikepdf.Page(out_pdf.Root.Pages.Kids[-1]))
+    return added
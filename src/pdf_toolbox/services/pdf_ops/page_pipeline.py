@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import queue as queue_mod
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional, Sequence, Tuple
+
+from pdf_toolbox.core.cancel import CancellationToken
+
+_DONE = object()
+
+
+class PagePipeline:
+    # Stage 1 (produce) runs on one thread, stage 2 (process) on ``workers`` threads, and results are
+    # yielded to the caller in page order. At most ``prefetch + workers`` pages are alive at once.
+    def __init__(
+        self,
+        produce: Callable[[int], Any],
+        process: Callable[[int, Any], Any],
+        workers: int = 2,
+        prefetch: Optional[int] = None,
+    ) -> None:
+        self.produce = produce
+        self.process = process
+        self.workers = max(1, workers)
+        self.prefetch = max(1, prefetch if prefetch is not None else self.workers)
+
+    def run(self, pages: Sequence[int], token: CancellationToken) -> Iterator[Tuple[int, Any]]:
+        stop = threading.Event()
+        slots = threading.Semaphore(self.prefetch + self.workers)
+        produced: queue_mod.Queue = queue_mod.Queue(maxsize=self.prefetch)
+        results: Dict[int, Tuple[bool, Any]] = {}
+        ready = threading.Condition()
+
+        def publish(page_index: int, ok: bool, value: Any) -> None:
+            with ready:
+                results[page_index] = (ok, value)
+                ready.notify_all()
+
+        def producer() -> None:
+            try:
+                for page_index in pages:
+                    while not slots.acquire(timeout=0.1):
+                        if stop.is_set():
+                            return
+                    if stop.is_set() or token.is_cancelled():
+                        return
+                    try:
+                        item = self.produce(page_index)
+                    except Exception as exc:  # noqa: BLE001
+                        publish(page_index, False, exc)
+                        return
+                    _put(produced, (page_index, item), stop)
+            finally:
+                for _ in range(self.workers):
+                    _put(produced, _DONE, stop)
+
+        def worker() -> None:
+            while not stop.is_set():
+                try:
+                    entry = produced.get(timeout=0.1)
+                except queue_mod.Empty:
+                    continue
+                if entry is _DONE:
+                    return
+                page_index, item = entry
+                try:
+                    publish(page_index, True, self.process(page_index, item))
+                except Exception as exc:  # noqa: BLE001
+                    publish(page_index, False, exc)
+
+        threads = [threading.Thread(target=producer, name="page-pipeline-produce", daemon=True)]
+        threads += [
+            threading.Thread(target=worker, name=f"page-pipeline-process-{n}", daemon=True)
+            for n in range(self.workers)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            for page_index in pages:
+                with ready:
+                    while page_index not in results:
+                        if token.is_cancelled():
+                            return
+                        ready.wait(timeout=0.1)
+                    ok, value = results.pop(page_index)
+                if not ok:
+                    raise value
+                yield page_index, value
+                slots.release()
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+
+
+def _put(q: queue_mod.Queue, item: Any, stop: threading.Event) -> None:
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return
+        except queue_mod.Full:
+            continue
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import multiprocessing
+import queue as queue_mod
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import fitz
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.process_pool import cpu_share
+
+# page_fn(doc, page_index, page_arg, *args) must be a module-level function so it can be pickled by reference.
+PageFn = Callable[..., Any]
+ShardProgressCb = Callable[[int, int], None]
+
+SHARD_MIN_PAGES = 32
+DEFAULT_SHARD_SIZE = 8
+
+_worker_state: Dict[str, Any] = {}
+
+
+class PageShardExecutor:
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        shard_size: int = DEFAULT_SHARD_SIZE,
+        min_pages: int = SHARD_MIN_PAGES,
+    ) -> None:
+        # Inside a process-pool job the default is that job's share of the CPUs, so concurrent jobs that each
+        # shard their pages do not start cpu_count workers apiece.
+        self.max_workers = max(1, max_workers or cpu_share())
+        self.shard_size = max(1, shard_size)
+        self.min_pages = min_pages
+
+    def map_pages(
+        self,
+        src: Path,
+        pages: Sequence[int],
+        page_fn: PageFn,
+        args: Tuple[Any, ...],
+        progress_cb: ShardProgressCb,
+        token: CancellationToken,
+        page_args: Optional[Sequence[Any]] = None,
+        doc: Optional[fitz.Document] = None,
+    ) -> Iterator[Tuple[int, Any]]:
+        tasks = list(zip(pages, page_args if page_args is not None else [None] * len(pages)))
+        if self.max_workers <= 1 or len(tasks) < self.min_pages:
+            yield from self._map_serial(src, tasks, page_fn, args, progress_cb, token, doc)
+            return
+        yield from self._map_sharded(src, tasks, page_fn, args, progress_cb, token)
+
+    def _map_serial(self, src, tasks, page_fn, args, progress_cb, token, doc) -> Iterator[Tuple[int, Any]]:
+        own_doc = doc is None
+        if own_doc:
+            doc = fitz.open(src)
+        try:
+            total = len(tasks)
+            for done, (page_index, page_arg) in enumerate(tasks, start=1):
+                if token.is_cancelled():
+                    return
+                yield page_index, page_fn(doc, page_index, page_arg, *args)
+                progress_cb(done, total)
+        finally:
+            if own_doc:
+                doc.close()
+
+    def _map_sharded(self, src, tasks, page_fn, args, progress_cb, token) -> Iterator[Tuple[int, Any]]:
+        ctx = multiprocessing.get_context("spawn")
+        progress_queue = ctx.Queue()
+        cancel_event = ctx.Event()
+        shards = [tasks[i : i + self.shard_size] for i in range(0, len(tasks), self.shard_size)]
+        workers = min(self.max_workers, len(shards))
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=ctx,
+            initializer=_init_worker,
+            initargs=(progress_queue, cancel_event),
+        )
+        # Keep a bounded window of shards in flight so finished-but-unconsumed results stay small.
+        window = workers * 2
+        pending: Deque[Future] = deque()
+        next_shard = 0
+        done = 0
+        total = len(tasks)
+        try:
+            while next_shard < len(shards) or pending:
+                while next_shard < len(shards) and len(pending) < window:
+                    pending.append(executor.submit(_run_shard, str(src), shards[next_shard], page_fn, args))
+                    next_shard += 1
+                future = pending.popleft()
+                while True:
+                    done = _drain_progress(progress_queue, done, total, progress_cb)
+                    if token.is_cancelled():
+                        cancel_event.set()
+                        return
+                    try:
+                        results: List[Tuple[int, Any]] = future.result(timeout=0.1)
+                        break
+                    except FutureTimeout:
+                        continue
+                for item in results:
+                    yield item
+            _drain_progress(progress_queue, done, total, progress_cb)
+        finally:
+            cancel_event.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+
+
+def _drain_progress(progress_queue, done: int, total: int, progress_cb: ShardProgressCb) -> int:
+    advanced = 0
+    while True:
+        try:
+            advanced += progress_queue.get_nowait()
+        except queue_mod.Empty:
+            break
+    if advanced:
+        done += advanced
+        progress_cb(done, total)
+    return done
+
+
+def _init_worker(progress_queue, cancel_event) -> None:
+    _worker_state["progress"] = progress_queue
+    _worker_state["cancel"] = cancel_event
+    _worker_state["docs"] = {}
+
+
+def _worker_doc(src: str) -> fitz.Document:
+    docs: Dict[str, fitz.Document] = _worker_state["docs"]
+    doc = docs.get(src)
+    if doc is None:
+        doc = fitz.open(src)
+        docs[src] = doc
+    return doc
+
+
+def _run_shard(
+    src: str, tasks: List[Tuple[int, Any]], page_fn: PageFn, args: Tuple[Any, ...]
+) -> List[Tuple[int, Any]]:
+    doc = _worker_doc(src)
+    results: List[Tuple[int, Any]] = []
+    for page_index, page_arg in tasks:
+        if _worker_state["cancel"].is_set():
+            break
+        results.append((page_index, page_fn(doc, page_index, page_arg, *args)))
+        _worker_state["progress"].put(1)
+    return results
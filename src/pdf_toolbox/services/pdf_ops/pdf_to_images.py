@@ -1,53 +1,124 @@
 ﻿from __future__ import annotations
 
+from pathlib import Path
+from typing import Optional, Tuple
+
 import fitz
-from PIL import Image
 
 from pdf_toolbox.core.models import JobResult, JobSpec
 from pdf_toolbox.i18n import t
+from pdf_toolbox.services.io.naming import resolve_output_path
 from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.image_extract import extract_page_image
+from pdf_toolbox.services.pdf_ops.page_shards import PageShardExecutor
+from pdf_toolbox.services.pdf_ops.raster import (
+    iter_bands,
+    render_budget,
+    render_image_within,
+    render_size,
+    write_png_bands,
+)
+from pdf_toolbox.services.pdf_ops.render_dpi import DpiPolicy, dpi_policy
+
+# "render" rasterizes every page; "extract" writes the embedded image of single-image pages as stored (JPEG,
+# JPEG 2000, JBIG2, CCITT) and renders only the other pages.
+PDF_TO_IMAGES_MODES = ("render", "extract")
 
 
 class PdfToImagesOperation(PdfOperation):
     tool_id = "pdf_to_images"
     display_name = "PDF to Images"
+    backend = "process"
 
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
-        dpi = int(spec.params.get("dpi", 150))
+        policy = dpi_policy(spec.params, 150)
+        extract = spec.params.get("mode") == "extract"
+        # Auto DPI and extraction report each page as its result arrives, with what was done to it.
+        per_page = policy.auto or extract
         fmt = str(spec.params.get("format", "png")).lower()
         outputs = []
         pil_format = "JPEG" if fmt in {"jpg", "jpeg"} else "PNG"
+        executor = PageShardExecutor(max_workers=spec.params.get("workers"))
+        budget = render_budget(spec.params, executor.max_workers)
 
         total_inputs = len(spec.inputs)
         for idx, src in enumerate(spec.inputs, start=1):
-            doc = fitz.open(src)
-            total_pages = doc.page_count
-
-            for i in range(total_pages):
-                if token.is_cancelled():
-                    doc.close()
-                    return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                page = doc.load_page(i)
-                zoom = dpi / 72.0
-                mat = fitz.Matrix(zoom, zoom)
-                pix = page.get_pixmap(matrix=mat, alpha=False)
-                img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-                ext = f".{fmt}"
-                name_index = idx if spec.output_name and total_inputs > 1 else None
-                out_path = self._output_path(
-                    src,
-                    spec.output_dir,
-                    f"_p{i+1}",
-                    spec.output_name,
-                    ext=ext,
-                    index=name_index,
-                    overwrite=spec.overwrite,
+            with fitz.open(src) as doc:
+                total_pages = doc.page_count
+            name_index = idx if spec.output_name and total_inputs > 1 else None
+            out_paths = [
+                str(
+                    self._output_path(
+                        src,
+                        spec.output_dir,
+                        f"_p{i+1}",
+                        spec.output_name,
+                        ext=f".{fmt}",
+                        index=name_index,
+                        overwrite=spec.overwrite,
+                    )
                 )
-                img.save(out_path, format=pil_format)
-                outputs.append(out_path)
-                progress_cb("processing", i + 1, total_pages, t("progress_export_page", page=i + 1))
+                for i in range(total_pages)
+            ]
 
-            doc.close()
+            def on_progress(done: int, total: int) -> None:
+                if not per_page:
+                    progress_cb("processing", done, total, t("progress_export_page", page=done))
+
+            exported = executor.map_pages(
+                src,
+                range(total_pages),
+                _export_page,
+                (policy, pil_format, budget, extract, spec.overwrite),
+                on_progress,
+                token,
+                page_args=out_paths,
+            )
+            for done, (page_index, (out_path, page_dpi, extracted)) in enumerate(exported, start=1):
+                outputs.append(out_path)
+                if not per_page:
+                    continue
+                if extracted:
+                    message = t("progress_extract_image_page", page=page_index + 1, fmt=extracted.lstrip(".").upper())
+                elif policy.auto:
+                    message = t("progress_export_page_dpi", page=page_index + 1, dpi=page_dpi)
+                else:
+                    message = t("progress_export_page", page=page_index + 1)
+                progress_cb("processing", done, total_pages, message)
+            if token.is_cancelled():
+                return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
 
         return JobResult(success=True, outputs=outputs)
 
+
+def _export_page(
+    doc: fitz.Document,
+    page_index: int,
+    out_path: str,
+    policy: DpiPolicy,
+    pil_format: str,
+    budget: int,
+    extract: bool,
+    overwrite: bool,
+) -> Tuple[Path, Optional[int], Optional[str]]:
+    # Returns the written path with the render DPI, or with the extension of the extracted image.
+    page = doc.load_page(page_index)
+    if extract:
+        found = extract_page_image(page)
+        if found is not None:
+            ext, data = found
+            path = Path(out_path)
+            if path.suffix.lower() != ext:
+                # The image keeps its own format, whatever format was asked for the rendered pages.
+                path = resolve_output_path(path, path.parent, "", ext=ext, overwrite=overwrite)
+            path.write_bytes(data)
+            return path, None, ext
+    dpi = policy.page_dpi(page)
+    zoom = dpi / 72.0
+    size = render_size(page, zoom)
+    if size[0] * size[1] > budget and pil_format == "PNG":
+        # Bands go straight into the PNG stream, so the page never exists in memory as a whole.
+        write_png_bands(Path(out_path), size, iter_bands(page, zoom, budget))
+    else:
+        render_image_within(page, zoom, budget).save(out_path, format=pil_format)
+    return Path(out_path), dpi, None
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import logging
+import shutil
+from contextlib import ExitStack, contextmanager
+from dataclasses import replace
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from pdf_toolbox.core.models import PIPELINE_TOOL_ID, JobResult, JobSpec
+from pdf_toolbox.core.runner import friendly_error
+from pdf_toolbox.i18n import t
+from pdf_toolbox.services.io.temp_files import memory_temp_root, temp_dir
+from pdf_toolbox.services.io.validators import ValidationError
+from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+
+logger = logging.getLogger(__name__)
+
+# memory_limit_mb caps the RAM-backed scratch space between stages that are not fused. That space is a tmpfs folder,
+# so it only exists on Linux; elsewhere those hand-offs always go through the temp folder on disk.
+DEFAULT_MEMORY_LIMIT_MB = 512
+STAGE_UNITS = 1000
+
+
+class PipelineOperation(PdfOperation):
+    tool_id = PIPELINE_TOOL_ID
+    display_name = "Pipeline"
+
+    def validate(self, spec: JobSpec) -> None:
+        super().validate(spec)
+        _stages(spec)
+
+    def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
+        stages = _stages(spec)
+        limit = int(float(spec.params.get("memory_limit_mb") or DEFAULT_MEMORY_LIMIT_MB) * 1048576)
+        inputs: List[Path] = list(spec.inputs)
+        warnings: List[str] = []
+        count = len(stages)
+
+        with ExitStack() as stack:
+            scratch = _Scratch(stack, limit)
+            for start, segment in _segments(stages):
+                index = start + len(segment) - 1
+                last = index == count - 1
+                # Only the last stage writes to the output folder; the others write to scratch space that is
+                # RAM-backed while the data is small and spills to the temp folder above the limit.
+                stage_spec = JobSpec(
+                    tool_id=segment[-1][0].tool_id,
+                    inputs=inputs,
+                    output_dir=spec.output_dir if last else scratch.folder(index, inputs),
+                    output_name=spec.output_name if last else None,
+                    params=segment[-1][1],
+                    overwrite=spec.overwrite if last else True,
+                )
+                result = _run_segment(stage_spec, segment, start, count, progress_cb, token)
+                if result.warning:
+                    warnings.append(result.warning)
+                if not result.success:
+                    if result.error and not result.cancelled:
+                        tool = segment[0][0].display_name
+                        result.error = t("err_pipeline_stage", index=start + 1, tool=tool, error=result.error)
+                    return result
+                scratch.release(inputs)
+                inputs = list(result.outputs)
+
+        return JobResult(success=True, outputs=inputs, warning="; ".join(warnings) or None)
+
+
+def _segments(stages: List[Tuple[PdfOperation, dict]]) -> List[Tuple[int, List[Tuple[PdfOperation, dict]]]]:
+    # Consecutive stages that can edit an open document are fused so they share one parse and one save.
+    segments: List[Tuple[int, List[Tuple[PdfOperation, dict]]]] = []
+    for index, (op, params) in enumerate(stages):
+        fusable = op.can_apply(params)
+        if segments and fusable and segments[-1][1][-1][0].can_apply(segments[-1][1][-1][1]):
+            segments[-1][1].append((op, params))
+        else:
+            segments.append((index, [(op, params)]))
+    return segments
+
+
+def _run_segment(
+    spec: JobSpec,
+    segment: List[Tuple[PdfOperation, dict]],
+    start: int,
+    count: int,
+    progress_cb: ProgressCb,
+    token,
+) -> JobResult:
+    for offset, (op, params) in enumerate(segment):
+        with _stage_errors(start + offset, op, token):
+            op.validate(replace(spec, tool_id=op.tool_id, params=params))
+    if segment[0][0].can_apply(segment[0][1]):
+        return _apply_segment(spec, segment, start, count, progress_cb, token)
+    op, params = segment[0]
+    with _stage_errors(start, op, token):
+        return op.run(spec, _stage_progress(progress_cb, op, start, count), token)
+
+
+@contextmanager
+def _stage_errors(index: int, op: PdfOperation, token) -> Iterator[None]:
+    # Errors a stage raises get the same "Stage N (tool)" prefix as a failed result; without it a bad page range
+    # in a long chain cannot be traced to its step.
+    try:
+        yield
+    except Exception as exc:  # noqa: BLE001
+        if token.is_cancelled():
+            raise
+        error = friendly_error(exc)
+        raise ValidationError(t("err_pipeline_stage", index=index + 1, tool=op.display_name, error=error)) from exc
+
+
+def _apply_segment(
+    spec: JobSpec,
+    segment: List[Tuple[PdfOperation, dict]],
+    start: int,
+    count: int,
+    progress_cb: ProgressCb,
+    token,
+) -> JobResult:
+    import pikepdf
+
+    outputs: List[Path] = []
+    files = len(spec.inputs)
+    width = len(segment) / files
+    suffix = "".join(op.output_suffix for op, _ in segment)
+    for file_index, src in enumerate(spec.inputs):
+        with ExitStack() as docs:
+            # Every document in the chain stays open until the save, since later ones copy pages from earlier ones.
+            with _stage_errors(start, segment[0][0], token):
+                pdf = docs.enter_context(pikepdf.open(src))
+            for offset, (op, params) in enumerate(segment):
+                base = start + file_index * width + offset / files
+                report = _stage_progress(progress_cb, op, start + offset, count, base, 1 / files)
+                with _stage_errors(start + offset, op, token):
+                    pdf_out = op.apply(pdf, params, report, token)
+                if pdf_out is None:
+                    return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+                if pdf_out is not pdf:
+                    pdf = docs.enter_context(pdf_out)
+            name_index = file_index + 1 if spec.output_name and files > 1 else None
+            last = segment[-1][0]
+            with _stage_errors(start + len(segment) - 1, last, token):
+                out_path = last._output_path(
+                    src,
+                    spec.output_dir,
+                    suffix,
+                    spec.output_name,
+                    ext=".pdf",
+                    index=name_index,
+                    overwrite=spec.overwrite,
+                )
+                pdf.save(out_path)
+        outputs.append(out_path)
+    return JobResult(success=True, outputs=outputs)
+
+
+class _Scratch:
+    # Hands out one folder per intermediate stage and deletes a stage's files as soon as the next stage is done.
+    def __init__(self, stack: ExitStack, limit: int) -> None:
+        self.stack = stack
+        self.limit = limit
+        self._memory: Optional[Path] = None
+        self._disk: Optional[Path] = None
+        self._owned: List[Path] = []
+
+    def folder(self, index: int, inputs: List[Path]) -> Path:
+        # Stage outputs are assumed to be at most about twice the size of its inputs.
+        need = 2 * sum(p.stat().st_size for p in inputs if p.exists())
+        root = self._memory_root() if need <= self.limit else None
+        if root is not None and shutil.disk_usage(root).free < need + self.limit // 4:
+            root = None
+        if root is None:
+            logger.info("Pipeline stage %d spills to disk (about %d bytes)", index + 1, need)
+            root = self._disk_root()
+        folder = root / f"stage_{index + 1}"
+        folder.mkdir()
+        self._owned.append(folder)
+        return folder
+
+    def release(self, paths: List[Path]) -> None:
+        for path in paths:
+            if any(folder in path.parents for folder in self._owned):
+                path.unlink(missing_ok=True)
+
+    def _memory_root(self) -> Optional[Path]:
+        if self._memory is None:
+            root = memory_temp_root()
+            if root is None:
+                return None
+            self._memory = self.stack.enter_context(temp_dir(prefix="pdf_toolbox_pipeline_", root=root))
+        return self._memory
+
+    def _disk_root(self) -> Path:
+        if self._disk is None:
+            self._disk = self.stack.enter_context(temp_dir(prefix="pdf_toolbox_pipeline_"))
+        return self._disk
+
+
+def _stages(spec: JobSpec) -> List[Tuple[PdfOperation, dict]]:
+    from pdf_toolbox.services.pdf_ops import OP_REGISTRY
+
+    raw = spec.params.get("stages") or []
+    if not raw:
+        raise ValidationError(t("err_pipeline_empty"))
+    stages = []
+    for index, stage in enumerate(raw, start=1):
+        tool_id = stage.get("tool_id") if isinstance(stage, dict) else None
+        if tool_id == PIPELINE_TOOL_ID:
+            raise ValidationError(t("err_pipeline_nested"))
+        if tool_id not in OP_REGISTRY:
+            error = t("err_tool_not_found", tool_id=tool_id)
+            raise ValidationError(t("err_pipeline_stage", index=index, tool=tool_id, error=error))
+        stages.append((OP_REGISTRY[tool_id], dict(stage.get("params") or {})))
+    return stages
+
+
+def _stage_progress(
+    progress_cb: ProgressCb,
+    op: PdfOperation,
+    index: int,
+    count: int,
+    base: Optional[float] = None,
+    width: float = 1.0,
+) -> ProgressCb:
+    # Maps a stage's own progress onto one scale for the whole chain; fused stages cover a slice of their segment.
+    base = index if base is None else base
+
+    def report(stage: str, current: int, total: int, message: str = "") -> None:
+        fraction = min(1.0, current / total) if total else 0.0
+        overall = int((base + fraction * width) * STAGE_UNITS)
+        prefix = t("progress_pipeline_stage", index=index + 1, count=count, tool=op.display_name)
+        progress_cb(stage, overall, count * STAGE_UNITS, f"{prefix} {message}".strip())
+
+    return report
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import struct
+import threading
+import time
+import zlib
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+import fitz
+from PIL import Image
+
+
+# Pages whose render would exceed the per-render share of this budget are rasterized in horizontal bands.
+DEFAULT_PIXEL_BUDGET_MPX = 64
+# Sharing the budget never pushes a page's share below this, so ordinary pages (A4 at 300 dpi is 8.7 Mpx) are not
+# banded just because many workers run.
+MIN_PAGE_BUDGET_MPX = 40
+ASSEMBLY_BAND_DIVISOR = 16
+
+
+@dataclass
+class RenderStats:
+    pages: int = 0
+    pixels: int = 0
+    render_seconds: float = 0.0
+    # Bytes copied between the pixmap and PIL; gray pages are mapped without a copy.
+    bytes_copied: int = 0
+    bytes_mapped: int = 0
+    banded_pages: int = 0
+
+
+_stats = RenderStats()
+_stats_lock = threading.Lock()
+
+
+def render_pixmap(page: fitz.Page, zoom: float, gray: bool = False, clip: Optional[fitz.Rect] = None) -> fitz.Pixmap:
+    # PyMuPDF has no call that draws into an existing pixmap, so every page gets a fresh allocation; the handoff
+    # below at least avoids the extra copies on the way to PIL.
+    started = time.perf_counter()
+    colorspace = fitz.csGRAY if gray else fitz.csRGB
+    pix = page.get_pixmap(matrix=fitz.Matrix(zoom, zoom), colorspace=colorspace, alpha=False, clip=clip)
+    elapsed = time.perf_counter() - started
+    with _stats_lock:
+        _stats.pages += 1
+        _stats.pixels += pix.width * pix.height
+        _stats.render_seconds += elapsed
+    return pix
+
+
+def pixmap_to_image(pix: fitz.Pixmap) -> Image.Image:
+    # pix.samples returns a fresh bytes object and Image.frombytes copies it again. frombuffer reads the pixmap
+    # memory directly: "L" is mapped as is, and "RGB" (stored as 4 bytes per pixel by PIL) is unpacked in one pass.
+    mode = "L" if pix.n == 1 else "RGB"
+    image = Image.frombuffer(mode, (pix.width, pix.height), pix.samples_mv, "raw", mode, pix.stride, 1)
+    size = pix.stride * pix.height
+    with _stats_lock:
+        if image.readonly:
+            _stats.bytes_mapped += size
+        else:
+            _stats.bytes_copied += size
+    if image.readonly:
+        # The mapped image points into the pixmap's memory; keep the pixmap alive for as long as the image.
+        image.pixmap = pix
+    return image
+
+
+def render_image(page: fitz.Page, zoom: float, gray: bool = False, clip: Optional[fitz.Rect] = None) -> Image.Image:
+    return pixmap_to_image(render_pixmap(page, zoom, gray=gray, clip=clip))
+
+
+def render_budget(params: Dict[str, Any], concurrent: int = 1) -> int:
+    # pixel_budget_mpx is per job; pages rendered at the same time share it, down to MIN_PAGE_BUDGET_MPX unless the
+    # job budget itself is smaller.
+    budget = float(params.get("pixel_budget_mpx") or DEFAULT_PIXEL_BUDGET_MPX) * 1_000_000
+    share = max(budget / max(1, concurrent), min(budget, MIN_PAGE_BUDGET_MPX * 1_000_000))
+    return max(1, int(share))
+
+
+def render_size(page: fitz.Page, zoom: float) -> Tuple[int, int]:
+    irect = (page.rect * fitz.Matrix(zoom, zoom)).irect
+    return irect.width, irect.height
+
+
+def iter_bands(
+    page: fitz.Page, zoom: float, budget: int, gray: bool = False, overlap: int = 0
+) -> Iterator[Tuple[int, fitz.Pixmap]]:
+    # Yields (top row, pixmap) for full-width bands of at most budget pixels; consecutive bands share overlap rows.
+    width, height = render_size(page, zoom)
+    rows = max(overlap + 1, budget // max(1, width))
+    with _stats_lock:
+        _stats.banded_pages += 1
+    top = 0
+    while True:
+        bottom = min(height, top + rows)
+        clip = fitz.Rect(0, top / zoom, width / zoom, bottom / zoom)
+        yield top, render_pixmap(page, zoom, gray=gray, clip=clip)
+        if bottom >= height:
+            return
+        top = bottom - overlap
+
+
+def render_image_within(page: fitz.Page, zoom: float, budget: int, gray: bool = False) -> Image.Image:
+    # Over budget, the bands are pasted into one PIL image, so the full-size pixmap and its copies never exist.
+    width, height = render_size(page, zoom)
+    if width * height <= budget:
+        return render_image(page, zoom, gray=gray)
+    image = Image.new("L" if gray else "RGB", (width, height), 255 if gray else (255, 255, 255))
+    # The assembled image already takes the budget; keep the bands that feed it small.
+    for top, pix in iter_bands(page, zoom, max(width, budget // ASSEMBLY_BAND_DIVISOR), gray=gray):
+        image.paste(pixmap_to_image(pix), (0, top))
+    return image
+
+
+def write_png_bands(path: Path, size: Tuple[int, int], bands: Iterable[Tuple[int, fitz.Pixmap]]) -> None:
+    # Streams pixmap rows into a PNG (filter type None) so only one band is ever held in memory.
+    width, height = size
+    with open(path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        compressor = zlib.compressobj(6)
+        written = 0
+        for top, pix in bands:
+            if written == 0:
+                color_type = 0 if pix.n == 1 else 2
+                _png_chunk(f, b"IHDR", struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0))
+            samples, stride = pix.samples_mv, pix.stride
+            # Rows already written by an overlapping band are skipped.
+            first, last = max(0, written - top), min(pix.height, height - top)
+            chunks = []
+            for i in range(first, last):
+                chunks.append(compressor.compress(b"\x00"))
+                chunks.append(compressor.compress(samples[i * stride : (i + 1) * stride]))
+            data = b"".join(chunks)
+            if data:
+                _png_chunk(f, b"IDAT", data)
+            written = max(written, top + last)
+        _png_chunk(f, b"IDAT", compressor.flush())
+        _png_chunk(f, b"IEND", b"")
+
+
+def _png_chunk(f, kind: bytes, data: bytes) -> None:
+    f.write(struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data)))
+
+
+def render_stats() -> RenderStats:
+    with _stats_lock:
+        return replace(_stats)
+
+
+def reset_render_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = RenderStats()
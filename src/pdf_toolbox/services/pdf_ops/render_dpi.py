@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+import fitz
+
+AUTO_DPI = "auto"
+DEFAULT_MIN_DPI = 72
+DEFAULT_MAX_DPI = 600
+
+# An image is a page's dominant image when it covers at least this share of the page.
+DOMINANT_COVERAGE = 0.5
+
+
+@dataclass(frozen=True)
+class DpiPolicy:
+    # dpi is None in auto mode: each page renders at the resolution of its dominant image, clamped to
+    # [min_dpi, max_dpi], and pages without one use fallback.
+    dpi: Optional[int]
+    fallback: int
+    min_dpi: int = DEFAULT_MIN_DPI
+    max_dpi: int = DEFAULT_MAX_DPI
+
+    @property
+    def auto(self) -> bool:
+        return self.dpi is None
+
+    def page_dpi(self, page: fitz.Page) -> int:
+        if self.dpi is not None:
+            return self.dpi
+        native = native_dpi(page)
+        return self.clamp(native if native is not None else self.fallback)
+
+    def clamp(self, dpi: float) -> int:
+        return int(min(self.max_dpi, max(self.min_dpi, round(dpi))))
+
+    def describe(self) -> str:
+        return str(self.dpi) if self.dpi is not None else f"{AUTO_DPI}({self.min_dpi}-{self.max_dpi})"
+
+
+def dpi_policy(params: Dict[str, Any], default: int) -> DpiPolicy:
+    # "dpi" is a number or "auto"; min_dpi and max_dpi only apply to auto.
+    value = params.get("dpi", default)
+    if str(value).strip().lower() != AUTO_DPI:
+        return DpiPolicy(int(value), int(value))
+    min_dpi = int(params.get("min_dpi") or DEFAULT_MIN_DPI)
+    max_dpi = max(min_dpi, int(params.get("max_dpi") or DEFAULT_MAX_DPI))
+    return DpiPolicy(None, default, min_dpi, max_dpi)
+
+
+def dominant_image(page: fitz.Page, xrefs: bool = False) -> Optional[Dict[str, Any]]:
+    # Image bboxes are reported in unrotated page space.
+    page_rect = page.rect * page.derotation_matrix
+    best, best_area = None, DOMINANT_COVERAGE * abs(page_rect)
+    for info in page.get_image_info(xrefs=xrefs):
+        area = abs(fitz.Rect(info["bbox"]) & page_rect)
+        if area >= best_area:
+            best, best_area = info, area
+    return best
+
+
+def native_dpi(page: fitz.Page) -> Optional[float]:
+    info = dominant_image(page)
+    if info is None:
+        return None
+    # The transform maps the unit square onto the page, so its column lengths are the displayed size in points.
+    a, b, c, d, _, _ = info["transform"]
+    shown_width, shown_height = math.hypot(a, b), math.hypot(c, d)
+    if not shown_width or not shown_height:
+        return None
+    return max(info["width"] / shown_width, info["height"] / shown_height) * 72
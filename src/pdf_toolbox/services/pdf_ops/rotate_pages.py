@@ -1,48 +1,74 @@
 ﻿from __future__ import annotations
 
+from typing import Any, Dict, List, Optional
+
 import pikepdf
 
 from pdf_toolbox.core.models import JobResult, JobSpec
 from pdf_toolbox.i18n import t
 from pdf_toolbox.core.range_parser import parse_page_range
 from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.incremental import save_incremental
 
 
 class RotatePagesOperation(PdfOperation):
     tool_id = "rotate_pages"
     display_name = "Rotate Pages"
+    in_memory = True
+    output_suffix = "_rotated"
+
+    def can_apply(self, params: Dict[str, Any]) -> bool:
+        return not params.get("incremental", False)
+
+    def apply(self, pdf, params: Dict[str, Any], progress_cb: ProgressCb, token):
+        return pdf if _rotate(pdf, params, progress_cb, token) is not None else None
 
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
-        ranges = spec.params.get("ranges", "")
-        angle = int(spec.params.get("angle", 90))
+        incremental = bool(spec.params.get("incremental", False))
         outputs = []
+        warnings = []
         total_inputs = len(spec.inputs)
 
         for idx, src in enumerate(spec.inputs, start=1):
             with pikepdf.open(src) as pdf:
-                total_pages = len(pdf.pages)
-                rotate_indices = set(parse_page_range(ranges, total_pages))
-
-                for i, page in enumerate(pdf.pages):
-                    if token.is_cancelled():
-                        return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                    if i in rotate_indices:
-                        page.rotate(angle, True)
-                    progress_cb("processing", i + 1, total_pages, t("progress_process_page", page=i + 1))
+                rotated = _rotate(pdf, spec.params, progress_cb, token)
+                if rotated is None:
+                    return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
 
                 name_index = idx if spec.output_name and total_inputs > 1 else None
                 out_path = self._output_path(
                     src,
                     spec.output_dir,
-                    "_rotated",
+                    self.output_suffix,
                     spec.output_name,
                     ext=".pdf",
                     index=name_index,
                     overwrite=spec.overwrite,
                 )
-                pdf.save(out_path)
+                if not incremental:
+                    pdf.save(out_path)
+                elif not save_incremental(pdf, src, out_path, rotated):
+                    warnings.append(t("warn_incremental_fallback", name=src.name))
                 outputs.append(out_path)
 
-        return JobResult(success=True, outputs=outputs)
+        return JobResult(success=True, outputs=outputs, warning="; ".join(warnings) or None)
+
 
+def _rotate(
+    pdf: pikepdf.Pdf, params: Dict[str, Any], progress_cb: ProgressCb, token
+) -> Optional[List[pikepdf.Object]]:
+    # Rotates in place and returns the page objects that changed, or None when cancelled.
+    angle = int(params.get("angle", 90))
+    pages = list(pdf.pages)
+    total_pages = len(pages)
+    rotate_indices = set(parse_page_range(params.get("ranges", ""), total_pages))
+    rotated = []
 
+    for i, page in enumerate(pages):
+        if token.is_cancelled():
+            return None
+        if i in rotate_indices:
+            page.rotate(angle, relative=True)
+            rotated.append(page.obj)
+        progress_cb("processing", i + 1, total_pages, t("progress_process_page", page=i + 1))
+    return rotated
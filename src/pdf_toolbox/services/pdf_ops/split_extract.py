@@ -1,11 +1,36 @@
 ﻿from __future__ import annotations
 
+import math
+import multiprocessing
+from bisect import bisect_right
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple
+
 import pikepdf
 
 from pdf_toolbox.core.models import JobResult, JobSpec
+from pdf_toolbox.core.process_pool import cpu_share
 from pdf_toolbox.i18n import t
 from pdf_toolbox.core.range_parser import parse_page_range
 from pdf_toolbox.services.pdf_ops.base import PdfOperation, ProgressCb
+from pdf_toolbox.services.pdf_ops.outline import top_level_starts
+from pdf_toolbox.services.pdf_ops.page_list import append_pages
+
+SPLIT_MODES = ("split_many", "every_n", "bookmarks", "max_size")
+PARALLEL_MIN_OUTPUTS = 16
+MAX_BATCH = 32
+DEFAULT_MAX_SIZE_MB = 10.0
+# Serialized cost beyond an object's own dictionary/stream bytes: the output's fixed structure (header, catalog,
+# trailer), per object "N 0 obj ... endobj" framing plus its xref entry, stream keywords, and per page the /Kids
+# entry and /Parent reference added by the page tree. Measured against qpdf output and rounded up.
+FILE_OVERHEAD = 1024
+OBJECT_OVERHEAD = 48
+STREAM_OVERHEAD = 20
+PAGE_OVERHEAD = 24
+
+ObjGen = Tuple[int, int]
+Plan = List[Tuple[List[int], str]]
 
 
 class SplitExtractOperation(PdfOperation):
@@ -14,45 +39,218 @@ class SplitExtractOperation(PdfOperation):
 
     def run(self, spec: JobSpec, progress_cb: ProgressCb, token) -> JobResult:
         mode = spec.params.get("mode", "extract_one")
+        if mode in SPLIT_MODES:
+            return self._split(spec, mode, progress_cb, token)
         ranges = spec.params.get("ranges", "")
         outputs = []
 
         total_files = len(spec.inputs)
         for file_index, src in enumerate(spec.inputs, start=1):
+            with pikepdf.open(src) as pdf:
+                # pikepdf page indexing walks the page list, so look pages up in a snapshot instead.
+                pages = list(pdf.pages)
+                indices = parse_page_range(ranges, len(pages))
+
+                out_pdf = pikepdf.Pdf.new()
+                for idx, page_index in enumerate(indices, start=1):
+                    if token.is_cancelled():
+                        return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+                    append_pages(out_pdf, [pages[page_index]])
+                    progress_cb("processing", idx, len(indices), t("progress_extract_page", page=page_index + 1))
+                suffix = f"_extract" if total_files == 1 else f"_extract_{file_index}"
+                out_path = self._output_path(
+                    src, spec.output_dir, suffix, spec.output_name, ext=".pdf", overwrite=spec.overwrite
+                )
+                out_pdf.save(out_path)
+                outputs.append(out_path)
+
+        return JobResult(success=True, outputs=outputs)
+
+    def _split(self, spec: JobSpec, mode: str, progress_cb: ProgressCb, token) -> JobResult:
+        ranges = spec.params.get("ranges", "")
+        workers = int(spec.params.get("split_workers") or cpu_share())
+        outputs: List[Path] = []
+        warnings: List[str] = []
+
+        for src in spec.inputs:
+            # Planning only reads page dictionaries; the outputs are written from a fresh open per worker.
             with pikepdf.open(src) as pdf:
                 total_pages = len(pdf.pages)
-                indices = parse_page_range(ranges, total_pages)
-
-                if mode == "split_many":
-                    total = len(indices)
-                    for i, page_index in enumerate(indices, start=1):
-                        if token.is_cancelled():
-                            return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                        out_pdf = pikepdf.Pdf.new()
-                        out_pdf.pages.append(pdf.pages[page_index])
-                        out_path = self._output_path(
-                            src,
-                            spec.output_dir,
-                            f"_p{page_index + 1}",
-                            None,
-                            ext=".pdf",
-                            overwrite=spec.overwrite,
-                        )
-                        out_pdf.save(out_path)
-                        outputs.append(out_path)
-                        progress_cb("processing", i, total, t("progress_split_page", page=page_index + 1))
+                if ranges or mode == "split_many":
+                    indices = parse_page_range(ranges, total_pages)
                 else:
-                    out_pdf = pikepdf.Pdf.new()
-                    for idx, page_index in enumerate(indices, start=1):
-                        if token.is_cancelled():
-                            return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
-                        out_pdf.pages.append(pdf.pages[page_index])
-                        progress_cb("processing", idx, len(indices), t("progress_extract_page", page=page_index + 1))
-                    suffix = f"_extract" if total_files == 1 else f"_extract_{file_index}"
-                    out_path = self._output_path(
-                        src, spec.output_dir, suffix, spec.output_name, ext=".pdf", overwrite=spec.overwrite
-                    )
-                    out_pdf.save(out_path)
-                    outputs.append(out_path)
+                    indices = list(range(total_pages))
+                plan, warning = _plan(pdf, mode, indices, spec.params)
+            if warning:
+                warnings.append(warning)
+            groups = [
+                (pages, self._output_path(src, spec.output_dir, suffix, None, ext=".pdf", overwrite=spec.overwrite))
+                for pages, suffix in plan
+            ]
+            written = 0
 
-        return JobResult(success=True, outputs=outputs)
+            def on_written(path: Path) -> None:
+                nonlocal written
+                written += 1
+                progress_cb("processing", written, len(groups), t("progress_split_file", name=path.name))
+
+            if not write_groups(src, groups, token, on_written, workers):
+                return JobResult(success=False, cancelled=True, error=t("err_cancelled"))
+            outputs.extend(path for _, path in groups)
+
+        return JobResult(success=True, outputs=outputs, warning="; ".join(warnings) or None)
+
+
+def _plan(pdf: pikepdf.Pdf, mode: str, indices: List[int], params: dict) -> Tuple[Plan, Optional[str]]:
+    if mode == "split_many":
+        return [([i], f"_p{i + 1}") for i in indices], None
+    if mode == "every_n":
+        n = max(1, int(params.get("pages_per_file") or 1))
+        return [_range_group(indices[i : i + n]) for i in range(0, len(indices), n)], None
+    if mode == "bookmarks":
+        return _bookmark_groups(pdf, indices)
+    limit = int(float(params.get("max_size_mb") or DEFAULT_MAX_SIZE_MB) * 1048576)
+    return _size_groups(pdf, indices, limit)
+
+
+def _range_group(pages: List[int]) -> Tuple[List[int], str]:
+    first, last = pages[0] + 1, pages[-1] + 1
+    return pages, f"_p{first}" if first == last else f"_p{first}-{last}"
+
+
+def _bookmark_groups(pdf: pikepdf.Pdf, indices: List[int]) -> Tuple[Plan, Optional[str]]:
+    titles: Dict[int, str] = {}
+    for page, title in top_level_starts(pdf):
+        titles.setdefault(page, title)
+    if not titles:
+        return ([_range_group(indices)] if indices else []), t("warn_split_no_bookmarks")
+    starts = sorted(titles)
+    # Pages before the first bookmark form their own part (key -1); the selection order is kept inside each part.
+    parts: Dict[int, List[int]] = {}
+    for i in indices:
+        parts.setdefault(bisect_right(starts, i) - 1, []).append(i)
+    plan: Plan = []
+    for key in sorted(parts):
+        if key < 0:
+            plan.append(_range_group(parts[key]))
+        else:
+            title = " ".join(titles[starts[key]].split())[:60] or "bookmark"
+            plan.append((parts[key], f"_{key + 1:02d}_{title}"))
+    return plan, None
+
+
+def _size_groups(pdf: pikepdf.Pdf, indices: List[int], limit: int) -> Tuple[Plan, Optional[str]]:
+    # Greedy packing on estimated sizes: a page only adds the objects its part does not already contain, so
+    # shared fonts and images are counted once per output instead of being measured by trial saves.
+    costs: Dict[ObjGen, int] = {}
+    plan: Plan = []
+    current: List[int] = []
+    seen: Set[ObjGen] = set()
+    size = FILE_OVERHEAD
+    oversize = 0
+    pages = list(pdf.pages)
+    for i in indices:
+        objects = _page_objects(pages[i].obj, costs)
+        extra = PAGE_OVERHEAD + sum(costs[o] for o in objects - seen)
+        if current and size + extra > limit:
+            plan.append(_range_group(current))
+            current, seen, size = [], set(), FILE_OVERHEAD
+            extra = PAGE_OVERHEAD + sum(costs[o] for o in objects)
+        if not current and size + extra > limit:
+            oversize += 1
+        current.append(i)
+        seen |= objects
+        size += extra
+    if current:
+        plan.append(_range_group(current))
+    return plan, (t("warn_split_oversize", count=oversize) if oversize else None)
+
+
+def _page_objects(page: pikepdf.Object, costs: Dict[ObjGen, int]) -> Set[ObjGen]:
+    found: Set[ObjGen] = set()
+    stack = [page]
+    while stack:
+        value = stack.pop()
+        if not isinstance(value, pikepdf.Object):
+            continue
+        if value.is_indirect:
+            objgen = value.objgen
+            if objgen in found:
+                continue
+            # Other pages reached through link annotations are not copied along with this one.
+            if objgen != page.objgen and isinstance(value, pikepdf.Dictionary) and value.get("/Type") == "/Page":
+                continue
+            found.add(objgen)
+            if objgen not in costs:
+                costs[objgen] = _object_cost(value)
+        if isinstance(value, pikepdf.Array):
+            stack.extend(value)
+        elif isinstance(value, (pikepdf.Dictionary, pikepdf.Stream)):
+            stack.extend(value.get(key) for key in value.keys() if key != "/Parent")
+    return found
+
+
+def _object_cost(obj: pikepdf.Object) -> int:
+    if isinstance(obj, pikepdf.Stream):
+        length = obj.get("/Length")
+        raw = int(length) if isinstance(length, int) else len(obj.read_raw_bytes())
+        return raw + len(obj.stream_dict.unparse(resolved=True)) + OBJECT_OVERHEAD + STREAM_OVERHEAD
+    return len(obj.unparse(resolved=True)) + OBJECT_OVERHEAD
+
+
+def write_groups(
+    src: Path,
+    groups: Sequence[Tuple[List[int], Path]],
+    token,
+    on_written: Callable[[Path], None],
+    workers: int = 1,
+) -> bool:
+    if workers <= 1 or len(groups) < PARALLEL_MIN_OUTPUTS:
+        return _write_batch(src, groups, token, on_written)
+    # Contiguous batches keep each worker reading one region of the source; batches stay small so that
+    # cancellation and progress are not held up by a single long task.
+    size = max(1, min(MAX_BATCH, math.ceil(len(groups) / (workers * 4))))
+    batches = [list(groups[i : i + size]) for i in range(0, len(groups), size)]
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(batches)), mp_context=ctx) as executor:
+        pending: Dict[Future, List[Tuple[List[int], Path]]] = {
+            executor.submit(_write_chunk, str(src), [(pages, str(path)) for pages, path in batch]): batch
+            for batch in batches
+        }
+        try:
+            while pending:
+                if token.is_cancelled():
+                    return False
+                finished, _ = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    batch = pending.pop(future)
+                    future.result()
+                    for _, path in batch:
+                        on_written(path)
+            return True
+        finally:
+            for future in pending:
+                future.cancel()
+
+
+def _write_chunk(src: str, groups: List[Tuple[List[int], str]]) -> None:
+    _write_batch(Path(src), [(pages, Path(path)) for pages, path in groups], None, _ignore)
+
+
+def _write_batch(
+    src: Path, groups: Sequence[Tuple[List[int], Path]], token, on_written: Callable[[Path], None]
+) -> bool:
+    with pikepdf.open(src) as pdf:
+        src_pages = list(pdf.pages)
+        for pages, out_path in groups:
+            if token is not None and token.is_cancelled():
+                return False
+            with pikepdf.Pdf.new() as out_pdf:
+                append_pages(out_pdf, [src_pages[i] for i in pages])
+                out_pdf.save(out_path)
+            on_written(out_path)
+    return True
+
+
+def _ignore(_path: Path) -> None:
+    return None
@@ -1,6 +1,8 @@
 ﻿from __future__ import annotations
 
-from PySide6.QtCore import QSize, Qt
+import threading
+
+from PySide6.QtCore import QSize, Qt, QTimer, Signal
 from PySide6.QtGui import QIcon, QPixmap
 from PySide6.QtWidgets import (
     QGridLayout,
@@ -15,26 +17,32 @@ from PySide6.QtWidgets import (
 )
 
 from pdf_toolbox.core.job_queue import JobQueue
-from pdf_toolbox.config import BASE_DIR
+from pdf_toolbox.config import BASE_DIR, DEFAULT_OUTPUT_DIR, ensure_dir
 from pdf_toolbox.i18n import get_language, set_language, t
+from pdf_toolbox.ui.tools_panels.base import ToolPanel
 from pdf_toolbox.ui.tools_panels.compress_panel import CompressPanel
 from pdf_toolbox.ui.tools_panels.convert_panels import ImagesToPdfPanel, PdfToImagesPanel, PptToPdfPanel
 from pdf_toolbox.ui.tools_panels.delete_rotate_panel import DeleteRotatePanel
 from pdf_toolbox.ui.tools_panels.merge_panel import MergePanel
 from pdf_toolbox.ui.tools_panels.ocr_panel import OcrPanel
+from pdf_toolbox.ui.tools_panels.page_edit_panel import PageEditPanel
 from pdf_toolbox.ui.tools_panels.reorder_panel import ReorderPanel
 from pdf_toolbox.ui.tools_panels.split_panel import SplitPanel
 from pdf_toolbox.ui.widgets.progress_list import ProgressList
 from pdf_toolbox.services.io.validators import ValidationError
+from pdf_toolbox.services.pdf_ops import preload_operations
 
 
 class MainWindow(QMainWindow):
+    first_paint = Signal()
+
     def __init__(self) -> None:
         super().__init__()
         self.setWindowTitle(t("window_title"))
         self.resize(740, 480)
 
         self._init_menu()
+        self._first_painted = False
 
         self.queue = JobQueue()
         self.queue.progress.connect(self._on_progress)
@@ -43,28 +51,25 @@ class MainWindow(QMainWindow):
         self.stack = QStackedWidget()
         self.progress_list = ProgressList()
 
-        self._panels = [
-            MergePanel(),
-            SplitPanel(),
-            DeleteRotatePanel(),
-            ReorderPanel(),
-            CompressPanel(),
-            PdfToImagesPanel(),
-            ImagesToPdfPanel(),
-            PptToPdfPanel(),
-            OcrPanel(),
+        # Panels are built on first open; the home grid only needs each class's tool_id and title_key.
+        self._panel_types: list[type[ToolPanel]] = [
+            MergePanel,
+            SplitPanel,
+            DeleteRotatePanel,
+            ReorderPanel,
+            PageEditPanel,
+            CompressPanel,
+            PdfToImagesPanel,
+            ImagesToPdfPanel,
+            PptToPdfPanel,
+            OcrPanel,
         ]
-        self._panel_index: dict[object, int] = {}
+        self._panels: dict[type[ToolPanel], ToolPanel] = {}
         self._panel_buttons: list[QPushButton] = []
 
         self.home_page = self._build_home()
         self.stack.addWidget(self.home_page)
 
-        for panel in self._panels:
-            self.stack.addWidget(panel)
-            self._panel_index[panel] = self.stack.indexOf(panel)
-            panel.run_btn.clicked.connect(lambda _, p=panel: self._submit(p))
-
         main_layout = QVBoxLayout()
         main_layout.setContentsMargins(8, 8, 8, 8)
         main_layout.setSpacing(6)
@@ -93,6 +98,21 @@ class MainWindow(QMainWindow):
         self._show_home()
         self._apply_language()
 
+    def closeEvent(self, event) -> None:  # noqa: N802
+        self.queue.shutdown()
+        super().closeEvent(event)
+
+    def paintEvent(self, event) -> None:  # noqa: N802
+        super().paintEvent(event)
+        if not self._first_painted:
+            self._first_painted = True
+            self.first_paint.emit()
+            # Next event-loop turn, so the first frame is already on screen when the heavy imports start.
+            QTimer.singleShot(0, self._start_preload)
+
+    def _start_preload(self) -> None:
+        threading.Thread(target=preload_operations, name="preload-operations", daemon=True).start()
+
     def _init_menu(self) -> None:
         menubar = self.menuBar()
         self.help_menu = menubar.addMenu(t("menu_help"))
@@ -129,12 +149,12 @@ class MainWindow(QMainWindow):
         grid.setHorizontalSpacing(8)
         grid.setVerticalSpacing(6)
 
-        for panel in self._panels:
-            btn = QPushButton(panel.title)
+        for panel_type in self._panel_types:
+            btn = QPushButton(t(panel_type.title_key))
             btn.setMinimumHeight(36)
-            btn.setIcon(_panel_icon(panel))
+            btn.setIcon(_panel_icon(panel_type))
             btn.setIconSize(QSize(16, 16))
-            btn.clicked.connect(lambda _, p=panel: self._open_panel(p))
+            btn.clicked.connect(lambda _, p=panel_type: self._open_panel(p))
             self._panel_buttons.append(btn)
 
         cols = 4
@@ -147,11 +167,15 @@ class MainWindow(QMainWindow):
         layout.addSpacing(4)
         return root
 
-    def _open_panel(self, panel) -> None:
-        index = self._panel_index.get(panel)
-        if index is None:
-            return
-        self.stack.setCurrentIndex(index)
+    def _open_panel(self, panel_type: type[ToolPanel]) -> None:
+        panel = self._panels.get(panel_type)
+        if panel is None:
+            # Built with the current language, so only later switches need apply_language().
+            panel = panel_type()
+            self.stack.addWidget(panel)
+            panel.run_btn.clicked.connect(lambda _, p=panel: self._submit(p))
+            self._panels[panel_type] = panel
+        self.stack.setCurrentWidget(panel)
         self.title_label.setText(panel.title)
         self.home_btn.setEnabled(True)
 
@@ -170,6 +194,8 @@ class MainWindow(QMainWindow):
         except Exception as exc:  # noqa: BLE001
             QMessageBox.warning(self, t("invalid_params_title"), str(exc))
             return
+        if spec.output_dir == DEFAULT_OUTPUT_DIR:
+            ensure_dir(DEFAULT_OUTPUT_DIR)
 
         job_id = self.queue.submit(spec)
         self.progress_list.add_job(job_id, panel.title, self.queue.cancel)
@@ -195,20 +221,18 @@ class MainWindow(QMainWindow):
         self.setWindowTitle(t("window_title"))
         self.home_btn.setText(t("nav_home"))
         self._set_lang_button_text()
-        if self.stack.currentIndex() == 0:
+        current = self.stack.currentWidget()
+        if current is self.home_page:
             self.title_label.setText(t("nav_tools"))
         else:
-            for panel, index in self._panel_index.items():
-                if index == self.stack.currentIndex():
-                    self.title_label.setText(panel.title)
-                    break
+            self.title_label.setText(current.title)
         self.help_menu.setTitle(t("menu_help"))
         self.about_action.setText(t("menu_about"))
         self.home_title_label.setText(t("home_title"))
         self.home_subtitle_label.setText(t("home_subtitle"))
-        for panel, btn in zip(self._panels, self._panel_buttons):
-            btn.setText(panel.title)
-        for panel in self._panels:
+        for panel_type, btn in zip(self._panel_types, self._panel_buttons):
+            btn.setText(t(panel_type.title_key))
+        for panel in self._panels.values():
             panel.apply_language()
         self.progress_list.apply_language()
 
@@ -223,6 +247,8 @@ def _panel_icon(panel) -> QIcon:
         return QIcon.fromTheme("edit-delete")
     if tool_id == "reorder_pages":
         return QIcon.fromTheme("view-sort-ascending")
+    if tool_id == "page_edit":
+        return QIcon.fromTheme("document-edit")
     if tool_id in {"compress", "compress_basic", "compress_images"}:
         return QIcon.fromTheme("folder-compressed")
     if tool_id == "pdf_to_images":
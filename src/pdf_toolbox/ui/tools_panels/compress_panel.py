@@ -34,6 +34,7 @@ class CompressPanel(ToolPanel):
         self.dpi.setRange(72, 600)
         self.dpi.setValue(150)
         self.dpi.setSuffix(" dpi")
+        self.dpi_auto = QCheckBox(t("label_dpi_auto"))
 
         self.quality = QSpinBox()
         self.quality.setRange(30, 95)
@@ -44,6 +45,7 @@ class CompressPanel(ToolPanel):
         self.max_side.setValue(1600)
 
         self.grayscale = QCheckBox(t("label_grayscale"))
+        self.keep_vectors = QCheckBox(t("label_keep_vectors"))
 
         self.output = OutputOptions()
         self.run_btn = QPushButton(t("btn_start_compress"))
@@ -56,21 +58,26 @@ class CompressPanel(ToolPanel):
         layout.addWidget(self.recompress)
         layout.addWidget(self.image_label)
         layout.addWidget(self.dpi)
+        layout.addWidget(self.dpi_auto)
         layout.addWidget(self.quality)
         layout.addWidget(self.max_side)
         layout.addWidget(self.grayscale)
+        layout.addWidget(self.keep_vectors)
         layout.addWidget(self.output)
         layout.addWidget(self.run_btn)
 
         self.mode.currentIndexChanged.connect(self._toggle_fields)
+        self.dpi_auto.toggled.connect(self._toggle_fields)
         self._toggle_fields()
 
     def _toggle_fields(self) -> None:
         is_image = self.mode.currentData() == "compress_images"
-        self.dpi.setEnabled(is_image)
+        self.dpi.setEnabled(is_image and not self.dpi_auto.isChecked())
+        self.dpi_auto.setEnabled(is_image)
         self.quality.setEnabled(is_image)
         self.max_side.setEnabled(is_image)
         self.grayscale.setEnabled(is_image)
+        self.keep_vectors.setEnabled(is_image)
         self.linearize.setEnabled(not is_image)
         self.recompress.setEnabled(not is_image)
 
@@ -88,10 +95,11 @@ class CompressPanel(ToolPanel):
             })
         else:
             params.update({
-                "dpi": self.dpi.value(),
+                "dpi": "auto" if self.dpi_auto.isChecked() else self.dpi.value(),
                 "jpeg_quality": self.quality.value(),
                 "max_side": self.max_side.value(),
                 "grayscale": self.grayscale.isChecked(),
+                "mode": "images" if self.keep_vectors.isChecked() else "rasterize",
             })
         return JobSpec(
             tool_id=tool_id,
@@ -109,7 +117,9 @@ class CompressPanel(ToolPanel):
         self.preset.apply_language()
         self.linearize.setText(t("label_linearize"))
         self.recompress.setText(t("label_recompress"))
+        self.dpi_auto.setText(t("label_dpi_auto"))
         self.grayscale.setText(t("label_grayscale"))
+        self.keep_vectors.setText(t("label_keep_vectors"))
         self.image_label.setText(t("label_image_compress_options"))
         self.output.apply_language()
         self.run_btn.setText(t("btn_start_compress"))
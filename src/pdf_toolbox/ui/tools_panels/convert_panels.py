@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from PySide6.QtWidgets import QComboBox, QLabel, QPushButton, QSpinBox, QVBoxLayout
+from PySide6.QtWidgets import QCheckBox, QComboBox, QLabel, QPushButton, QSpinBox, QVBoxLayout
 
 from pdf_toolbox.core.models import JobSpec
 from pdf_toolbox.i18n import t
@@ -23,10 +23,13 @@ class PdfToImagesPanel(ToolPanel):
         self.dpi.setRange(72, 600)
         self.dpi.setValue(150)
         self.dpi.setSuffix(" dpi")
+        self.dpi_auto = QCheckBox(t("label_dpi_auto"))
+        self.dpi_auto.toggled.connect(lambda checked: self.dpi.setEnabled(not checked))
 
         self.format = QComboBox()
         self.format.addItem("PNG", "png")
         self.format.addItem("JPG", "jpg")
+        self.extract = QCheckBox(t("label_extract_images"))
 
         self.output = OutputOptions()
         self.run_btn = QPushButton(t("btn_start_convert"))
@@ -35,7 +38,9 @@ class PdfToImagesPanel(ToolPanel):
         layout.addWidget(self.pdf_inputs)
         layout.addWidget(self.options_label)
         layout.addWidget(self.dpi)
+        layout.addWidget(self.dpi_auto)
         layout.addWidget(self.format)
+        layout.addWidget(self.extract)
         layout.addWidget(self.output)
         layout.addWidget(self.run_btn)
 
@@ -45,7 +50,11 @@ class PdfToImagesPanel(ToolPanel):
             inputs=self.pdf_inputs.paths(),
             output_dir=self.output.output_dir_path(),
             output_name=self.output.output_name_text(),
-            params={"dpi": self.dpi.value(), "format": self.format.currentData()},
+            params={
+                "dpi": "auto" if self.dpi_auto.isChecked() else self.dpi.value(),
+                "format": self.format.currentData(),
+                "mode": "extract" if self.extract.isChecked() else "render",
+            },
             overwrite=self.output.overwrite_checked(),
         )
 
@@ -53,6 +62,8 @@ class PdfToImagesPanel(ToolPanel):
         self.pdf_inputs.apply_language()
         self.output.apply_language()
         self.options_label.setText(t("label_pdf_to_images_options"))
+        self.dpi_auto.setText(t("label_dpi_auto"))
+        self.extract.setText(t("label_extract_images"))
         self.run_btn.setText(t("btn_start_convert"))
 
 
@@ -1,6 +1,6 @@
 ﻿from __future__ import annotations
 
-from PySide6.QtWidgets import QVBoxLayout, QComboBox, QPushButton
+from PySide6.QtWidgets import QVBoxLayout, QCheckBox, QComboBox, QPushButton
 
 from pdf_toolbox.core.models import JobSpec
 from pdf_toolbox.ui.tools_panels.base import ToolPanel
@@ -30,6 +30,8 @@ class DeleteRotatePanel(ToolPanel):
         self.angle.addItem("180°", 180)
         self.angle.addItem("270°", 270)
 
+        self.incremental = QCheckBox(t("label_incremental_save"))
+
         self.output = OutputOptions()
         self.run_btn = QPushButton(t("btn_start_execute"))
 
@@ -37,6 +39,7 @@ class DeleteRotatePanel(ToolPanel):
         layout.addWidget(self.range_input)
         layout.addWidget(self.action)
         layout.addWidget(self.angle)
+        layout.addWidget(self.incremental)
         layout.addWidget(self.output)
         layout.addWidget(self.run_btn)
 
@@ -45,12 +48,13 @@ class DeleteRotatePanel(ToolPanel):
         self.range_input.apply_language()
         self.action.setItemText(0, t("option_delete_pages"))
         self.action.setItemText(1, t("option_rotate_pages"))
+        self.incremental.setText(t("label_incremental_save"))
         self.output.apply_language()
         self.run_btn.setText(t("btn_start_execute"))
 
     def build_spec(self) -> JobSpec:
         tool_id = self.action.currentData()
-        params = {"ranges": self.range_input.text()}
+        params = {"ranges": self.range_input.text(), "incremental": self.incremental.isChecked()}
         if tool_id == "rotate_pages":
             params["angle"] = self.angle.currentData()
         return JobSpec(
@@ -19,17 +19,20 @@ class MergePanel(ToolPanel):
 
         self.inputs = FilePicker("label_input_pdf", mode="files", filter_text="PDF Files (*.pdf)")
         self.keep_bookmarks = QCheckBox(t("label_keep_bookmarks"))
+        self.dedup = QCheckBox(t("label_merge_dedup"))
         self.output = OutputOptions()
         self.run_btn = QPushButton(t("btn_start_merge"))
 
         layout.addWidget(self.inputs)
         layout.addWidget(self.keep_bookmarks)
+        layout.addWidget(self.dedup)
         layout.addWidget(self.output)
         layout.addWidget(self.run_btn)
 
     def apply_language(self) -> None:
         self.inputs.apply_language()
         self.keep_bookmarks.setText(t("label_keep_bookmarks"))
+        self.dedup.setText(t("label_merge_dedup"))
         self.output.apply_language()
         self.run_btn.setText(t("btn_start_merge"))
 
@@ -39,7 +42,7 @@ class MergePanel(ToolPanel):
             inputs=self.inputs.paths(),
             output_dir=self.output.output_dir_path(),
             output_name=self.output.output_name_text(),
-            params={"keep_bookmarks": self.keep_bookmarks.isChecked()},
+            params={"keep_bookmarks": self.keep_bookmarks.isChecked(), "dedup": self.dedup.isChecked()},
             overwrite=self.output.overwrite_checked(),
         )
 
@@ -1,9 +1,11 @@
 from __future__ import annotations
 
+from PySide6.QtCore import Qt
 from PySide6.QtWidgets import QCheckBox, QHBoxLayout, QLabel, QLineEdit, QPushButton, QSpinBox, QVBoxLayout
 
 from pdf_toolbox.core.models import JobSpec
 from pdf_toolbox.i18n import t
+from pdf_toolbox.services.io.ocr_cache import OcrCache, cache_usage, default_cache_root
 from pdf_toolbox.ui.tools_panels.base import ToolPanel
 from pdf_toolbox.ui.widgets.file_picker import FilePicker
 from pdf_toolbox.ui.widgets.output_options import OutputOptions
@@ -27,6 +29,9 @@ class OcrPanel(ToolPanel):
         self.dpi.setRange(100, 600)
         self.dpi.setValue(300)
         opt_row.addWidget(self.dpi)
+        self.dpi_auto = QCheckBox(t("label_dpi_auto"))
+        self.dpi_auto.toggled.connect(lambda checked: self.dpi.setEnabled(not checked))
+        opt_row.addWidget(self.dpi_auto)
 
         self.lang_label = QLabel(t("label_language"))
         opt_row.addWidget(self.lang_label)
@@ -38,12 +43,29 @@ class OcrPanel(ToolPanel):
         self.out_pdf.setChecked(True)
         self.out_docx = QCheckBox(t("label_output_word"))
         self.out_docx.setChecked(True)
+        self.smart = QCheckBox(t("label_ocr_smart"))
+        self.sandwich = QCheckBox(t("label_ocr_sandwich"))
+        self.sandwich.setChecked(True)
+
+        cache_row = QHBoxLayout()
+        self.use_cache = QCheckBox(t("label_ocr_use_cache"))
+        self.use_cache.setChecked(True)
+        cache_row.addWidget(self.use_cache)
+        self.cache_info = QLabel()
+        self.cache_info.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        cache_row.addWidget(self.cache_info, 1)
+        self.clear_cache_btn = QPushButton(t("btn_clear_ocr_cache"))
+        self.clear_cache_btn.clicked.connect(self._clear_cache)
+        cache_row.addWidget(self.clear_cache_btn)
         self.run_btn = QPushButton(t("btn_start_ocr"))
 
         layout.addWidget(self.inputs)
         layout.addLayout(opt_row)
         layout.addWidget(self.out_pdf)
         layout.addWidget(self.out_docx)
+        layout.addWidget(self.smart)
+        layout.addWidget(self.sandwich)
+        layout.addLayout(cache_row)
         layout.addWidget(self.output)
         layout.addWidget(self.run_btn)
 
@@ -54,10 +76,13 @@ class OcrPanel(ToolPanel):
             output_dir=self.output.output_dir_path(),
             output_name=self.output.output_name_text(),
             params={
-                "dpi": self.dpi.value(),
+                "dpi": "auto" if self.dpi_auto.isChecked() else self.dpi.value(),
                 "lang": self.lang.text().strip() or "chi_sim+eng",
                 "output_pdf": self.out_pdf.isChecked(),
                 "output_docx": self.out_docx.isChecked(),
+                "smart": self.smart.isChecked(),
+                "sandwich": self.sandwich.isChecked(),
+                "use_cache": self.use_cache.isChecked(),
             },
             overwrite=self.output.overwrite_checked(),
         )
@@ -66,7 +91,26 @@ class OcrPanel(ToolPanel):
         self.inputs.apply_language()
         self.output.apply_language()
         self.dpi_label.setText(t("label_dpi"))
+        self.dpi_auto.setText(t("label_dpi_auto"))
         self.lang_label.setText(t("label_language"))
         self.out_pdf.setText(t("label_output_searchable_pdf"))
         self.out_docx.setText(t("label_output_word"))
+        self.smart.setText(t("label_ocr_smart"))
+        self.sandwich.setText(t("label_ocr_sandwich"))
+        self.use_cache.setText(t("label_ocr_use_cache"))
+        self.clear_cache_btn.setText(t("btn_clear_ocr_cache"))
+        self._update_cache_info()
         self.run_btn.setText(t("btn_start_ocr"))
+
+    def showEvent(self, event) -> None:
+        # OCR jobs fill the cache in worker processes; refresh the size whenever the panel comes back.
+        self._update_cache_info()
+        super().showEvent(event)
+
+    def _update_cache_info(self) -> None:
+        size = f"{cache_usage() / (1024 * 1024):.1f}"
+        self.cache_info.setText(t("label_ocr_cache_info", path=default_cache_root(), size=size))
+
+    def _clear_cache(self) -> None:
+        OcrCache().clear()
+        self._update_cache_info()
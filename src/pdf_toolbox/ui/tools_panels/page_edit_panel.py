@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+from PySide6.QtWidgets import QLabel, QPlainTextEdit, QPushButton, QVBoxLayout
+
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.core.page_script import page_edits_from_param
+from pdf_toolbox.ui.tools_panels.base import ToolPanel
+from pdf_toolbox.ui.widgets.file_picker import FilePicker
+from pdf_toolbox.ui.widgets.output_options import OutputOptions
+from pdf_toolbox.i18n import t
+
+
+class PageEditPanel(ToolPanel):
+    tool_id = "page_edit"
+    title_key = "panel_page_edit"
+
+    def __init__(self) -> None:
+        super().__init__()
+        layout = QVBoxLayout(self)
+
+        self.input_pdf = FilePicker("label_input_pdf", mode="files", filter_text="PDF Files (*.pdf)")
+        self.script_label = QLabel(t("label_page_script"))
+        self.script = QPlainTextEdit()
+        self.script.setPlaceholderText(t("placeholder_page_script"))
+        self.tip_label = QLabel(t("label_tip_page_script"))
+        self.tip_label.setWordWrap(True)
+        self.output = OutputOptions()
+        self.run_btn = QPushButton(t("btn_start_page_edit"))
+
+        layout.addWidget(self.input_pdf)
+        layout.addWidget(self.script_label)
+        layout.addWidget(self.script, 1)
+        layout.addWidget(self.tip_label)
+        layout.addWidget(self.output)
+        layout.addWidget(self.run_btn)
+
+    def build_spec(self) -> JobSpec:
+        script = self.script.toPlainText()
+        # Syntax errors are reported before the job is queued; page numbers are checked per input when it runs.
+        page_edits_from_param(script)
+        return JobSpec(
+            tool_id=self.tool_id,
+            inputs=self.input_pdf.paths(),
+            output_dir=self.output.output_dir_path(),
+            output_name=self.output.output_name_text(),
+            params={"edits": script},
+            overwrite=self.output.overwrite_checked(),
+        )
+
+    def apply_language(self) -> None:
+        self.input_pdf.apply_language()
+        self.script_label.setText(t("label_page_script"))
+        self.script.setPlaceholderText(t("placeholder_page_script"))
+        self.tip_label.setText(t("label_tip_page_script"))
+        self.output.apply_language()
+        self.run_btn.setText(t("btn_start_page_edit"))
@@ -1,6 +1,6 @@
 ﻿from __future__ import annotations
 
-from PySide6.QtWidgets import QVBoxLayout, QComboBox, QPushButton
+from PySide6.QtWidgets import QVBoxLayout, QComboBox, QDoubleSpinBox, QPushButton, QSpinBox
 
 from pdf_toolbox.core.models import JobSpec
 from pdf_toolbox.ui.tools_panels.base import ToolPanel
@@ -23,6 +23,20 @@ class SplitPanel(ToolPanel):
         self.mode = QComboBox()
         self.mode.addItem(t("option_extract_one_pdf"), "extract_one")
         self.mode.addItem(t("option_split_many_pdf"), "split_many")
+        self.mode.addItem(t("option_split_every_n"), "every_n")
+        self.mode.addItem(t("option_split_bookmarks"), "bookmarks")
+        self.mode.addItem(t("option_split_max_size"), "max_size")
+
+        self.pages_per_file = QSpinBox()
+        self.pages_per_file.setRange(1, 10000)
+        self.pages_per_file.setValue(10)
+        self.pages_per_file.setPrefix(t("label_pages_per_file") + ": ")
+
+        self.max_size = QDoubleSpinBox()
+        self.max_size.setRange(0.1, 10000.0)
+        self.max_size.setValue(10.0)
+        self.max_size.setSuffix(" MB")
+        self.max_size.setPrefix(t("label_max_size_mb") + ": ")
 
         self.output = OutputOptions()
         self.run_btn = QPushButton(t("btn_start_split_extract"))
@@ -30,14 +44,29 @@ class SplitPanel(ToolPanel):
         layout.addWidget(self.input_pdf)
         layout.addWidget(self.range_input)
         layout.addWidget(self.mode)
+        layout.addWidget(self.pages_per_file)
+        layout.addWidget(self.max_size)
         layout.addWidget(self.output)
         layout.addWidget(self.run_btn)
 
+        self.mode.currentIndexChanged.connect(self._toggle_fields)
+        self._toggle_fields()
+
+    def _toggle_fields(self) -> None:
+        mode = self.mode.currentData()
+        self.pages_per_file.setVisible(mode == "every_n")
+        self.max_size.setVisible(mode == "max_size")
+
     def apply_language(self) -> None:
         self.input_pdf.apply_language()
         self.range_input.apply_language()
         self.mode.setItemText(0, t("option_extract_one_pdf"))
         self.mode.setItemText(1, t("option_split_many_pdf"))
+        self.mode.setItemText(2, t("option_split_every_n"))
+        self.mode.setItemText(3, t("option_split_bookmarks"))
+        self.mode.setItemText(4, t("option_split_max_size"))
+        self.pages_per_file.setPrefix(t("label_pages_per_file") + ": ")
+        self.max_size.setPrefix(t("label_max_size_mb") + ": ")
         self.output.apply_language()
         self.run_btn.setText(t("btn_start_split_extract"))
 
@@ -47,7 +76,12 @@ class SplitPanel(ToolPanel):
             inputs=self.input_pdf.paths(),
             output_dir=self.output.output_dir_path(),
             output_name=self.output.output_name_text(),
-            params={"ranges": self.range_input.text(), "mode": self.mode.currentData()},
+            params={
+                "ranges": self.range_input.text(),
+                "mode": self.mode.currentData(),
+                "pages_per_file": self.pages_per_file.value(),
+                "max_size_mb": self.max_size.value(),
+            },
             overwrite=self.output.overwrite_checked(),
         )
 
@@ -0,0 +1,54 @@
+from contextlib import contextmanager
+
+import fitz
+import pytest
+from PIL import ImageOps
+
+from pdf_toolbox.services.pdf_ops import ocr
+from pdf_toolbox.services.pdf_ops.ocr_engine import OcrEngine, OcrPageResult
+
+
+class BoxEngine(OcrEngine):
+    # Reads every dark bar as one line whose only word names the bar's width, like a page scanned at 70 dpi.
+    kind = "fake"
+
+    def __init__(self):
+        super().__init__("eng")
+        self.bands = []
+
+    def recognize(self, img, want_pdf, want_text, text_only=False):
+        self.bands.append(img.size)
+        mask = ImageOps.invert(img.convert("L")).point(lambda v: 255 if v > 128 else 0)
+        scale = 72 / 70
+        with fitz.open() as doc:
+            page = doc.new_page(width=img.width * scale, height=img.height * scale)
+            y = 0
+            while y < img.height:
+                box = mask.crop((0, y, img.width, y + 1)).getbbox()
+                if box is None:
+                    y += 1
+                    continue
+                start = y
+                while y < img.height and mask.crop((0, y, img.width, y + 1)).getbbox() is not None:
+                    y += 1
+                height = (y - start) * scale
+                page.insert_text((box[0] * scale, y * scale), f"W{box[2] - box[0]}", fontsize=height)
+            return OcrPageResult(doc.tobytes(), None)
+
+
+@pytest.fixture
+def box_engine():
+    return BoxEngine()
+
+
+@pytest.fixture
+def fake_ocr_engine(monkeypatch, box_engine):
+    # Routes OcrOperation to one BoxEngine instead of Tesseract.
+    class _Pool:
+        @contextmanager
+        def acquire(self, lang, preference=None, tesseract_cmd=None):
+            yield box_engine
+
+    monkeypatch.setattr(ocr, "engine_available", lambda preference: True)
+    monkeypatch.setattr(ocr, "ENGINE_POOL", _Pool())
+    return box_engine
@@ -0,0 +1,105 @@
+import json
+from pathlib import Path
+
+import fitz
+
+from pdf_toolbox.cli import EXIT_FAILED, EXIT_OK, EXIT_USAGE, main
+from pdf_toolbox.core.batch import BatchRunner, load_manifest
+from pdf_toolbox.services.io import ocr_cache
+from pdf_toolbox.services.io.ocr_cache import OcrCache
+
+
+def _make_pdf(path: Path, pages: int = 2) -> Path:
+    doc = fitz.open()
+    for _ in range(pages):
+        doc.new_page(width=100, height=100)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_list_prints_tools(capsys):
+    assert main(["list"]) == EXIT_OK
+    assert "merge" in capsys.readouterr().out
+
+
+def test_run_single_tool(tmp_path, capsys):
+    a = _make_pdf(tmp_path / "a.pdf")
+    b = _make_pdf(tmp_path / "b.pdf", 3)
+
+    code = main(["run", "merge", str(a), str(b), "-o", str(tmp_path / "out"), "-n", "both", "--json"])
+
+    assert code == EXIT_OK
+    record = json.loads(capsys.readouterr().out.strip())
+    assert record["success"] is True
+    assert fitz.open(record["outputs"][0]).page_count == 5
+
+
+def test_single_page_range_param_stays_text(tmp_path, capsys):
+    src = _make_pdf(tmp_path / "a.pdf", 3)
+
+    out = str(tmp_path / "out")
+    code = main(["run", "rotate_pages", str(src), "-o", out, "-p", "ranges=3", "-p", "angle=90", "--json"])
+
+    assert code == EXIT_OK
+    record = json.loads(capsys.readouterr().out.strip())
+    with fitz.open(record["outputs"][0]) as doc:
+        assert [page.rotation for page in doc] == [0, 0, 90]
+
+
+def test_manifest_reports_failures(tmp_path, capsys):
+    _make_pdf(tmp_path / "a.pdf")
+    manifest = tmp_path / "jobs.jsonl"
+    lines = [
+        {"id": "ok", "tool_id": "merge", "inputs": ["a.pdf", "a.pdf"], "output_dir": "out"},
+        {"id": "missing", "tool_id": "merge", "inputs": ["nope.pdf"], "output_dir": "out"},
+    ]
+    manifest.write_text("\n".join(json.dumps(line) for line in lines) + "\n", encoding="utf-8")
+
+    code = main(["batch", str(manifest), "-j", "2", "--backend", "thread", "--json"])
+
+    records = {r["id"]: r for r in map(json.loads, capsys.readouterr().out.splitlines())}
+    assert code == EXIT_FAILED
+    assert records["ok"]["success"] is True
+    assert records["missing"]["success"] is False
+    assert records["ok"]["seconds"] >= 0
+
+
+def test_bad_manifest_is_usage_error(tmp_path, capsys):
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text('{"tool_id": "merge"}\n', encoding="utf-8")
+
+    assert main(["batch", str(manifest)]) == EXIT_USAGE
+    assert "jobs.jsonl:1" in capsys.readouterr().err
+
+
+def test_duplicate_job_id_is_usage_error(tmp_path, capsys):
+    manifest = tmp_path / "jobs.jsonl"
+    line = {"id": "same", "tool_id": "merge", "inputs": ["a.pdf"], "output_dir": "out"}
+    manifest.write_text(f"{json.dumps(line)}\n\n{json.dumps(line)}\n", encoding="utf-8")
+
+    assert main(["batch", str(manifest)]) == EXIT_USAGE
+    err = capsys.readouterr().err
+    assert "jobs.jsonl:3" in err and "'same'" in err
+
+
+def test_batch_runner_cancel_before_start(tmp_path):
+    _make_pdf(tmp_path / "a.pdf")
+    manifest = tmp_path / "jobs.jsonl"
+    manifest.write_text('{"tool_id": "merge", "inputs": ["a.pdf"], "output_dir": "."}\n', encoding="utf-8")
+    runner = BatchRunner(backend="thread")
+    runner.cancel()
+
+    outcomes = runner.run(load_manifest(manifest))
+
+    assert outcomes[0].result.cancelled is True
+
+
+def test_cache_command_shows_and_clears_the_ocr_cache(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(ocr_cache, "DEFAULT_CACHE_DIR", tmp_path)
+    OcrCache().put("aa01", None, "x" * 1024 * 1024)
+
+    assert main(["cache"]) == EXIT_OK
+    assert capsys.readouterr().out.split("\t") == [str(tmp_path / "ocr"), "1.0 MB\n"]
+    assert main(["cache", "--clear"]) == EXIT_OK
+    assert capsys.readouterr().out.endswith("\t0.0 MB\n")
@@ -0,0 +1,107 @@
+import io
+
+import fitz
+import pikepdf
+from PIL import Image
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops.compress_images import CompressImagesOperation
+from pdf_toolbox.services.pdf_ops.image_recompress import image_extents
+
+
+def _png(size, color):
+    buf = io.BytesIO()
+    image = Image.effect_noise(size, 60).convert("RGB")
+    image.paste(color, (0, 0, size[0] // 2, size[1]))
+    image.save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _make_pdf(path):
+    with fitz.open() as doc:
+        page = doc.new_page(width=400, height=400)
+        page.insert_text((20, 30), "vector text stays")
+        # 1200 px across 200 pt is 432 dpi; 100 px across 200 pt is 36 dpi.
+        page.insert_image(fitz.Rect(0, 50, 200, 250), stream=_png((1200, 1200), (200, 30, 30)))
+        page.insert_image(fitz.Rect(200, 50, 400, 250), stream=_png((100, 100), (30, 30, 200)))
+        doc.save(path)
+
+
+def test_image_extents_follow_the_placement_matrix(tmp_path):
+    src = tmp_path / "in.pdf"
+    _make_pdf(src)
+
+    with pikepdf.open(src) as pdf:
+        sizes = {pdf.get_object(objgen).Width: extent for objgen, extent in image_extents(pdf).items()}
+
+    assert sizes.keys() == {1200, 100}
+    assert [round(v) for v in sizes[1200]] == [200, 200]
+
+
+def test_recompress_mode_downsamples_images_and_keeps_text(tmp_path):
+    src = tmp_path / "in.pdf"
+    _make_pdf(src)
+    spec = JobSpec(
+        tool_id="compress_images",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"mode": "images", "dpi": 150, "jpeg_quality": 70, "workers": 2},
+    )
+
+    result = CompressImagesOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success
+    out = result.outputs[0]
+    assert out.stat().st_size < src.stat().st_size / 2
+    with fitz.open(out) as doc:
+        page = doc[0]
+        assert page.get_text().strip() == "vector text stays"
+        widths = sorted(info["width"] for info in page.get_image_info())
+        # The 36 dpi image is below the target and only re-encoded if that makes it smaller.
+        assert widths == [100, 417]
+
+
+def test_recompress_mode_keeps_soft_masks(tmp_path):
+    src = tmp_path / "in.pdf"
+    buf = io.BytesIO()
+    image = Image.open(io.BytesIO(_png((600, 600), (200, 30, 30))))
+    image.putalpha(Image.linear_gradient("L").resize((600, 600)))
+    image.save(buf, format="PNG")
+    with fitz.open() as doc:
+        doc.new_page(width=200, height=200).insert_image(fitz.Rect(0, 0, 200, 200), stream=buf.getvalue())
+        doc.save(src)
+    spec = JobSpec(
+        tool_id="compress_images",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"mode": "images", "dpi": 72, "jpeg_quality": 70, "workers": 1},
+    )
+
+    result = CompressImagesOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success
+    with pikepdf.open(src) as before, pikepdf.open(result.outputs[0]) as after:
+        old = next(iter(before.pages[0].Resources.XObject.values()))
+        new = next(iter(after.pages[0].Resources.XObject.values()))
+        assert new.Filter == pikepdf.Name.DCTDecode
+        assert (int(new.Width), int(new.Height)) == (200, 200)
+        assert new.SMask.read_bytes() == old.SMask.read_bytes()
+
+
+def test_rasterize_mode_renders_at_max_side_and_embeds_gray_jpegs(tmp_path):
+    src = tmp_path / "in.pdf"
+    _make_pdf(src)
+    params = {"mode": "rasterize", "dpi": 300, "max_side": 500, "grayscale": True, "workers": 1}
+    spec = JobSpec(tool_id="compress_images", inputs=[src], output_dir=tmp_path, params=params)
+
+    result = CompressImagesOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success
+    with pikepdf.open(result.outputs[0]) as pdf:
+        page = pdf.pages[0]
+        image = next(iter(page.Resources.XObject.values()))
+        assert [float(v) for v in page.mediabox] == [0, 0, 400, 400]
+        assert (int(image.Width), int(image.Height)) == (500, 500)
+        assert pikepdf.PdfImage(image).mode == "L"
+        assert image.Filter == pikepdf.Name.DCTDecode
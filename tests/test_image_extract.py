@@ -0,0 +1,113 @@
+import io
+import struct
+
+import fitz
+import pikepdf
+from PIL import Image, ImageDraw
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops.pdf_to_images import PdfToImagesOperation
+
+
+def _jpeg():
+    buf = io.BytesIO()
+    Image.effect_noise((200, 300), 40).convert("L").save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _fax(size, compression="group4", t4_options=None):
+    # CCITT data taken from a TIFF strip; the Group 4 data doubles as JBIG2 MMR data.
+    image = Image.new("1", size, 1)
+    ImageDraw.Draw(image).rectangle((8, 8, 40, 20), fill=0)
+    buf = io.BytesIO()
+    image.save(buf, format="TIFF", compression=compression, tiffinfo={292: t4_options} if t4_options else {})
+    tiff = Image.open(io.BytesIO(buf.getvalue()))
+    return buf.getvalue()[tiff.tag_v2[273][0] :][: tiff.tag_v2[279][0]]
+
+
+def _jbig2(size, mmr):
+    # Page information, an immediate generic region coded with MMR, end of page.
+    def segment(number, kind, data):
+        return struct.pack(">IBBBI", number, kind, 0, 1, len(data)) + data
+
+    width, height = size
+    page_info = struct.pack(">IIIIBH", width, height, 0, 0, 0, 0)
+    region = struct.pack(">IIIIB", width, height, 0, 0, 0) + b"\x01" + mmr
+    return segment(0, 48, page_info) + segment(1, 38, region) + segment(2, 49, b"")
+
+
+def _add_bilevel_page(pdf, size, data, filter_name, parms=None):
+    image = pikepdf.Stream(pdf, data)
+    image.Type, image.Subtype = pikepdf.Name.XObject, pikepdf.Name.Image
+    image.Width, image.Height = size
+    image.ColorSpace, image.BitsPerComponent = pikepdf.Name.DeviceGray, 1
+    image.Filter = filter_name
+    if parms is not None:
+        image.DecodeParms = parms
+    pdf.add_blank_page(page_size=size)
+    page = pdf.pages[-1]
+    page.Resources = pikepdf.Dictionary(XObject=pikepdf.Dictionary(Im0=image))
+    page.Contents = pdf.make_stream(b"q %d 0 0 %d 0 0 cm /Im0 Do Q" % size)
+
+
+def _make_pdf(path):
+    jpeg = _jpeg()
+    with fitz.open() as doc:
+        # An OCR'd scan (invisible text over the image) and a scan with a visible stamp on it.
+        page = doc.new_page(width=144, height=216)
+        page.insert_image(page.rect, stream=jpeg)
+        page.insert_text((10, 100), "recognized", render_mode=3)
+        page = doc.new_page(width=144, height=216)
+        page.insert_image(page.rect, stream=jpeg)
+        page.insert_text((10, 100), "APPROVED")
+        # A scan cropped to its top-left quarter: only the visible part may be exported.
+        page = doc.new_page(width=144, height=216)
+        page.insert_image(page.rect, stream=jpeg)
+        page.set_cropbox(fitz.Rect(0, 0, 72, 108))
+        doc.save(path)
+    size = (64, 32)
+    with pikepdf.open(path, allow_overwriting_input=True) as pdf:
+        # Group 4, Group 3 1-D and Group 3 2-D.
+        for k, compression, t4_options in ((-1, "group4", None), (0, "group3", None), (1, "group3", 1)):
+            parms = pikepdf.Dictionary(K=k, Columns=size[0], BlackIs1=False)
+            _add_bilevel_page(pdf, size, _fax(size, compression, t4_options), pikepdf.Name.CCITTFaxDecode, parms)
+        _add_bilevel_page(pdf, size, _jbig2(size, _fax(size)), pikepdf.Name.JBIG2Decode)
+        pdf.save(path)
+    return jpeg
+
+
+def test_extract_mode_writes_single_image_pages_as_stored(tmp_path):
+    src = tmp_path / "scan.pdf"
+    jpeg = _make_pdf(src)
+    progress = []
+    spec = JobSpec(
+        tool_id="pdf_to_images",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"mode": "extract", "dpi": 72, "format": "png", "workers": 1},
+    )
+
+    result = PdfToImagesOperation().run(spec, lambda *args: progress.append(args), CancellationToken())
+
+    assert result.success is True
+    names = ["scan_p1.jpg", "scan_p2.png", "scan_p3.png", "scan_p4.tif", "scan_p5.tif", "scan_p6.tif", "scan_p7.jb2"]
+    assert [p.name for p in result.outputs] == names
+    assert result.outputs[0].read_bytes() == jpeg
+    assert Image.open(result.outputs[1]).size == (144, 216)
+    assert Image.open(result.outputs[2]).size == (72, 108)
+    with fitz.open(src) as doc:
+        renders = [doc[i].get_pixmap(colorspace=fitz.csGRAY).samples for i in range(3, 7)]
+    for path, expected in zip(result.outputs[3:6], renders):
+        assert Image.open(path).convert("L").tobytes() == expected
+    with fitz.open(result.outputs[6]) as jb2:
+        assert jb2[0].get_pixmap(colorspace=fitz.csGRAY).samples == renders[3]
+    assert [args[3] for args in progress] == [
+        "Extract page 1 (JPG, as stored)",
+        "Export page 2",
+        "Export page 3",
+        "Extract page 4 (TIF, as stored)",
+        "Extract page 5 (TIF, as stored)",
+        "Extract page 6 (TIF, as stored)",
+        "Extract page 7 (JB2, as stored)",
+    ]
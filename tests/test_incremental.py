@@ -0,0 +1,72 @@
+from pathlib import Path
+
+import fitz
+import pikepdf
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops.delete_pages import DeletePagesOperation
+from pdf_toolbox.services.pdf_ops.rotate_pages import RotatePagesOperation
+
+
+def _make_pdf(path: Path, pages: int, **save_kwargs) -> Path:
+    with fitz.open() as doc:
+        for i in range(pages):
+            doc.new_page(width=200, height=200).insert_text((10, 20), f"page {i + 1}")
+        doc.save(path)
+    if save_kwargs:
+        with pikepdf.open(path, allow_overwriting_input=True) as pdf:
+            pdf.save(path, **save_kwargs)
+    return path
+
+
+def _run(op, src: Path, out_dir: Path, **params) -> Path:
+    out_dir.mkdir(exist_ok=True)
+    spec = JobSpec(op.tool_id, [src], out_dir, params=params)
+    result = op.run(spec, lambda *args: None, CancellationToken())
+    assert result.success and result.warning is None
+    return result.outputs[0]
+
+
+def test_incremental_rotate_appends_to_original(tmp_path):
+    src = _make_pdf(tmp_path / "doc.pdf", 5)
+
+    out = _run(RotatePagesOperation(), src, tmp_path / "out", ranges="2,4", angle=90, incremental=True)
+
+    original = src.read_bytes()
+    updated = out.read_bytes()
+    assert updated.startswith(original)
+    assert len(updated) - len(original) < 2048
+    with pikepdf.open(out) as pdf:
+        assert not pdf.get_warnings()
+    with fitz.open(out) as doc:
+        assert not doc.is_repaired
+        assert [page.rotation for page in doc] == [0, 90, 0, 90, 0]
+
+
+def test_incremental_delete_matches_full_delete(tmp_path):
+    # Object streams make qpdf end the file with a cross-reference stream, which the update must chain to.
+    src = _make_pdf(tmp_path / "doc.pdf", 6, object_stream_mode=pikepdf.ObjectStreamMode.generate)
+
+    full = _run(DeletePagesOperation(), src, tmp_path / "full", ranges="1,5-6")
+    incremental = _run(DeletePagesOperation(), src, tmp_path / "inc", ranges="1,5-6", incremental=True)
+
+    assert incremental.read_bytes().startswith(src.read_bytes())
+    with fitz.open(full) as a, fitz.open(incremental) as b:
+        assert not b.is_repaired
+        assert [p.get_text().strip() for p in a] == [p.get_text().strip() for p in b] == ["page 2", "page 3", "page 4"]
+
+
+def test_incremental_falls_back_for_encrypted_files(tmp_path):
+    plain = _make_pdf(tmp_path / "plain.pdf", 2)
+    src = tmp_path / "locked.pdf"
+    with pikepdf.open(plain) as pdf:
+        pdf.save(src, encryption=pikepdf.Encryption(owner="o", user=""))
+    (tmp_path / "out").mkdir()
+    spec = JobSpec("rotate_pages", [src], tmp_path / "out", params={"ranges": "1", "incremental": True})
+
+    result = RotatePagesOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success and "locked.pdf" in result.warning
+    with fitz.open(result.outputs[0]) as doc:
+        assert doc[0].rotation == 90
@@ -0,0 +1,105 @@
+import fitz
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.io import ocr_cache, temp_files
+from pdf_toolbox.services.io.temp_files import JobJournal, journal_key
+from pdf_toolbox.services.pdf_ops.ocr import OcrOperation
+
+
+def test_journal_survives_reopen_and_torn_line(tmp_path):
+    journal = JobJournal("job", root=tmp_path)
+    journal.record(0, {"pdf": b"%PDF-0", "txt": b"zero"})
+    journal.record(2, {"txt": b"two"}, native=True)
+    with (tmp_path / "job" / "journal.jsonl").open("a", encoding="utf-8") as fh:
+        fh.write('{"page": 3, "fil')
+
+    reopened = JobJournal("job", root=tmp_path)
+
+    assert sorted(reopened.entries) == [0, 2]
+    assert reopened.read(0, "pdf") == b"%PDF-0"
+    assert reopened.read(2, "pdf") is None
+    assert reopened.entries[2]["native"] is True
+    reopened.discard()
+    assert not (tmp_path / "job").exists()
+
+
+def test_journal_key_tracks_source_and_params(tmp_path):
+    src = tmp_path / "a.pdf"
+    src.write_bytes(b"one")
+    key = journal_key(src, dpi=300)
+
+    assert journal_key(src, dpi=300) == key
+    assert journal_key(src, dpi=200) != key
+    src.write_bytes(b"changed")
+    assert journal_key(src, dpi=300) != key
+
+
+def _bars_pdf(path, count):
+    # One bar per page, each of its own width, so BoxEngine reads page k as "W{20 + 10 * k}".
+    with fitz.open() as doc:
+        for k in range(count):
+            page = doc.new_page(width=200, height=100)
+            page.draw_rect(fitz.Rect(10, 40, 30 + 10 * k, 50), color=(0, 0, 0), fill=(0, 0, 0))
+        doc.save(path)
+
+
+def _ocr_spec(src, out_dir, use_cache):
+    params = {"dpi": 72, "output_pdf": True, "use_cache": use_cache, "resume": True, "ocr_workers": 1, "prefetch": 1}
+    return JobSpec(tool_id="ocr", inputs=[src], output_dir=out_dir, params=params, overwrite=True)
+
+
+def _run_ocr(spec, cancel_at=None):
+    token = CancellationToken()
+
+    def progress(stage, current, total, message=""):
+        if current == cancel_at:
+            token.cancel()
+
+    return OcrOperation().run(spec, progress, token)
+
+
+def _checkpointed_pages(temp_root):
+    return sum(len(log.read_text(encoding="utf-8").splitlines()) for log in temp_root.glob("jobs/*/journal.jsonl"))
+
+
+def test_ocr_resume_recognizes_only_the_remaining_pages(tmp_path, monkeypatch, fake_ocr_engine):
+    monkeypatch.setattr(temp_files, "DEFAULT_TEMP_DIR", tmp_path / "temp")
+    src = tmp_path / "scan.pdf"
+    _bars_pdf(src, 6)
+    spec = _ocr_spec(src, tmp_path, use_cache=False)
+
+    assert _run_ocr(spec, cancel_at=2).cancelled is True
+    first = len(fake_ocr_engine.bands)
+    assert 2 <= first < 6 and _checkpointed_pages(tmp_path / "temp") == first
+
+    result = _run_ocr(spec)
+
+    assert result.success is True
+    assert len(fake_ocr_engine.bands) == 6
+    with fitz.open(result.outputs[0]) as doc:
+        assert [page.get_text().strip() for page in doc] == [f"W{20 + 10 * k}" for k in range(6)]
+    assert _checkpointed_pages(tmp_path / "temp") == 0
+
+
+def test_ocr_cache_hits_are_checkpointed(tmp_path, monkeypatch, fake_ocr_engine):
+    monkeypatch.setattr(temp_files, "DEFAULT_TEMP_DIR", tmp_path / "temp")
+    monkeypatch.setattr(ocr_cache, "DEFAULT_CACHE_DIR", tmp_path / "cache")
+    src = tmp_path / "scan.pdf"
+    _bars_pdf(src, 6)
+    spec = _ocr_spec(src, tmp_path, use_cache=True)
+    assert _run_ocr(spec).success is True
+    assert len(fake_ocr_engine.bands) == 6
+
+    # Served from the cache, then cancelled; the cache is cleared before the job resumes.
+    assert _run_ocr(spec, cancel_at=2).cancelled is True
+    checkpointed = _checkpointed_pages(tmp_path / "temp")
+    assert checkpointed >= 2 and len(fake_ocr_engine.bands) == 6
+    ocr_cache.OcrCache().clear()
+
+    result = _run_ocr(spec)
+
+    assert result.success is True
+    assert len(fake_ocr_engine.bands) == 12 - checkpointed
+    with fitz.open(result.outputs[0]) as doc:
+        assert [page.get_text().strip() for page in doc] == [f"W{20 + 10 * k}" for k in range(6)]
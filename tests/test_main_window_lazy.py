@@ -0,0 +1,53 @@
+import os
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtWidgets import QApplication
+
+from pdf_toolbox.i18n import get_language, set_language, t
+from pdf_toolbox.services.io import ocr_cache
+from pdf_toolbox.ui.main_window import MainWindow
+from pdf_toolbox.ui.tools_panels.ocr_panel import OcrPanel
+
+# Created at collection time: widgets need a QApplication, not the QCoreApplication other tests start.
+app = QApplication.instance() or QApplication([])
+
+
+def test_panels_are_built_on_first_open():
+    original = get_language()
+    win = MainWindow()
+    try:
+        assert win._panels == {}
+        assert win.stack.count() == 1
+
+        win._toggle_language()
+        win._open_panel(OcrPanel)
+        panel = win._panels[OcrPanel]
+        assert win.stack.currentWidget() is panel
+        assert win.title_label.text() == t(OcrPanel.title_key)
+
+        win._open_panel(OcrPanel)
+        assert win.stack.count() == 2
+    finally:
+        set_language(original)
+        win.queue.shutdown()
+        win.deleteLater()
+        app.processEvents()
+
+
+def test_ocr_panel_shows_and_clears_the_cache(tmp_path, monkeypatch):
+    monkeypatch.setattr(ocr_cache, "DEFAULT_CACHE_DIR", tmp_path)
+    ocr_cache.OcrCache().put("aa01", None, "x" * 3 * 1024 * 1024)
+    panel = OcrPanel()
+    try:
+        panel.show()
+        assert panel.cache_info.text() == t("label_ocr_cache_info", path=tmp_path / "ocr", size="3.0")
+        assert panel.build_spec().params["use_cache"] is True
+
+        panel.clear_cache_btn.click()
+
+        assert panel.cache_info.text() == t("label_ocr_cache_info", path=tmp_path / "ocr", size="0.0")
+        assert list((tmp_path / "ocr").glob("*/*")) == []
+    finally:
+        panel.deleteLater()
+        app.processEvents()
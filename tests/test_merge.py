@@ -0,0 +1,183 @@
+import threading
+from pathlib import Path
+
+import fitz
+import pikepdf
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops import merge
+from pdf_toolbox.services.pdf_ops.merge import MergeOperation
+
+
+def _make_inputs(folder: Path, count: int) -> list:
+    paths = []
+    for i in range(count):
+        doc = fitz.open()
+        for j in range(i % 3 + 1):
+            doc.new_page(width=100, height=100).insert_text((10, 50), f"{i}.{j}")
+        if i % 2 == 0:
+            doc.set_toc([[1, f"File {i}", 1], [2, f"File {i} last", doc.page_count]])
+        path = folder / f"in{i}.pdf"
+        doc.save(path)
+        doc.close()
+        paths.append(path)
+    return paths
+
+
+def _page_texts(path: Path) -> list:
+    with fitz.open(path) as doc:
+        return [page.get_text().strip() for page in doc]
+
+
+def test_merge_bounds_open_sources(tmp_path, monkeypatch):
+    inputs = _make_inputs(tmp_path, 7)
+    open_now = []
+    peak = []
+    real_open = pikepdf.open
+
+    def tracking_open(path, *args, **kwargs):
+        pdf = real_open(path, *args, **kwargs)
+        real_close = pdf.close
+
+        def close():
+            if pdf in open_now:
+                open_now.remove(pdf)
+            real_close()
+
+        pdf.close = close
+        open_now.append(pdf)
+        peak.append(len(open_now))
+        return pdf
+
+    monkeypatch.setattr(merge.pikepdf, "open", tracking_open)
+    progress = []
+    spec = JobSpec("merge", inputs, tmp_path, output_name="all", params={"max_open_files": 3})
+
+    result = MergeOperation().run(spec, lambda *args: progress.append(args), CancellationToken())
+
+    assert result.success is True
+    assert max(peak) <= 3
+    expected = [f"{i}.{j}" for i in range(7) for j in range(i % 3 + 1)]
+    assert _page_texts(result.outputs[0]) == expected
+    assert progress[-1][1] == progress[-1][2]
+
+
+def test_merge_cancel(tmp_path):
+    inputs = _make_inputs(tmp_path, 3)
+    token = CancellationToken()
+    spec = JobSpec("merge", inputs, tmp_path)
+
+    result = MergeOperation().run(spec, lambda *args: token.cancel(), token)
+
+    assert result.cancelled is True
+
+
+def test_tree_merge_matches_flat_merge(tmp_path):
+    inputs = _make_inputs(tmp_path, 9)
+    flat = MergeOperation().run(
+        JobSpec("merge", inputs, tmp_path, output_name="flat", params={"tree": False, "keep_bookmarks": True}),
+        lambda *args: None,
+        CancellationToken(),
+    )
+    tree_params = {"tree": True, "fan_in": 2, "merge_workers": 2, "keep_bookmarks": True}
+    tree = MergeOperation().run(
+        JobSpec("merge", inputs, tmp_path, output_name="tree", params=tree_params),
+        lambda *args: None,
+        CancellationToken(),
+    )
+
+    assert _page_texts(flat.outputs[0]) == _page_texts(tree.outputs[0])
+    with fitz.open(flat.outputs[0]) as a, fitz.open(tree.outputs[0]) as b:
+        assert a.get_toc(simple=False) == b.get_toc(simple=False)
+        assert a.get_toc()[:3] == [[1, "File 0", 1], [2, "File 0 last", 1], [1, "File 2", 4]]
+
+
+def test_merge_falls_back_to_public_page_api(tmp_path, monkeypatch):
+    inputs = _make_inputs(tmp_path, 5)
+    params = {"tree": False, "keep_bookmarks": True}
+    fast = MergeOperation().run(
+        JobSpec("merge", inputs, tmp_path, output_name="fast", params=params), lambda *args: None, CancellationToken()
+    )
+    # append_pages relies on the private Pdf._add_page; without it the public PageList API must give the same file.
+    monkeypatch.delattr(pikepdf.Pdf, "_add_page")
+    slow = MergeOperation().run(
+        JobSpec("merge", inputs, tmp_path, output_name="slow", params=params), lambda *args: None, CancellationToken()
+    )
+
+    assert _page_texts(fast.outputs[0]) == _page_texts(slow.outputs[0])
+    with fitz.open(fast.outputs[0]) as a, fitz.open(slow.outputs[0]) as b:
+        assert a.get_toc() == b.get_toc() == [
+            [1, "File 0", 1],
+            [2, "File 0 last", 1],
+            [1, "File 2", 4],
+            [2, "File 2 last", 6],
+            [1, "File 4", 8],
+            [2, "File 4 last", 9],
+        ]
+
+
+def test_running_merge_chunk_stops_when_the_job_is_cancelled(tmp_path, monkeypatch):
+    inputs = _make_inputs(tmp_path, 3)
+    cancel = threading.Event()
+    opened = []
+    real_open = pikepdf.open
+
+    def open_and_cancel(path, *args, **kwargs):
+        # The job is cancelled while the chunk's first input is being copied.
+        opened.append(path)
+        cancel.set()
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(merge.pikepdf, "open", open_and_cancel)
+    monkeypatch.setattr(merge, "_chunk_cancel", cancel)
+
+    merge._merge_chunk([str(p) for p in inputs], str(tmp_path / "part.pdf"), False, False)
+
+    assert len(opened) == 1
+    assert not (tmp_path / "part.pdf").exists()
+
+
+def test_tree_merge_workers_default_to_the_cpu_share(tmp_path, monkeypatch):
+    inputs = _make_inputs(tmp_path, 4)
+    workers = []
+    real_init = merge._ChunkRunner.__init__
+
+    def init(self, count, *args):
+        workers.append(count)
+        real_init(self, 1, *args)
+
+    monkeypatch.setattr(merge, "cpu_share", lambda: 3)
+    monkeypatch.setattr(merge._ChunkRunner, "__init__", init)
+    spec = JobSpec("merge", inputs, tmp_path, output_name="tree", params={"tree": True, "fan_in": 2})
+
+    assert MergeOperation().run(spec, lambda *args: None, CancellationToken()).success is True
+    assert workers == [3]
+
+
+def test_merge_dedup_shares_identical_images(tmp_path):
+    import io
+
+    from PIL import Image
+
+    buf = io.BytesIO()
+    Image.effect_noise((64, 64), 64).convert("RGB").save(buf, format="PNG")
+    inputs = []
+    for i in range(4):
+        doc = fitz.open()
+        page = doc.new_page(width=100, height=100)
+        page.insert_image(fitz.Rect(0, 0, 50, 50), stream=buf.getvalue())
+        page.insert_text((10, 80), f"doc {i}")
+        inputs.append(tmp_path / f"logo{i}.pdf")
+        doc.save(inputs[-1])
+        doc.close()
+
+    results = {}
+    for dedup in (False, True):
+        spec = JobSpec("merge", inputs, tmp_path, output_name=f"dedup_{dedup}", params={"dedup": dedup})
+        results[dedup] = MergeOperation().run(spec, lambda *args: None, CancellationToken()).outputs[0]
+
+    assert _page_texts(results[True]) == _page_texts(results[False]) == [f"doc {i}" for i in range(4)]
+    assert results[True].stat().st_size < results[False].stat().st_size
+    with fitz.open(results[True]) as doc:
+        assert len({img[0] for page in doc for img in page.get_images()}) == 1
@@ -0,0 +1,80 @@
+from contextlib import contextmanager
+
+import fitz
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops import ocr
+from pdf_toolbox.services.pdf_ops.ocr_bands import recognize_in_bands
+from pdf_toolbox.services.pdf_ops.ocr_engine import OcrEngine, OcrPageResult
+
+
+def test_bands_overlap_and_keep_each_line_once(box_engine):
+    with fitz.open() as doc:
+        page = doc.new_page(width=200, height=1000)
+        for k in range(20):
+            page.draw_rect(fitz.Rect(10, 30 + 47 * k, 30 + 5 * k, 40 + 47 * k), color=(0, 0, 0), fill=(0, 0, 0))
+        result = recognize_in_bands(page, 1.0, 200 * 150, box_engine, want_pdf=True, want_text=True)
+
+        assert len(box_engine.bands) > 5 and all(w * h <= 200 * 150 for w, h in box_engine.bands)
+        assert result.text.split() == [f"W{20 + 5 * k}" for k in range(20)]
+        with fitz.open(stream=result.pdf_bytes, filetype="pdf") as out:
+            words = out[0].get_text("words")
+            assert [w[4] for w in words] == result.text.split()
+            assert all(abs((w[1] + w[3]) / 2 - (35 + 47 * k)) < 8 for k, w in enumerate(words))
+
+
+def test_rotated_page_keeps_its_drawing_and_rotation(tmp_path, box_engine):
+    src = tmp_path / "rotated.pdf"
+    with fitz.open() as doc:
+        page = doc.new_page(width=200, height=600)
+        page.draw_rect(fitz.Rect(10, 300, 160, 310), color=(0, 0, 0), fill=(0, 0, 0))
+        page.set_rotation(90)
+        doc.save(src)
+
+    with fitz.open(src) as doc:
+        result = recognize_in_bands(doc[0], 1.0, 600 * 100, box_engine, want_pdf=True, want_text=False)
+        expected = doc[0].get_pixmap().samples
+
+    with fitz.open(stream=result.pdf_bytes, filetype="pdf") as out:
+        assert out[0].rotation == 90
+        assert out[0].get_pixmap().samples == expected
+
+
+class _SizeEngine(OcrEngine):
+    kind = "fake"
+
+    def __init__(self, sizes):
+        super().__init__("eng")
+        self.sizes = sizes
+
+    def recognize(self, img, want_pdf, want_text, text_only=False):
+        self.sizes.append(img.size)
+        return OcrPageResult(None, "")
+
+
+def test_a4_page_with_four_workers_is_not_banded(tmp_path, monkeypatch):
+    sizes = []
+
+    class _Pool:
+        @contextmanager
+        def acquire(self, lang, preference=None, tesseract_cmd=None):
+            yield _SizeEngine(sizes)
+
+    monkeypatch.setattr(ocr, "engine_available", lambda preference: True)
+    monkeypatch.setattr(ocr, "ENGINE_POOL", _Pool())
+    src = tmp_path / "a4.pdf"
+    with fitz.open() as doc:
+        doc.new_page(width=595, height=842)
+        doc.save(src)
+    spec = JobSpec(
+        tool_id="ocr",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"dpi": 300, "output_docx": True, "use_cache": False, "resume": False, "ocr_workers": 4},
+    )
+
+    result = ocr.OcrOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success is True
+    assert sizes == [(2480, 3509)]
@@ -0,0 +1,82 @@
+import os
+import time
+from pathlib import Path
+
+from pdf_toolbox.services.io.ocr_cache import OcrCache, cache_usage, page_key
+
+
+def test_cache_roundtrip_and_counters(tmp_path):
+    cache = OcrCache(root=tmp_path)
+    key = page_key(b"\x00" * 12, 2, 2, dpi=300, lang="eng")
+
+    assert cache.get(key, want_pdf=True, want_text=True) is None
+    cache.put(key, b"%PDF-1.4", "hello")
+
+    assert cache.get(key, want_pdf=True, want_text=True) == (b"%PDF-1.4", "hello")
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_key_depends_on_params():
+    pixels = b"\xff" * 12
+    assert page_key(pixels, 2, 2, dpi=300, lang="eng") != page_key(pixels, 2, 2, dpi=200, lang="eng")
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = OcrCache(root=tmp_path, max_bytes=250)
+    cache.put("aa01", None, "x" * 100)
+    cache.put("bb02", None, "y" * 100)
+    old = time.time() - 100
+    os.utime(cache._paths("aa01")[1], (old, old))
+    cache.get("bb02", want_pdf=False, want_text=True)
+
+    cache.put("cc03", None, "z" * 100)
+
+    assert cache.get("aa01", want_pdf=False, want_text=True) is None
+    assert cache.get("bb02", want_pdf=False, want_text=True) == (None, "y" * 100)
+    assert cache.size_bytes <= 250
+
+
+def test_cache_index_is_scanned_once_per_folder(tmp_path, monkeypatch):
+    OcrCache(root=tmp_path).put("aa01", None, "x" * 100)
+    scans = []
+    real_glob = Path.glob
+    monkeypatch.setattr(Path, "glob", lambda self, pattern: scans.append(self) or real_glob(self, pattern))
+
+    cache = OcrCache(root=tmp_path)
+
+    assert scans == []
+    assert cache.size_bytes == 100
+    assert cache.get("aa01", want_pdf=False, want_text=True) == (None, "x" * 100)
+
+
+def test_cache_evicts_oldest_down_to_low_water(tmp_path):
+    # Files left by an earlier run are ordered by mtime when the folder is first scanned.
+    for i in range(10):
+        path = tmp_path / "00" / f"00{i}.txt"
+        path.parent.mkdir(exist_ok=True)
+        path.write_text("x" * 100, encoding="utf-8")
+        stamp = time.time() - 100 + (9 - i)
+        os.utime(path, (stamp, stamp))
+    cache = OcrCache(root=tmp_path, max_bytes=1000)
+
+    cache.put("new1", None, "y" * 100)
+
+    left = sorted(path.stem for path in tmp_path.glob("*/*.txt"))
+    assert left == ["000", "001", "002", "003", "004", "005", "006", "007", "new1"]
+    assert cache.size_bytes == 900
+    cache.put("new2", None, "z" * 100)
+    assert cache.size_bytes == 1000
+
+
+def test_clear_removes_entries_other_processes_wrote(tmp_path):
+    cache = OcrCache(root=tmp_path)
+    cache.put("aa01", b"%PDF", "x")
+    # Written by an OCR worker process after this process indexed the folder.
+    (tmp_path / "bb").mkdir()
+    (tmp_path / "bb" / "bb02.txt").write_text("y" * 10, encoding="utf-8")
+    assert cache_usage(tmp_path) == 4 + 1 + 10
+
+    cache.clear()
+
+    assert cache_usage(tmp_path) == 0 and cache.size_bytes == 0
+    assert list(tmp_path.glob("*/*")) == []
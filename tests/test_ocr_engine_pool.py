@@ -0,0 +1,70 @@
+from pathlib import Path
+
+from PIL import Image
+
+from pdf_toolbox.services.pdf_ops import ocr_engine
+from pdf_toolbox.services.pdf_ops.ocr_engine import OcrEngine, OcrEnginePool, OcrPageResult, TesserocrEngine
+
+
+class FakeEngine(OcrEngine):
+    kind = "cli"
+
+    def recognize(self, img, want_pdf, want_text, text_only=False):
+        return OcrPageResult(text="")
+
+
+def test_pool_reuses_engines_per_language(monkeypatch):
+    created = []
+
+    def fake_create(lang, preference="auto", tesseract_cmd=None):
+        engine = FakeEngine(lang)
+        created.append(engine)
+        return engine
+
+    monkeypatch.setattr(ocr_engine, "create_engine", fake_create)
+    pool = OcrEnginePool()
+
+    with pool.acquire("eng") as first:
+        pass
+    with pool.acquire("eng") as second:
+        pass
+    with pool.acquire("chi_sim+eng") as other:
+        pass
+
+    assert first is second
+    assert other is not first
+    assert len(created) == 2
+
+
+class _StubApi:
+    # Mirrors tesserocr's PyTessBaseAPI.ProcessPage(outputbase, image, page_index, filename): the renderers write
+    # outputbase + ".pdf"/".txt", and the PDF renderer reads the image file named by filename.
+    def __init__(self):
+        self.variables = {}
+        self.sources = []
+
+    def SetVariable(self, name, value):
+        self.variables[name] = value
+        return True
+
+    def ProcessPage(self, outputbase, image, page_index, filename):
+        self.sources.append(Image.open(filename).size if filename else None)
+        Path(outputbase + ".pdf").write_bytes(b"%PDF-1.7")
+        if self.variables["tessedit_create_txt"] == "1":
+            Path(outputbase + ".txt").write_text("words", encoding="utf-8")
+        return True
+
+
+def test_tesserocr_engine_hands_tesseract_a_real_source_image():
+    engine = TesserocrEngine.__new__(TesserocrEngine)
+    engine.lang = "eng"
+    engine._api = _StubApi()
+    img = Image.new("L", (40, 30), 255)
+
+    page = engine.recognize(img, want_pdf=True, want_text=True)
+    overlay = engine.recognize(img, want_pdf=True, want_text=False, text_only=True)
+
+    assert (page.pdf_bytes, page.text) == (b"%PDF-1.7", "words")
+    assert (overlay.pdf_bytes, overlay.text) == (b"%PDF-1.7", None)
+    assert engine._api.sources == [(40, 30), None]
+    assert engine._api.variables["textonly_pdf"] == "1"
@@ -0,0 +1,46 @@
+from pathlib import Path
+
+import fitz
+import pytesseract
+from docx import Document
+from PIL import Image
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops import ocr
+from pdf_toolbox.services.pdf_ops.ocr import OcrOperation
+from pdf_toolbox.services.pdf_ops.ocr_engine import OcrEnginePool
+
+
+def test_pdf_and_docx_come_from_one_tesseract_run_per_page(tmp_path, monkeypatch):
+    runs = []
+
+    def run_tesseract(input_filename, output_filename_base, extension, lang, config="", nice=0, timeout=0):
+        runs.append(extension.split())
+        width, height = Image.open(input_filename).size
+        with fitz.open() as doc:
+            doc.new_page(width=width, height=height).insert_text((10, 20), f"page {len(runs)}", render_mode=3)
+            doc.save(f"{output_filename_base}.pdf")
+        Path(f"{output_filename_base}.txt").write_text(f"page {len(runs)}", encoding="utf-8")
+
+    monkeypatch.setenv("TESSERACT_CMD", "tesseract")
+    monkeypatch.setattr(pytesseract.pytesseract, "run_tesseract", run_tesseract)
+    monkeypatch.setattr(pytesseract.pytesseract, "tesseract_cmd", pytesseract.pytesseract.tesseract_cmd)
+    monkeypatch.setattr(ocr, "ENGINE_POOL", OcrEnginePool())
+    src = tmp_path / "scan.pdf"
+    with fitz.open() as doc:
+        for _ in range(3):
+            doc.new_page(width=100, height=100)
+        doc.save(src)
+    params = {"dpi": 72, "ocr_engine": "cli", "output_pdf": True, "output_docx": True, "use_cache": False}
+    params.update({"resume": False, "ocr_workers": 1})
+    spec = JobSpec(tool_id="ocr", inputs=[src], output_dir=tmp_path, params=params)
+
+    result = OcrOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success is True
+    assert runs == [["pdf", "txt"]] * 3
+    pdf_path, docx_path = result.outputs
+    with fitz.open(pdf_path) as doc:
+        assert [page.get_text().strip() for page in doc] == ["page 1", "page 2", "page 3"]
+    assert [p.text for p in Document(docx_path).paragraphs if p.text] == ["page 1", "page 2", "page 3"]
@@ -0,0 +1,37 @@
+import fitz
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops.ocr import OcrOperation
+
+
+def test_sandwich_text_lines_up_with_words_on_rotated_page(tmp_path, fake_ocr_engine):
+    src = tmp_path / "rotated.pdf"
+    with fitz.open() as doc:
+        page = doc.new_page(width=200, height=600)
+        page.draw_rect(fitz.Rect(10, 300, 160, 310), color=(0, 0, 0), fill=(0, 0, 0))
+        page.set_rotation(90)
+        doc.save(src)
+    spec = JobSpec(
+        tool_id="ocr",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"dpi": 72, "output_pdf": True, "sandwich": True, "use_cache": False, "resume": False, "ocr_workers": 1},
+    )
+
+    result = OcrOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success is True
+    with fitz.open(result.outputs[0]) as out:
+        page = out[0]
+        assert page.rotation == 90
+        ((*box, word, _, _, _),) = page.get_text("words")
+        # Text positions are reported in unrotated space; map the word into the view the render shows.
+        shown = fitz.Rect(box) * page.rotation_matrix
+        pix = page.get_pixmap()
+        dark = [divmod(i, pix.width) for i in range(pix.width * pix.height) if pix.samples[i * 3] < 128]
+    assert word == "W150"
+    ys, xs = [y for y, _ in dark], [x for _, x in dark]
+    # The bar drawn across the unrotated page stands upright in the rotated view; the word must sit on it.
+    assert shown.x0 - 5 <= min(xs) and max(xs) + 1 <= shown.x1 + 5
+    assert abs(shown.y0 - min(ys)) < 3
@@ -0,0 +1,27 @@
+import io
+
+import fitz
+from PIL import Image
+
+from pdf_toolbox.services.pdf_ops.ocr import PAGE_IMAGE, PAGE_MIXED, PAGE_TEXT, classify_page
+
+
+def _png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (40, 40), "white").save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def test_classify_pages():
+    doc = fitz.open()
+    text_page = doc.new_page(width=200, height=200)
+    text_page.insert_text((20, 40), "A born-digital page with real text")
+    scan_page = doc.new_page(width=200, height=200)
+    scan_page.insert_image(scan_page.rect, stream=_png())
+    mixed_page = doc.new_page(width=200, height=200)
+    mixed_page.insert_image(mixed_page.rect, stream=_png())
+    mixed_page.insert_text((20, 40), "Caption text over a full-page image")
+
+    assert classify_page(doc[0])[0] == PAGE_TEXT
+    assert classify_page(doc[1])[0] == PAGE_IMAGE
+    assert classify_page(doc[2])[0] == PAGE_MIXED
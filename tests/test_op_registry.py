@@ -0,0 +1,33 @@
+import subprocess
+import sys
+from pathlib import Path
+
+from pdf_toolbox.services.pdf_ops import OP_DESCRIPTORS, OP_REGISTRY, get_descriptor
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_descriptors_match_operations():
+    for descriptor in OP_DESCRIPTORS:
+        op = descriptor.load()
+        assert op.tool_id == descriptor.tool_id
+        assert op.display_name == descriptor.display_name
+        assert op.backend == descriptor.backend
+    assert get_descriptor("ocr").backend == "process"
+
+
+def test_registry_imports_operations_lazily():
+    probe = (
+        "import sys\n"
+        "from pdf_toolbox.services.pdf_ops import OP_REGISTRY, get_operation\n"
+        "heavy = ('fitz', 'pikepdf', 'PIL', 'docx')\n"
+        "print(any(m in sys.modules for m in heavy), sorted(OP_REGISTRY)[0])\n"
+        "get_operation('merge')\n"
+        "print('pikepdf' in sys.modules, OP_REGISTRY.is_loaded('merge'), OP_REGISTRY.is_loaded('ocr'))\n"
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", probe], env={"PYTHONPATH": str(SRC)}, capture_output=True, text=True, check=True
+    ).stdout.splitlines()
+
+    assert out == ["False compress_basic", "True True False"]
+    assert "merge" in OP_REGISTRY
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.services.pdf_ops.page_pipeline import PagePipeline
+
+
+def test_pipeline_yields_in_order_with_bounded_inflight():
+    lock = threading.Lock()
+    alive = {"now": 0, "max": 0}
+
+    def produce(i):
+        with lock:
+            alive["now"] += 1
+            alive["max"] = max(alive["max"], alive["now"])
+        return i * 10
+
+    def process(i, item):
+        time.sleep(0.01 * ((7 - i) % 4))
+        return item + 1
+
+    pipeline = PagePipeline(produce, process, workers=3, prefetch=2)
+    out = []
+    for i, value in pipeline.run(range(20), CancellationToken()):
+        out.append((i, value))
+        with lock:
+            alive["now"] -= 1
+
+    assert out == [(i, i * 10 + 1) for i in range(20)]
+    assert alive["max"] <= 5
+
+
+def test_pipeline_stops_on_cancel():
+    token = CancellationToken()
+    pipeline = PagePipeline(lambda i: i, lambda i, item: item, workers=2)
+    seen = []
+    for i, _ in pipeline.run(range(100), token):
+        seen.append(i)
+        if i == 3:
+            token.cancel()
+    assert seen[-1] < 99
@@ -0,0 +1,58 @@
+import fitz
+import pytest
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.core.page_script import PageScriptError, compile_page_plan, page_edits_from_param
+from pdf_toolbox.services.pdf_ops.page_edit import PageEditOperation
+
+
+def _plan(script, pages):
+    return compile_page_plan(page_edits_from_param(script), pages)
+
+
+def test_edits_apply_to_the_previous_result():
+    plan = _plan("delete 1\nrotate 2-3 90; rotate 3 -90\nmove 1 end", 5)
+
+    assert plan == [(2, 90), (3, 0), (4, 0), (1, 0)]
+
+
+def test_move_before_and_after_anchor():
+    assert [src for src, _ in _plan("move 5-6 before 2", 6)] == [0, 4, 5, 1, 2, 3]
+    assert [src for src, _ in _plan("move 1 after 3", 4)] == [1, 2, 0, 3]
+
+
+def test_dict_edits_match_script():
+    edits = [{"op": "extract", "pages": "2-4"}, {"op": "order", "pages": "3,1,2"}]
+
+    assert compile_page_plan(page_edits_from_param(edits), 5) == _plan("keep 2-4; order 3,1,2", 5)
+
+
+@pytest.mark.parametrize(
+    "script",
+    ["", "flip 1", "rotate 1 45", "move 1 sideways", "order 1,2", "delete 1-3", "move 2 before 2", "keep 9"],
+)
+def test_invalid_scripts(script):
+    with pytest.raises(PageScriptError):
+        _plan(script, 3)
+
+
+def test_page_edit_operation_saves_once(tmp_path, monkeypatch):
+    src = tmp_path / "doc.pdf"
+    with fitz.open() as doc:
+        for i in range(6):
+            doc.new_page(width=200, height=200).insert_text((10, 20), f"page {i + 1}")
+        doc.save(src)
+    import pikepdf
+
+    saves = []
+    real_save = pikepdf.Pdf.save
+    monkeypatch.setattr(pikepdf.Pdf, "save", lambda self, *a, **k: (saves.append(a), real_save(self, *a, **k))[1])
+    spec = JobSpec("page_edit", [src], tmp_path, params={"edits": "delete 1\nrotate 2-3 90\nmove 1-2 end"})
+
+    result = PageEditOperation().run(spec, lambda *args: None, CancellationToken())
+
+    assert result.success and len(saves) == 1
+    with fitz.open(result.outputs[0]) as doc:
+        assert [p.get_text().strip() for p in doc] == ["page 4", "page 5", "page 6", "page 2", "page 3"]
+        assert [p.rotation for p in doc] == [90, 0, 0, 0, 90]
@@ -0,0 +1,50 @@
+from pathlib import Path
+
+import fitz
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops.pdf_to_images import PdfToImagesOperation
+
+
+def _make_pdf(path: Path, pages: int) -> Path:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=100, height=100)
+        page.insert_text((10, 50), str(i + 1))
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def test_sharded_export_keeps_page_order(tmp_path):
+    src = _make_pdf(tmp_path / "doc.pdf", 40)
+    progress = []
+    spec = JobSpec(
+        tool_id="pdf_to_images",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"dpi": 36, "format": "png", "workers": 2},
+    )
+
+    result = PdfToImagesOperation().run(spec, lambda *args: progress.append(args), CancellationToken())
+
+    assert result.success is True
+    assert [p.name for p in result.outputs] == [f"doc_p{i + 1}.png" for i in range(40)]
+    assert all(p.exists() for p in result.outputs)
+    assert progress[-1][1] == progress[-1][2] == 40
+
+
+def test_sharded_export_cancel(tmp_path):
+    src = _make_pdf(tmp_path / "doc.pdf", 40)
+    token = CancellationToken()
+    spec = JobSpec(
+        tool_id="pdf_to_images",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"dpi": 36, "format": "png", "workers": 2},
+    )
+
+    result = PdfToImagesOperation().run(spec, lambda *args: token.cancel(), token)
+
+    assert result.cancelled is True
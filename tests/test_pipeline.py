@@ -0,0 +1,137 @@
+import fitz
+import pytest
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import PipelineStage, pipeline_spec
+from pdf_toolbox.services.io import temp_files
+from pdf_toolbox.services.io.validators import ValidationError
+from pdf_toolbox.services.pdf_ops import default_backend, pipeline
+from pdf_toolbox.services.pdf_ops.pipeline import PipelineOperation
+
+
+def _make_inputs(folder, count):
+    paths = []
+    for i in range(count):
+        path = folder / f"in{i}.pdf"
+        with fitz.open() as doc:
+            doc.new_page(width=200, height=200).insert_text((10, 20), f"doc {i}")
+            doc.save(path)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("memory_limit_mb", [512, 0.0001])
+def test_pipeline_chains_stages_without_intermediate_outputs(tmp_path, memory_limit_mb):
+    inputs = _make_inputs(tmp_path, 3)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    stages = [
+        PipelineStage("merge"),
+        PipelineStage("rotate_pages", {"ranges": "2", "angle": 90}),
+        PipelineStage("compress_basic", {"recompress_streams": True}),
+    ]
+    spec = pipeline_spec(stages, inputs, out_dir, output_name="final")
+    spec.params["memory_limit_mb"] = memory_limit_mb
+    progress = []
+
+    op = PipelineOperation()
+    op.validate(spec)
+    result = op.run(spec, lambda *args: progress.append(args), CancellationToken())
+
+    assert result.success, result.error
+    assert list(out_dir.iterdir()) == result.outputs
+    with fitz.open(result.outputs[0]) as doc:
+        assert [p.get_text().strip() for p in doc] == ["doc 0", "doc 1", "doc 2"]
+        assert [p.rotation for p in doc] == [0, 90, 0]
+    overall = [current for _, current, _, _ in progress]
+    assert overall == sorted(overall) and progress[-1][2] == 3000
+    assert progress[-1][3].startswith("[3/3 ")
+
+
+def test_pipeline_hands_over_on_disk_without_a_ram_folder(tmp_path, monkeypatch):
+    # Windows and macOS have no tmpfs: every unfused hand-off goes through the temp folder and is cleaned up.
+    temp_root = tmp_path / "temp"
+    monkeypatch.setattr(pipeline, "memory_temp_root", lambda: None)
+    monkeypatch.setattr(temp_files, "DEFAULT_TEMP_DIR", temp_root)
+    folders = []
+    real_folder = pipeline._Scratch.folder
+
+    def folder(self, *args):
+        folders.append(real_folder(self, *args))
+        return folders[-1]
+
+    monkeypatch.setattr(pipeline._Scratch, "folder", folder)
+    inputs = _make_inputs(tmp_path, 2)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    stages = [PipelineStage("merge"), PipelineStage("compress_basic"), PipelineStage("rotate_pages", {"ranges": "2"})]
+
+    result = PipelineOperation().run(pipeline_spec(stages, inputs, out_dir), lambda *args: None, CancellationToken())
+
+    assert result.success, result.error
+    assert len(folders) == 2 and all(temp_root in folder.parents for folder in folders)
+    assert list(temp_root.iterdir()) == []
+    with fitz.open(result.outputs[0]) as doc:
+        assert [p.get_text().strip() for p in doc] == ["doc 0", "doc 1"]
+        assert [p.rotation for p in doc] == [0, 90]
+
+
+def test_pipeline_reports_failing_stage(tmp_path):
+    inputs = _make_inputs(tmp_path, 1)
+    spec = pipeline_spec([PipelineStage("rotate_pages", {"ranges": "1"}), PipelineStage("nope")], inputs, tmp_path)
+
+    with pytest.raises(ValidationError, match="nope"):
+        PipelineOperation().validate(spec)
+
+
+def test_pipeline_names_stage_that_fails_at_runtime(tmp_path):
+    inputs = _make_inputs(tmp_path, 2)
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    stages = [
+        PipelineStage("merge"),
+        PipelineStage("compress_basic"),
+        PipelineStage("rotate_pages", {"ranges": "1", "angle": 90}),
+        PipelineStage("reorder_pages", {"order": "1"}),
+    ]
+    spec = pipeline_spec(stages, inputs, out_dir)
+
+    # Rotate and reorder run fused in one pass; the error must still name the reorder stage.
+    with pytest.raises(ValidationError, match=r"^Stage 4 \(Reorder Pages\): "):
+        PipelineOperation().run(spec, lambda *args: None, CancellationToken())
+
+
+def test_pipeline_backend_follows_heaviest_stage(tmp_path):
+    light = pipeline_spec([PipelineStage("merge"), PipelineStage("rotate_pages")], [], tmp_path)
+    heavy = pipeline_spec([PipelineStage("merge"), PipelineStage("ocr")], [], tmp_path)
+
+    assert default_backend(light) == "thread"
+    assert default_backend(heavy) == "process"
+
+
+def test_pipeline_fuses_page_edits_into_one_save(tmp_path, monkeypatch):
+    from pdf_toolbox.services.pdf_ops import pipeline
+
+    inputs = _make_inputs(tmp_path, 2)
+    for path in inputs:
+        with fitz.open(path) as doc:
+            doc.new_page(width=200, height=200).insert_text((10, 20), "second")
+            doc.new_page(width=200, height=200).insert_text((10, 20), "third")
+            doc.saveIncr()
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    stages = [
+        PipelineStage("rotate_pages", {"ranges": "1", "angle": 90}),
+        PipelineStage("delete_pages", {"ranges": "2"}),
+        PipelineStage("reorder_pages", {"order": "2,1"}),
+    ]
+    # A fused chain never asks for scratch space between its stages.
+    monkeypatch.setattr(pipeline._Scratch, "folder", lambda *args: pytest.fail("intermediate file written"))
+
+    result = PipelineOperation().run(pipeline_spec(stages, inputs, out_dir), lambda *args: None, CancellationToken())
+
+    assert result.success, result.error
+    assert [p.name for p in result.outputs] == [f"in{i}_rotated_deleted_reordered.pdf" for i in range(2)]
+    with fitz.open(result.outputs[1]) as doc:
+        assert [p.get_text().strip() for p in doc] == ["third", "doc 1"]
+        assert [p.rotation for p in doc] == [0, 90]
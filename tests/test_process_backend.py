@@ -0,0 +1,109 @@
+import os
+import signal
+import threading
+import time
+from pathlib import Path
+
+import pikepdf
+from PySide6.QtCore import QCoreApplication, QEventLoop, QTimer
+
+from pdf_toolbox.core.job_queue import JobQueue
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.core import process_pool
+from pdf_toolbox.core.process_pool import ProcessJobExecutor, cpu_share
+from pdf_toolbox.services.pdf_ops.page_shards import PageShardExecutor
+
+
+def _make_pdf(path: Path, pages: int) -> Path:
+    pdf = pikepdf.Pdf.new()
+    for _ in range(pages):
+        pdf.add_blank_page()
+    pdf.save(path)
+    return path
+
+
+def test_process_backend_merge(tmp_path):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    a = _make_pdf(tmp_path / "a.pdf", 2)
+    b = _make_pdf(tmp_path / "b.pdf", 3)
+
+    queue = JobQueue(process_workers=1)
+    queue.set_backend("merge", "process")
+    finished = {}
+    progress = []
+
+    def on_finished(job_id, result):
+        finished["result"] = result
+        loop.quit()
+
+    queue.progress.connect(progress.append)
+    queue.finished.connect(on_finished)
+
+    spec = JobSpec(tool_id="merge", inputs=[a, b], output_dir=tmp_path, output_name="merged")
+    queue.submit(spec)
+
+    loop = QEventLoop()
+    QTimer.singleShot(60000, loop.quit)
+    loop.exec()
+    queue.shutdown()
+
+    result = finished.get("result")
+    assert result is not None
+    assert result.success is True
+    assert progress
+    with pikepdf.open(result.outputs[0]) as merged:
+        assert len(merged.pages) == 5
+
+
+def test_pool_recovers_after_a_worker_crash(tmp_path):
+    a = _make_pdf(tmp_path / "a.pdf", 2)
+    b = _make_pdf(tmp_path / "b.pdf", 3)
+    done = threading.Event()
+    finished = {}
+
+    def on_finished(job_id, result):
+        finished[job_id] = result
+        done.set()
+
+    executor = ProcessJobExecutor(lambda progress: None, on_finished, max_workers=1)
+    try:
+        executor._executor.submit(cpu_share).result(timeout=60)
+        for worker in list(executor._executor._processes.values()):
+            os.kill(worker.pid, signal.SIGKILL)
+        deadline = time.monotonic() + 30
+        while not executor._executor._broken and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert executor._executor._broken
+
+        spec = JobSpec(tool_id="merge", inputs=[a, b], output_dir=tmp_path, output_name="merged")
+        executor.submit("after-crash", spec)
+        assert done.wait(60)
+    finally:
+        executor.shutdown()
+
+    result = finished["after-crash"]
+    assert result.success is True
+    with pikepdf.open(result.outputs[0]) as merged:
+        assert len(merged.pages) == 5
+
+
+def test_pool_workers_default_to_their_share_of_cpus():
+    executor = ProcessJobExecutor(lambda progress: None, lambda job_id, result: None, max_workers=2)
+    try:
+        share = executor._executor.submit(cpu_share).result(timeout=60)
+    finally:
+        executor.shutdown()
+
+    assert share == max(1, (os.cpu_count() or 1) // 2)
+    assert cpu_share() == (os.cpu_count() or 1)
+
+
+def test_page_shards_inside_a_pool_worker_use_its_cpu_share(monkeypatch):
+    monkeypatch.setattr(process_pool.os, "cpu_count", lambda: 8)
+    assert PageShardExecutor().max_workers == 8
+
+    monkeypatch.setattr(process_pool, "_worker_concurrency", 1)
+    process_pool._init_worker(3)
+
+    assert PageShardExecutor().max_workers == 2
+    assert PageShardExecutor(max_workers=6).max_workers == 6
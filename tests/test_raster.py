@@ -0,0 +1,46 @@
+import fitz
+
+from pdf_toolbox.services.pdf_ops.raster import render_image, render_stats, reset_render_stats
+
+
+def _page():
+    doc = fitz.open()
+    page = doc.new_page(width=200, height=100)
+    page.insert_text((10, 50), "raster")
+    return doc, page
+
+
+def test_gray_render_is_mapped_without_copy():
+    doc, page = _page()
+    reset_render_stats()
+
+    gray = render_image(page, 2.0, gray=True)
+    rgb = render_image(page, 2.0)
+
+    assert (gray.mode, gray.size) == ("L", (400, 200))
+    assert gray.getextrema() == (0, 255)
+    assert rgb.mode == "RGB" and rgb.getpixel((0, 0)) == (255, 255, 255)
+    stats = render_stats()
+    assert (stats.pages, stats.pixels) == (2, 2 * 400 * 200)
+    assert (stats.bytes_mapped, stats.bytes_copied) == (400 * 200, 3 * 400 * 200)
+    doc.close()
+
+
+def test_bands_stream_into_png_identical_to_full_render(tmp_path):
+    from PIL import Image, ImageChops
+
+    from pdf_toolbox.services.pdf_ops.raster import iter_bands, render_image_within, render_size, write_png_bands
+
+    doc, page = _page()
+    page.set_rotation(90)
+    budget = 400 * 30
+    full = render_image(page, 2.0)
+
+    bands = list(iter_bands(page, 2.0, budget))
+    write_png_bands(tmp_path / "p.png", render_size(page, 2.0), bands)
+
+    assert len(bands) > 5 and all(pix.width * pix.height <= budget for _, pix in bands)
+    with Image.open(tmp_path / "p.png") as streamed:
+        assert ImageChops.difference(streamed.convert("RGB"), full).getbbox() is None
+    assert ImageChops.difference(render_image_within(page, 2.0, budget), full).getbbox() is None
+    doc.close()
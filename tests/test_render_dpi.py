@@ -0,0 +1,62 @@
+import io
+
+import fitz
+from PIL import Image
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops.pdf_to_images import PdfToImagesOperation
+from pdf_toolbox.services.pdf_ops.render_dpi import dpi_policy
+
+
+def _jpeg(size):
+    buf = io.BytesIO()
+    Image.new("L", size, 200).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def _make_pdf(path):
+    with fitz.open() as doc:
+        # A 200 dpi scan, a rotated 1200 dpi scan, and a page with only a small logo.
+        page = doc.new_page(width=144, height=216)
+        page.insert_image(page.rect, stream=_jpeg((400, 600)))
+        page = doc.new_page(width=144, height=216)
+        page.insert_image(page.rect, stream=_jpeg((2400, 3600)))
+        page.set_rotation(90)
+        page = doc.new_page(width=144, height=216)
+        page.insert_image(fitz.Rect(0, 0, 36, 36), stream=_jpeg((300, 300)))
+        page.insert_text((10, 100), "text page")
+        doc.save(path)
+
+
+def test_auto_policy_follows_the_dominant_image(tmp_path):
+    src = tmp_path / "in.pdf"
+    _make_pdf(src)
+
+    policy = dpi_policy({"dpi": "auto", "max_dpi": 600}, 150)
+    with fitz.open(src) as doc:
+        assert [policy.page_dpi(page) for page in doc] == [200, 600, 150]
+        assert dpi_policy({"dpi": 300}, 150).page_dpi(doc[0]) == 300
+
+
+def test_auto_export_reports_page_dpi(tmp_path):
+    src = tmp_path / "in.pdf"
+    _make_pdf(src)
+    progress = []
+    spec = JobSpec(
+        tool_id="pdf_to_images",
+        inputs=[src],
+        output_dir=tmp_path,
+        params={"dpi": "auto", "min_dpi": 100, "max_dpi": 300, "format": "png", "workers": 1},
+    )
+
+    result = PdfToImagesOperation().run(spec, lambda *args: progress.append(args), CancellationToken())
+
+    assert result.success is True
+    sizes = [Image.open(path).size for path in result.outputs]
+    assert sizes == [(400, 600), (900, 600), (300, 450)]
+    assert [args[3] for args in progress] == [
+        "Export page 1 at 200 dpi",
+        "Export page 2 at 300 dpi",
+        "Export page 3 at 150 dpi",
+    ]
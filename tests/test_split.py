@@ -0,0 +1,106 @@
+import io
+from pathlib import Path
+
+import fitz
+from PIL import Image
+
+from pdf_toolbox.core.cancel import CancellationToken
+from pdf_toolbox.core.models import JobSpec
+from pdf_toolbox.services.pdf_ops import split_extract
+from pdf_toolbox.services.pdf_ops.split_extract import SplitExtractOperation
+
+
+def _make_pdf(path: Path, pages: int, toc=None, image_pages: bool = False) -> Path:
+    doc = fitz.open()
+    for i in range(pages):
+        page = doc.new_page(width=200, height=200)
+        page.insert_text((10, 20), f"page {i + 1}")
+        if image_pages:
+            buf = io.BytesIO()
+            Image.effect_noise((120, 120), 80 + i).convert("RGB").save(buf, format="PNG")
+            page.insert_image(fitz.Rect(20, 40, 180, 180), stream=buf.getvalue())
+    if toc:
+        doc.set_toc(toc)
+    doc.save(path)
+    doc.close()
+    return path
+
+
+def _run(src: Path, out_dir: Path, **params):
+    out_dir.mkdir(exist_ok=True)
+    result = SplitExtractOperation().run(
+        JobSpec("split_extract", [src], out_dir, params=params),
+        lambda *a: None,
+        CancellationToken(),
+    )
+    assert result.success, result.error
+    texts = []
+    for path in result.outputs:
+        with fitz.open(path) as doc:
+            texts.append([page.get_text().split("\n")[0] for page in doc])
+    return result, texts
+
+
+def test_split_every_n_pages(tmp_path):
+    src = _make_pdf(tmp_path / "doc.pdf", 7)
+
+    result, texts = _run(src, tmp_path / "out", mode="every_n", pages_per_file=3)
+
+    assert [p.name for p in result.outputs] == ["doc_p1-3.pdf", "doc_p4-6.pdf", "doc_p7.pdf"]
+    assert texts == [["page 1", "page 2", "page 3"], ["page 4", "page 5", "page 6"], ["page 7"]]
+
+
+def test_split_by_top_level_bookmarks(tmp_path):
+    toc = [[1, "Intro", 2], [2, "Detail", 3], [1, "Body", 4], [1, "End: notes", 6]]
+    src = _make_pdf(tmp_path / "doc.pdf", 7, toc=toc)
+
+    result, texts = _run(src, tmp_path / "out", mode="bookmarks")
+
+    assert [p.name for p in result.outputs] == [
+        "doc_p1.pdf",
+        "doc_01_Intro.pdf",
+        "doc_02_Body.pdf",
+        "doc_03_End notes.pdf",
+    ]
+    assert [len(pages) for pages in texts] == [1, 2, 2, 2]
+    assert result.warning is None
+
+
+def test_split_by_max_size_respects_limit(tmp_path):
+    src = _make_pdf(tmp_path / "doc.pdf", 12, image_pages=True)
+    limit_mb = 0.15
+
+    result, texts = _run(src, tmp_path / "out", mode="max_size", max_size_mb=limit_mb)
+
+    assert len(result.outputs) > 1
+    assert sum(texts, []) == [f"page {i}" for i in range(1, 13)]
+    assert all(path.stat().st_size <= limit_mb * 1048576 for path in result.outputs)
+    # The estimate should not be so pessimistic that parts end up far below the limit.
+    assert len(result.outputs) <= 2 * sum(p.stat().st_size for p in result.outputs) / (limit_mb * 1048576) + 1
+
+
+def test_parallel_split_matches_serial(tmp_path):
+    src = _make_pdf(tmp_path / "doc.pdf", 20)
+
+    serial, serial_texts = _run(src, tmp_path / "serial", mode="split_many", ranges="1-20", split_workers=1)
+    parallel, parallel_texts = _run(src, tmp_path / "parallel", mode="split_many", ranges="1-20", split_workers=2)
+
+    assert [p.name for p in serial.outputs] == [p.name for p in parallel.outputs]
+    assert serial_texts == parallel_texts == [[f"page {i}"] for i in range(1, 21)]
+
+
+def test_split_workers_default_to_the_cpu_share(tmp_path, monkeypatch):
+    src = _make_pdf(tmp_path / "doc.pdf", 3)
+    calls = []
+    real_write_groups = split_extract.write_groups
+
+    def write_groups(src, groups, token, on_written, workers=1):
+        calls.append(workers)
+        return real_write_groups(src, groups, token, on_written, 1)
+
+    monkeypatch.setattr(split_extract, "cpu_share", lambda: 3)
+    monkeypatch.setattr(split_extract, "write_groups", write_groups)
+
+    _run(src, tmp_path / "out", mode="every_n", pages_per_file=1)
+
+    assert calls == [3]